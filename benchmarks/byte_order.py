@@ -0,0 +1,52 @@
+# Author:  Martin McBride
+# Created: 2026-10-16
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+
+"""
+Compares the old fancy indexing byte order correction with `convert_pycairo_data` and `pycairo_data_view`, at 1080p
+and 4K. Random data is used in place of a Pycairo surface, so Pycairo isn't needed to run the benchmark.
+
+Note that the old path didn't unpremultiply alpha, so for translucent images it gave incorrect colours.
+"""
+
+import timeit
+import numpy as np
+from generativepy.utils import convert_pycairo_data, pycairo_data_view
+
+REPEAT = 20
+
+
+def old_path(surface_data, channels):
+    a = surface_data.copy()  # the old code modified the surface data in place
+    if channels == 3:
+        a[:, :, [0, 1, 2]] = a[:, :, [2, 1, 0]]
+    elif channels == 4:
+        a[:, :, [0, 1, 2, 3]] = a[:, :, [2, 1, 0, 3]]
+    return a
+
+
+def run(name, width, height):
+    rng = np.random.default_rng(1)
+    surface_data = rng.integers(0, 256, (height, width, 4), dtype=np.uint8)
+    surface_data[:, :, 3] = 255
+    copy_time = timeit.timeit(lambda: surface_data.copy(), number=REPEAT) / REPEAT
+    for channels in (3, 4):
+        out = np.empty((height, width, channels), dtype=np.uint8)
+        old = timeit.timeit(lambda: old_path(surface_data, channels), number=REPEAT) / REPEAT - copy_time
+        new = timeit.timeit(lambda: convert_pycairo_data(surface_data, channels), number=REPEAT) / REPEAT
+        new_out = timeit.timeit(lambda: convert_pycairo_data(surface_data, channels, out), number=REPEAT) / REPEAT
+        print('{} {} channels: old {:.2f} ms, convert {:.2f} ms, convert into out {:.2f} ms'
+              .format(name, channels, old * 1000, new * 1000, new_out * 1000))
+    translucent = surface_data.copy()
+    translucent[:, :, 3] = 128
+    translucent[:, :, :3] >>= 1
+    new = timeit.timeit(lambda: convert_pycairo_data(translucent, 4), number=REPEAT) / REPEAT
+    print('{} 4 channels, translucent: convert {:.2f} ms'.format(name, new * 1000))
+    view = timeit.timeit(lambda: pycairo_data_view(surface_data, 'RGB'), number=REPEAT) / REPEAT
+    print('{} RGB view: {:.4f} ms'.format(name, view * 1000))
+
+
+if __name__ == '__main__':
+    run('1080p', 1920, 1080)
+    run('4K', 3840, 2160)
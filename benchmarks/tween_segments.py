@@ -0,0 +1,76 @@
+# Author:  Martin McBride
+# Created: 2026-10-16
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+
+"""
+Compares the memory use and build time of a long `Tween` timeline with the old approach, which appended a value to a
+list for every frame. The timeline lasts 1 hour at 60 fps, and is made of 500 eased moves and waits.
+
+It also compares calculating every frame with `get` and with `values`.
+"""
+
+import time
+import tracemalloc
+import numpy as np
+from generativepy.tween import Tween, set_frame_rate, ease_in_out_harm
+
+FRAME_RATE = 60
+DURATION = 3600
+SEGMENTS = 500
+
+
+def old_build():
+    # The old implementation, which stored one float per frame
+    frames = []
+    previous = 0
+    ease_function = ease_in_out_harm()
+    step = DURATION / SEGMENTS
+    for i in range(SEGMENTS):
+        count = int(FRAME_RATE * step * (i + 1)) - len(frames)
+        if i % 2:
+            frames.extend([previous for _ in range(count)])
+        else:
+            value = i % 7
+            for n in range(count):
+                factor = ease_function((n + 1) / count)
+                frames.append(previous + factor * (value - previous))
+            previous = value
+    return frames
+
+
+def new_build():
+    tween = Tween(0)
+    ease_function = ease_in_out_harm()
+    step = DURATION / SEGMENTS
+    for i in range(SEGMENTS):
+        if i % 2:
+            tween.wait(step * (i + 1))
+        else:
+            tween.ease(i % 7, step * (i + 1), ease_function)
+    return tween
+
+
+def measure(name, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print('{}: {} frames, build {:.1f} ms, memory {:.1f} kB'.format(name, len(result), elapsed * 1000, size / 1024))
+    return result
+
+
+if __name__ == '__main__':
+    set_frame_rate(FRAME_RATE)
+    frames = measure('list of frames', old_build)
+    tween = measure('segments', new_build)
+
+    start = time.perf_counter()
+    values = [tween.get(n) for n in range(len(tween))]
+    print('get every frame: {:.1f} ms'.format((time.perf_counter() - start) * 1000))
+    start = time.perf_counter()
+    array = tween.values()
+    print('values: {:.1f} ms'.format((time.perf_counter() - start) * 1000))
+    print('old and new values match:', frames == values and np.allclose(array, frames))
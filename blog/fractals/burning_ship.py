@@ -4,7 +4,8 @@
 # License: MIT
 
 from generativepy.bitmap import Scaler
-from generativepy.nparray import (make_nparray_data, make_npcolormap, save_nparray,
+from generativepy.fractal import burning_ship
+from generativepy.nparray import (make_npcolormap, save_nparray,
                                   load_nparray, save_nparray_image, apply_npcolormap)
 from generativepy.color import Color
 from generativepy.utils import temp_file
@@ -12,25 +13,6 @@ import numpy as np
 
 MAX_COUNT = 256
 
-def calc(c1, c2):
-    x = y = 0
-    for i in range(MAX_COUNT):
-        x, y = x*x - y*y + c1, abs(2*x*y) + c2
-        if x*x + y*y > 4:
-            return i + 1
-    return 0
-
-
-def paint(image, pixel_width, pixel_height, frame_no, frame_count):
-    scaler = Scaler(pixel_width, pixel_height, width=3.2, startx=-2, starty=-1.8)
-
-    for px in range(pixel_width):
-        for py in range(pixel_height):
-            x, y = scaler.device_to_user(px, py)
-            count = calc(x, y)
-            image[py, px] = count
-
-
 def colorise(counts):
     counts = np.reshape(counts, (counts.shape[0], counts.shape[1]))
 
@@ -43,7 +25,7 @@ def colorise(counts):
     return outarray
 
 
-data = make_nparray_data(paint, 800, 600, channels=1)
+data = burning_ship(Scaler(800, 600, width=3.2, startx=-2, starty=-1.8), MAX_COUNT)
 
 filename = temp_file('burning-ship.dat')
 save_nparray(filename, data)
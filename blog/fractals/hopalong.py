@@ -4,7 +4,7 @@
 # License: MIT
 
 from generativepy.bitmap import Scaler
-from generativepy.nparray import make_nparray_data, save_nparray, load_nparray, make_npcolormap, apply_npcolormap, save_nparray_image
+from generativepy.nparray import make_nparray_data, save_nparray, load_nparray, make_npcolormap, apply_scaled_npcolormap, save_nparray_image
 from generativepy.color import Color
 from generativepy.utils import temp_file
 from generativepy.analytics import print_stats, print_histogram
@@ -24,16 +24,8 @@ def sign(x):
     return 0
 
 def colorise(counts):
-    counts = np.reshape(counts, (counts.shape[0], counts.shape[1]))
-    power_counts = np.power(counts, 0.25)
-    maxcount = np.max(power_counts)
-    normalised_counts = (power_counts * 1023 / max(maxcount, 1)).astype(np.uint32)
-
     colormap = make_npcolormap(1024, [Color('black'), Color('green'), Color('yellow'), Color('red')])
-
-    outarray = np.zeros((counts.shape[0], counts.shape[1], 3), dtype=np.uint8)
-    apply_npcolormap(outarray, normalised_counts, colormap)
-    return outarray
+    return apply_scaled_npcolormap(counts, colormap, vmin=0, power=0.25)
 
 def paint(image, pixel_width, pixel_height, frame_no, frame_count):
     scaler = Scaler(pixel_width, pixel_height, width=1000, startx=-500, starty=-500)
@@ -4,32 +4,14 @@
 # License: MIT
 
 from generativepy.bitmap import Scaler
-from generativepy.nparray import make_nparray_data, save_nparray, load_nparray, make_npcolormap, apply_npcolormap, save_nparray_image
+from generativepy.fractal import mandelbrot
+from generativepy.nparray import save_nparray, load_nparray, make_npcolormap, apply_npcolormap, save_nparray_image
 from generativepy.color import Color
 from generativepy.analytics import print_stats, print_histogram
 import numpy as np
 
 MAX_COUNT = 256
 
-def calc(c1, c2):
-    x = y = 0
-    for i in range(MAX_COUNT):
-        x, y = x*x - y*y + c1, 2*x*y + c2
-        if x*x + y*y > 4:
-            return i+1
-    return 0
-
-
-def paint(image, pixel_width, pixel_height, frame_no, frame_count):
-    scaler = Scaler(pixel_width, pixel_height, width=3, startx=-2, starty=-1.5)
-
-    for px in range(pixel_width):
-        for py in range(pixel_height):
-            x, y = scaler.device_to_user(px, py)
-            count = calc(x, y)
-            image[py, px] = count
-
-
 def colorise(counts):
     counts = np.reshape(counts, (counts.shape[0], counts.shape[1]))
 
@@ -42,7 +24,7 @@ def colorise(counts):
     return outarray
 
 
-data = make_nparray_data(paint, 600, 600, channels=1)
+data = mandelbrot(Scaler(600, 600, width=3, startx=-2, starty=-1.5), MAX_COUNT)
 
 frame = colorise(data)
 
@@ -4,11 +4,11 @@
 # License: MIT
 
 from generativepy.bitmap import Scaler
+from generativepy.density import make_density_paint
 from generativepy.nparray import make_nparray_data, save_nparray, load_nparray, make_npcolormap, apply_npcolormap, save_nparray_image
 from generativepy.color import Color
 from generativepy.analytics import print_stats, print_histogram
 from generativepy.utils import temp_file
-import math
 import numpy as np
 
 MAX_COUNT = 1000
@@ -17,26 +17,11 @@ WIDTH = 600
 USERWIDTH = 2
 
 def calc(x, y):
-    xn = x - H*math.sin(y + math.tan(3*y))
-    yn = y - H*math.sin(x + math.tan(3*x))
+    xn = x - H*np.sin(y + np.tan(3*y))
+    yn = y - H*np.sin(x + np.tan(3*x))
     return xn, yn
 
 
-def paint(image, pixel_width, pixel_height, frame_no, frame_count):
-    scaler = Scaler(pixel_width, pixel_height, width=USERWIDTH, startx=-USERWIDTH/2, starty=-USERWIDTH/2)
-
-    image[...] = 0
-
-    for i in range(0, WIDTH, 1):
-        print(i)
-        for j in range(0, WIDTH, 1):
-            x, y = scaler.device_to_user(i, j)
-            for _ in range(MAX_COUNT):
-                x, y = calc(x, y)
-                px, py = scaler.user_to_device(x, y)
-                if 0 <= px < WIDTH and 0 <= py < WIDTH:
-                    image[py, px] += 1
-
 def colorise(counts):
     counts = np.reshape(counts, (counts.shape[0], counts.shape[1]))
 
@@ -51,7 +36,9 @@ def colorise(counts):
 
 filename = temp_file('popcorn.dat')
 
-
+# Start an orbit from every pixel
+seeds = Scaler(WIDTH, WIDTH, width=USERWIDTH, startx=-USERWIDTH/2, starty=-USERWIDTH/2).device_to_user_grid()
+paint = make_density_paint(calc, seeds, MAX_COUNT, width=USERWIDTH, startx=-USERWIDTH/2, starty=-USERWIDTH/2)
 data = make_nparray_data(paint, WIDTH, WIDTH, channels=1)
 save_nparray(filename, data)
 
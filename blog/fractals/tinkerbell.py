@@ -3,44 +3,32 @@
 # Copyright (C) 2021, Martin McBride
 # License: MIT
 
-from generativepy.bitmap import Scaler
-from generativepy.nparray import make_nparray_data, save_nparray, load_nparray, make_npcolormap, apply_npcolormap, save_nparray_image
+from generativepy.density import make_density_paint, random_seeds
+from generativepy.nparray import make_nparray_data, save_nparray, load_nparray, make_npcolormap, apply_scaled_npcolormap, save_nparray_image
 from generativepy.color import Color
 from generativepy.utils import temp_file
 from generativepy.analytics import print_stats, print_histogram
 import numpy as np
 
 MAX_COUNT = 10000000
+SEEDS = 10000
 A = 0.9
 B = -0.6013
 C = 2.0
 D = 0.5
 
 
-def paint(image, pixel_width, pixel_height, frame_no, frame_count):
-    scaler = Scaler(pixel_width, pixel_height, width=3, startx=-2, starty=-2)
-
-    x = 0.01
-    y = 0.01
-    for i in range(MAX_COUNT):
-        x, y = x*x - y*y + A*x + B*y, 2*x*y + C*x + D*y
-        px, py = scaler.user_to_device(x, y)
-        image[py, px] += 1
+def tinkerbell(x, y):
+    return x*x - y*y + A*x + B*y, 2*x*y + C*x + D*y
 
 
 def colorise(counts):
-    counts = np.reshape(counts, (counts.shape[0], counts.shape[1]))
-    power_counts = np.power(counts, 0.25)
-    maxcount = np.max(power_counts)
-    normalised_counts = (power_counts * 1023 / max(maxcount, 1)).astype(np.uint32)
-
     colormap = make_npcolormap(1024, [Color('black'), Color('red'), Color('orange'), Color('yellow'), Color('white')])
-
-    outarray = np.zeros((counts.shape[0], counts.shape[1], 3), dtype=np.uint8)
-    apply_npcolormap(outarray, normalised_counts, colormap)
-    return outarray
+    return apply_scaled_npcolormap(counts, colormap, vmin=0, power=0.25)
 
 
+seeds = random_seeds(SEEDS, -0.1, -0.1, 0.2, 0.2, seed=1)
+paint = make_density_paint(tinkerbell, seeds, MAX_COUNT//SEEDS, width=3, startx=-2, starty=-2, discard=100)
 data = make_nparray_data(paint, 600, 600, channels=1)
 
 filename = temp_file('tinkerbell.dat')
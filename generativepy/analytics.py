@@ -22,15 +22,187 @@ as greyscale data, or just the output from a fractal algorithm. That would be an
 
 They can be used with multichannel data, such as RGB data, an array with shape `(height, width, 3)`. However in that case it would produce one value for all
 the R, G amd B values combined.
+
+For very large arrays, the `Stats` class calculates the statistics in a single pass, reading the data a chunk at a time. It works with memory mapped arrays
+(see `load_nparray`), and with sequences of frames, and the results from several processes can be merged.
 """
 import numpy as np
 
+# Number of array elements processed at a time by Stats.update
+_CHUNK_ELEMENTS = 1 << 20
+
+
+class Stats:
+    """
+    Calculates the minimum, maximum, mean, variance and approximate quantiles of a set of values, in a single pass.
+
+    Values are added using `update`, which can be called many times, for example once for each frame of an animation.
+    The data is processed in chunks, so a memory mapped array is never read into memory all at once. NaN values are
+    ignored.
+
+    Quantiles (including the median) are estimated from a random sample of the values, of up to `sample_size` values.
+    If there are no more than `sample_size` values in total, every value is kept and the quantiles are exact.
+
+    Two `Stats` objects can be combined using `merge`. This allows the statistics to be calculated in parallel, for
+    example by worker processes that each handle part of the data. `Stats` objects can be pickled.
+    """
 
-def print_stats(array, title='stats'):
+    def __init__(self, sample_size=65536, seed=None):
+        """
+        Args:
+            sample_size: int - the maximum number of values kept for estimating quantiles.
+            seed: int - seed for the random sampling, or None for a different sample each time.
+        """
+        if sample_size < 1:
+            raise ValueError('sample_size must be at least 1')
+        self.sample_size = sample_size
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._rng = np.random.default_rng(seed)
+        # Bottom-k sample: the values with the smallest random keys seen so far
+        self._sample = np.empty(0)
+        self._keys = np.empty(0)
+
+    def update(self, array):
+        """
+        Add the values in an array.
+
+        Args:
+            array: NumPy array - the values. This can have any shape, and can be a memory mapped array.
+
+        Returns:
+            self, so calls can be chained.
+        """
+        array = np.asanyarray(array)
+        if array.ndim == 0:
+            array = array.reshape(1)
+        rows = max(1, _CHUNK_ELEMENTS // max(1, array[0].size if array.shape[0] else 1))
+        for start in range(0, array.shape[0], rows):
+            chunk = np.asarray(array[start:start + rows]).ravel()
+            if np.issubdtype(chunk.dtype, np.floating):
+                chunk = chunk[~np.isnan(chunk)]
+            if chunk.size:
+                self._update_chunk(chunk)
+        return self
+
+    def update_frames(self, frames):
+        """
+        Add the values from a sequence of arrays, for example the frames of an animation.
+
+        Args:
+            frames: iterable of NumPy arrays - the values. This can be a lazy iterator.
+
+        Returns:
+            self, so calls can be chained.
+        """
+        for frame in frames:
+            self.update(frame)
+        return self
+
+    def merge(self, other):
+        """
+        Add the values from another `Stats` object, as if they had been passed to `update`.
+
+        Args:
+            other: Stats - the other object.
+
+        Returns:
+            self, so calls can be chained.
+        """
+        if other.count:
+            self._combine(other.count, other.min, other.max, other.mean, other._m2)
+            self._add_sample(other._sample, other._keys)
+        return self
+
+    @property
+    def variance(self):
+        """
+        The population variance of the values, or None if there are no values.
+        """
+        return self._m2 / self.count if self.count else None
+
+    @property
+    def std(self):
+        """
+        The population standard deviation of the values, or None if there are no values.
+        """
+        return np.sqrt(self.variance) if self.count else None
+
+    @property
+    def median(self):
+        """
+        The median of the values, exact or estimated (see `quantile`), or None if there are no values.
+        """
+        return self.quantile(0.5)
+
+    def quantile(self, q):
+        """
+        Estimate a quantile of the values.
+
+        Args:
+            q: number or sequence of numbers - the quantile, from 0 to 1. For example 0.5 is the median, 0.99 is the value
+                        that 99% of the values are less than or equal to.
+
+        Returns:
+            The quantile, or an array of quantiles if `q` is a sequence, or None if there are no values.
+        """
+        if not self.count:
+            return None
+        return np.quantile(self._sample, q)
+
+    def as_dict(self):
+        """
+        The statistics as a dictionary, for example to store the results of a batch job.
+
+        Returns:
+            A dictionary with keys 'count', 'min', 'max', 'mean', 'variance', 'std' and 'median'.
+        """
+        return {'count': self.count, 'min': self.min, 'max': self.max, 'mean': self.mean if self.count else None,
+                'variance': self.variance, 'std': self.std, 'median': self.median}
+
+    def _update_chunk(self, chunk):
+        values = chunk.astype(np.float64)
+        mean = np.mean(values)
+        m2 = np.sum(np.square(values - mean))
+        self._combine(chunk.size, np.min(chunk), np.max(chunk), mean, m2)
+        keys = self._rng.random(chunk.size)
+        if self._keys.size >= self.sample_size:
+            # Only values with keys below the current k-th smallest key can enter the sample
+            candidates = keys < self._keys.max()
+            chunk, keys = chunk[candidates], keys[candidates]
+        self._add_sample(chunk, keys)
+
+    def _combine(self, count, minimum, maximum, mean, m2):
+        # Merge the count, mean and sum of squared differences of two sets (Chan et al.)
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta*count/total
+        self._m2 = self._m2 + m2 + delta*delta*self.count*count/total
+        self.count = total
+        self.min = minimum if self.min is None else min(self.min, minimum)
+        self.max = maximum if self.max is None else max(self.max, maximum)
+
+    def _add_sample(self, values, keys):
+        sample = np.concatenate((self._sample, values))
+        keys = np.concatenate((self._keys, keys))
+        if keys.size > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size - 1)[:self.sample_size]
+            sample, keys = sample[keep], keys[keep]
+        self._sample, self._keys = sample, keys
+
+
+def print_stats(array, title='stats', approximate_median=False):
     """
     Prints the statistics for a NumPy array.
 
-    This function takes a NumPy array, and calculates the minium, maximum, mean and median values.
+    This function takes a NumPy array, and calculates the minium, maximum, mean and median values. The minimum, maximum
+    and mean are calculated using `Stats`, which reads the data only once, so this works well with large memory mapped
+    arrays. The median is calculated exactly, using `np.median`, unless `approximate_median` is set. In that case it is
+    also calculated by `Stats`, and for arrays of more than 65536 values it is estimated from a random sample and
+    labelled as approximate.
 
     It prints the result to the console.
 
@@ -40,12 +212,20 @@ def print_stats(array, title='stats'):
 
         array: NumPy array - the image data.
         title: str - the title to display (defaults to `stats`)
+        approximate_median: bool - if true, estimate the median of large arrays from a sample, rather than reading the
+                    whole array again.
     """
+    stats = Stats().update(array)
     print(title)
-    print('Min:', np.min(array))
-    print('Max:', np.max(array))
-    print('Mean:', np.mean(array))
-    print('Median:', np.median(array))
+    print('Min:', stats.min)
+    print('Max:', stats.max)
+    print('Mean:', stats.mean)
+    if not approximate_median:
+        print('Median:', np.median(array))
+    elif stats.count > stats.sample_size:
+        print('Median (approx.):', stats.median)
+    else:
+        print('Median:', stats.median)
 
 
 def print_histogram(array, title='histogram', bins=10):
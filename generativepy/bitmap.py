@@ -14,8 +14,12 @@ generativepy actually uses the Pillow library, which is a fork of PIL. That is b
 whereas PIL is not. The Pillow library is compatible, and is still imported using the name PIL. We will refer to is as
 PIL in the documentation.
 """
+import functools
 from PIL import Image
 import numpy as np
+from generativepy.draft import get_draft
+from generativepy.framestream import FrameSource
+from generativepy.png import PngSequenceWriter
 
 class Scaler:
     """
@@ -91,6 +95,61 @@ class Scaler:
         device_y = int((user_y - self.starty) * self.pixel_height / self.height)
         return device_x, device_y
 
+    def device_to_user_grid(self, complex_plane=False, sparse=False, rows=None):
+        """
+        Calculates the user space coordinates of every pixel in the image, as NumPy arrays.
+
+        Element `[py, px]` of the result is the user space coordinate of the pixel `(px, py)`, exactly the same value
+        that `device_to_user(px, py)` returns. This allows a value to be calculated for every pixel using array
+        operations, rather than calling `device_to_user` in a Python loop.
+
+        Args:
+            complex_plane: bool - If true, return a single complex array `x + y*1j`, which is convenient for fractals.
+            sparse: bool - If true (and `complex_plane` is false) return x with shape (1, pixel_width) and y with shape
+                        (pixel_height, 1), rather than full arrays. They broadcast against each other to give the full
+                        grid, using less memory.
+            rows: tuple - Optional (start, stop) range of pixel rows. If set, only the grid for those rows is
+                        calculated, so element `[py, px]` of the result is for the pixel `(px, start + py)`.
+
+        Returns:
+            Either a tuple (x, y) of float arrays with shape (pixel_height, pixel_width), or a complex array with shape
+            (pixel_height, pixel_width). If `rows` is set, the height is the number of rows in the range.
+        """
+        start, stop = (0, self.pixel_height) if rows is None else rows
+        if not 0 <= start <= stop <= self.pixel_height:
+            raise ValueError('rows must be a range within the image height')
+        shape = (stop - start, self.pixel_width)
+        user_x = np.arange(self.pixel_width) * self.width / self.pixel_width + self.startx
+        user_y = np.arange(start, stop) * self.height / self.pixel_height + self.starty
+        user_x = user_x[np.newaxis, :]
+        user_y = user_y[:, np.newaxis]
+        if complex_plane:
+            grid = np.empty(shape, dtype=np.complex128)
+            grid.real = user_x
+            grid.imag = user_y
+            return grid
+        if sparse:
+            return user_x, user_y
+        return np.broadcast_to(user_x, shape).copy(), np.broadcast_to(user_y, shape).copy()
+
+    def user_to_device_array(self, user_x, user_y):
+        """
+        Converts arrays of user coordinates to device space. This is the array version of `user_to_device`, and gives
+        the same results for each point.
+
+        Args:
+            user_x: array like - the x coordinates in user space.
+            user_y: array like - the y coordinates in user space. Must have the same shape as `user_x`, or be
+                        broadcastable to it.
+
+        Returns:
+            int (x, y), a tuple of integer arrays containing the equivalent coordinates in device space. Like
+            `user_to_device`, the values are truncated towards zero and are not clipped to the image.
+        """
+        device_x = (np.asarray(user_x) - self.startx) * self.pixel_width / self.width
+        device_y = (np.asarray(user_y) - self.starty) * self.pixel_height / self.height
+        return device_x.astype(np.int64), device_y.astype(np.int64)
+
 def get_mode(channels):
     """
     Convert the number of channels into a PIL mode string.
@@ -164,7 +223,7 @@ def make_bitmap(outfile, paint, pixel_width, pixel_height, channels=3):
     paint(image, pixel_width, pixel_height, 0, 1)
     image.save(outfile + '.png')
 
-def make_bitmaps(outfile, paint, pixel_width, pixel_height, count, channels=3):
+def make_bitmaps(outfile, paint, pixel_width, pixel_height, count, channels=3, encoders=None, compress_level=None):
     """
     Used to create a sequence of PNG images. These can be combined into an animated GIF or video. This is similar to
     `make_bitmap` except it creates `count` files instead of just one.
@@ -178,6 +237,9 @@ def make_bitmaps(outfile, paint, pixel_width, pixel_height, count, channels=3):
     The paint function must have the signature described for `example_paint_function`. Each time the paint function is
     called, `fn` will contain the frame number - 0, 1 etc
 
+    If `encoders` is set, the images are compressed and saved by background threads while the next image is being
+    painted (see `PngSequenceWriter`).
+
     Args:
         outfile: str - The path and filename template for the output PNG file. The '.png' extension is optional, it
                     will be added if it isn't present.
@@ -186,15 +248,17 @@ def make_bitmaps(outfile, paint, pixel_width, pixel_height, count, channels=3):
         pixel_height: int - The height of the image that will be created, in pixels.
         count: int - the number of images to create
         channels: int - The number of colour channels. 1 for greyscale, 3 for RGB, 4 for RGBA.
+        encoders: int - The number of encoder threads, or None to save each image before painting the next one.
+        compress_level: int - zlib compression level, 0 (no compression) to 9 (best compression), or None for the
+                    default level.
     """
-    if outfile.lower().endswith('.png'):
-        outfile = outfile[:-4]
-    for i in range(count):
-        image = Image.new(get_mode(channels), (pixel_width, pixel_height), get_background(channels))
-        paint(image, pixel_width, pixel_height, i, count)
-        image.save(outfile + str(i).zfill(8) + '.png')
+    with PngSequenceWriter(outfile, encoders, compress_level=compress_level) as writer:
+        for i in range(count):
+            image = Image.new(get_mode(channels), (pixel_width, pixel_height), get_background(channels))
+            paint(image, pixel_width, pixel_height, i, count)
+            writer.write(image)
 
-def make_bitmap_frame(paint, pixel_width, pixel_height, channels=3):
+def make_bitmap_frame(paint, pixel_width, pixel_height, channels=3, draft=None):
     """
     Used to create a single image as a frame. A frame is a NumPy array with shape (pixel_height, pixel_width, channels).
 
@@ -208,16 +272,20 @@ def make_bitmap_frame(paint, pixel_width, pixel_height, channels=3):
         pixel_width: int - The width of the image that will be created, in pixels.
         pixel_height: int - The height of the image that will be created, in pixels.
         channels: int - The number of colour channels. 1 for greyscale, 3 for RGB, 4 for RGBA.
+        draft: bool, number or Draft - Draft mode setting for this call, see `draft.get_draft`.
 
     Returns:
         A frame.
     """
+    draft = get_draft(draft)
+    if draft is not None:
+        return _render_draft_bitmap_frame(paint, pixel_width, pixel_height, channels, 1, draft, 0)
     image = Image.new(get_mode(channels), (pixel_width, pixel_height), get_background(channels))
     paint(image, pixel_width, pixel_height, 0, 1)
     frame = np.copy(np.asarray(image))
     return frame
 
-def make_bitmap_frames(paint, pixel_width, pixel_height, count, channels=3):
+def make_bitmap_frames(paint, pixel_width, pixel_height, count, channels=3, cache=None, draft=None):
     """
     Used to create a sequence of frames. These can be combined into an animated GIF or video. This is similar to
     `make_bitmap_frame` except it creates `count` frames instead of just one.
@@ -227,6 +295,12 @@ def make_bitmap_frames(paint, pixel_width, pixel_height, count, channels=3):
 
     The function returns a lazy iterator. When this iterator is evaluated, the image frames are created on demand.
 
+    If `cache` is set, frames that have already been painted by the same paint function, with the same settings, are
+    loaded from the cache rather than being painted again (see the `cache` module).
+
+    In draft mode (see the `draft` module) the paint function is called with a reduced image size, and `cache` is not
+    used.
+
     The paint function must have the signature described for `example_paint_function`. Each time the paint function is
     called, `fn` will contain the frame number - 0, 1 etc
 
@@ -236,15 +310,62 @@ def make_bitmap_frames(paint, pixel_width, pixel_height, count, channels=3):
         pixel_height: int - The height of the image that will be created, in pixels.
         count: int - the number of images to create
         channels: int - The number of colour channels. 1 for greyscale, 3 for RGB, 4 for RGBA.
+        cache: RenderCache - Optional cache of previously painted frames.
+        draft: bool, number or Draft - Draft mode setting for this call, see `draft.get_draft`.
 
     Returns:
         An iterator returning a sequence of frames.
     """
+    draft = get_draft(draft)
+    if draft is not None:
+        render = functools.partial(_render_draft_bitmap_frame, paint, pixel_width, pixel_height, channels, count, draft)
+        yield from draft.expand(map(render, draft.frame_numbers(count)), count)
+        return
+    render = functools.partial(_render_bitmap_frame, paint, pixel_width, pixel_height, channels, count)
+    if cache is not None:
+        render = cache.wrap(render, paint, ('bitmap', pixel_width, pixel_height, channels, count))
     for i in range(count):
-        image = Image.new(get_mode(channels), (pixel_width, pixel_height), get_background(channels))
-        paint(image, pixel_width, pixel_height, i, count)
-        frame = np.copy(np.asarray(image))
-        yield frame
+        yield render(i)
+
+
+def make_bitmap_frame_source(paint, pixel_width, pixel_height, count, channels=3, cache=None, cache_size=8,
+                             draft=None):
+    """
+    Create a random access sequence of frames. This is similar to `make_bitmap_frames`, except that it returns a
+    `FrameSource`, so frames can be requested in any order, and only the frames that are requested are painted.
+
+    Args:
+        paint: function - A drawing function object, see `example_paint_function`.
+        pixel_width: int - The width of the image that will be created, in pixels.
+        pixel_height: int - The height of the image that will be created, in pixels.
+        count: int - the number of frames.
+        channels: int - The number of colour channels. 1 for greyscale, 3 for RGB, 4 for RGBA.
+        cache: RenderCache - Optional cache of previously painted frames.
+        cache_size: int - The number of recently used frames kept in memory.
+        draft: bool, number or Draft - Draft mode setting for this call, see `draft.get_draft`.
+
+    Returns:
+        A `FrameSource`.
+    """
+    draft = get_draft(draft)
+    if draft is not None:
+        render = functools.partial(_render_draft_bitmap_frame, paint, pixel_width, pixel_height, channels, count, draft)
+        return draft.frame_source(render, count, cache_size)
+    render = functools.partial(_render_bitmap_frame, paint, pixel_width, pixel_height, channels, count)
+    if cache is not None:
+        render = cache.wrap(render, paint, ('bitmap', pixel_width, pixel_height, channels, count))
+    return FrameSource(render, count, cache_size)
+
+
+def _render_bitmap_frame(paint, pixel_width, pixel_height, channels, count, frame_no):
+    image = Image.new(get_mode(channels), (pixel_width, pixel_height), get_background(channels))
+    paint(image, pixel_width, pixel_height, frame_no, count)
+    return np.copy(np.asarray(image))
+
+
+def _render_draft_bitmap_frame(paint, pixel_width, pixel_height, channels, count, draft, frame_no):
+    frame = _render_bitmap_frame(paint, *draft.size(pixel_width, pixel_height), channels, count, frame_no)
+    return draft.output(frame, pixel_width, pixel_height)
 
 def example_paint_function(image, pixel_width, pixel_height, frame_no, frame_count):
     """
@@ -0,0 +1,292 @@
+# Author:  Martin McBride
+# Created: 2026-10-16
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+"""
+The cache module provides an on-disk cache of rendered frames.
+
+When a long animation is being developed, usually only one part of it changes between runs. A `RenderCache` can be
+passed to `make_image_frames`, `make_bitmap_frames`, `make_nparray_frames` or `make_povray_frames`, and any frame that
+has already been rendered with exactly the same inputs is loaded from the cache instead of being drawn again.
+
+Each frame is identified by a hash of:
+
+* The source code of the draw function.
+* The values captured by the draw function's closure, and its default argument values.
+* The `config` value of the cache, which can be used to represent any other settings that affect the drawing (for
+example global variables used by the draw function).
+* The frame number, frame count, image size and number of channels.
+
+Changes to global variables, or to other functions called by the draw function, are not detected automatically. Either
+include them in `config`, or use `invalidate` or `clear` to remove the old frames.
+
+Frames are stored as compressed NumPy files. When the total size of the cache exceeds `max_size`, the least recently
+used frames are deleted.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import shutil
+import tempfile
+import numpy as np
+
+
+def _hash_value(h, value, seen=None):
+    # seen holds the ids of the functions and partials already being hashed, so that a function that captures itself,
+    # or functions that capture each other, don't recurse forever
+    if seen is None:
+        seen = set()
+    if isinstance(value, functools.partial) or hasattr(value, '__code__'):
+        if id(value) in seen:
+            h.update(b'cycle')
+            return
+        seen.add(id(value))
+    if isinstance(value, functools.partial):
+        h.update(b'partial')
+        _hash_value(h, value.func, seen)
+        _hash_value(h, value.args, seen)
+        _hash_value(h, value.keywords, seen)
+    elif hasattr(value, '__code__'):
+        _hash_function(h, value, seen)
+    else:
+        try:
+            h.update(pickle.dumps(value))
+        except Exception:
+            # Not picklable, the repr is the best we can do
+            h.update(repr(value).encode())
+
+
+def _hash_function(h, function, seen=None):
+    if seen is None:
+        seen = {id(function)}
+    try:
+        h.update(inspect.getsource(function).encode())
+    except (OSError, TypeError):
+        code = function.__code__
+        h.update(code.co_code)
+        h.update(repr(code.co_consts).encode())
+    for cell in function.__closure__ or ():
+        try:
+            contents = cell.cell_contents
+        except ValueError:
+            continue
+        _hash_value(h, contents, seen)
+    _hash_value(h, getattr(function, '__defaults__', None), seen)
+    _hash_value(h, getattr(function, '__kwdefaults__', None), seen)
+
+
+class CachedRender:
+    """
+    A frame render function that loads frames from a `RenderCache` where possible. Created by `RenderCache.wrap`.
+    """
+
+    def __init__(self, cache, function_key, params, render):
+        self.cache = cache
+        self.function_key = function_key
+        self.params = params
+        self.render = render
+
+    def load(self, frame_no):
+        """
+        Load a frame from the cache.
+
+        Args:
+            frame_no: int - the frame number.
+
+        Returns:
+            The frame, or None if it is not in the cache.
+        """
+        return self.cache.get(self.function_key, self.cache.frame_key(frame_no, *self.params))
+
+    def store(self, frame_no, frame):
+        """
+        Store a frame in the cache.
+
+        Args:
+            frame_no: int - the frame number.
+            frame: numpy array - the frame.
+        """
+        self.cache.put(self.function_key, self.cache.frame_key(frame_no, *self.params), frame)
+
+    def __call__(self, frame_no):
+        frame = self.load(frame_no)
+        if frame is None:
+            frame = self.render(frame_no)
+            self.store(frame_no, frame)
+        return frame
+
+
+class RenderCache:
+    """
+    An on-disk, content addressed cache of rendered frames, with least recently used eviction.
+
+    A `RenderCache` object can be sent to worker processes, so it can be used with the `workers` option of
+    `make_image_frames`.
+    """
+
+    def __init__(self, folder, max_size=2**32, config=None):
+        """
+        Args:
+            folder: str - the folder used to store the cache. It is created if it doesn't exist.
+            max_size: int - the maximum total size of the cached frames, in bytes.
+            config: any - a picklable value that is included in every key. Change it to invalidate every frame, for
+                        example if a global setting used by the draw functions is changed.
+        """
+        self.folder = folder
+        self.max_size = max_size
+        self.config = config
+        self._size = None
+        os.makedirs(folder, exist_ok=True)
+
+    def function_key(self, function):
+        """
+        Calculate the key for a draw function. This depends on the function's source code, closure, default values, and
+        the cache config.
+
+        Args:
+            function: function - the draw function.
+
+        Returns:
+            The key as a hex string.
+        """
+        h = hashlib.sha256()
+        _hash_function(h, function) if hasattr(function, '__code__') else _hash_value(h, function)
+        _hash_value(h, self.config)
+        return h.hexdigest()
+
+    @staticmethod
+    def frame_key(frame_no, *params):
+        """
+        Calculate the key for a frame, within the entries for a function.
+
+        Args:
+            frame_no: int - the frame number.
+            params: any - other values that affect the frame, for example the image size.
+
+        Returns:
+            The key as a hex string.
+        """
+        return hashlib.sha256(repr((frame_no,) + params).encode()).hexdigest()
+
+    def wrap(self, render, function, params):
+        """
+        Create a `CachedRender` that loads frames from the cache, or calls `render` and stores the result.
+
+        Args:
+            render: function - called as `render(frame_no)` to create a frame that isn't in the cache.
+            function: function - the user draw function, used to calculate the function key.
+            params: tuple - other values that affect the frames, for example the image size and frame count.
+
+        Returns:
+            A `CachedRender` object.
+        """
+        return CachedRender(self, self.function_key(function), params, render)
+
+    def get(self, function_key, frame_key):
+        """
+        Get a frame from the cache, and mark it as recently used.
+
+        Args:
+            function_key: str - the function key.
+            frame_key: str - the frame key.
+
+        Returns:
+            The frame, or None if it is not in the cache.
+        """
+        path = self._path(function_key, frame_key)
+        try:
+            with np.load(path) as data:
+                frame = data['frame']
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            return None
+        return frame
+
+    def put(self, function_key, frame_key, frame):
+        """
+        Store a frame in the cache, then remove the least recently used frames if the cache is too large.
+
+        Args:
+            function_key: str - the function key.
+            frame_key: str - the frame key.
+            frame: numpy array - the frame.
+        """
+        path = self._path(function_key, frame_key)
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        # Write to a temporary file then rename it, so other processes never see a partly written file
+        fd, temp_path = tempfile.mkstemp(suffix='.npz', dir=folder)
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(f, frame=frame)
+        try:
+            replaced_size = os.path.getsize(path)
+        except OSError:
+            replaced_size = 0
+        os.replace(temp_path, path)
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += os.path.getsize(path) - replaced_size
+        if self._size > self.max_size:
+            self._evict()
+
+    def invalidate(self, function):
+        """
+        Remove every frame that was created by a draw function, with its current source code, closure and config.
+
+        Args:
+            function: function - the draw function.
+        """
+        shutil.rmtree(os.path.join(self.folder, self.function_key(function)), ignore_errors=True)
+        self._size = None
+
+    def clear(self):
+        """
+        Remove every frame from the cache.
+        """
+        for name in os.listdir(self.folder):
+            shutil.rmtree(os.path.join(self.folder, name), ignore_errors=True)
+        self._size = 0
+
+    def size(self):
+        """
+        Calculate the total size of the cached frames.
+
+        Returns:
+            The size in bytes.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def _path(self, function_key, frame_key):
+        return os.path.join(self.folder, function_key, frame_key + '.npz')
+
+    def _entries(self):
+        entries = []
+        for root, _, files in os.walk(self.folder):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        # Delete the least recently used frames until the cache is below 90% of its maximum size
+        entries = sorted(self._entries())
+        size = sum(entry[1] for entry in entries)
+        target = self.max_size * 0.9
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        self._size = size
@@ -27,12 +27,16 @@ For the alpha value, `a`:
 
 The `color` module also contains:
 
-* The `make_colormap` function that can be used to create a color map.
+* The `make_colormap` function that can be used to create a color map, and `make_colormap_array` which creates the
+  same color map as a NumPy array.
+* The `ColorArray` class, and functions such as `rgb_to_hsl` and `hsl_to_rgb`, for working with many colours at once,
+  for example every pixel of an image frame.
 * Several reusable colour schemes.
 """
 
 import colorsys
 import itertools
+import numpy as np
 
 cssColors = {
     "indianred":(205,92,92),
@@ -185,13 +189,28 @@ cssColors = {
     "black":(0,0,0),
 }
 
+# RGBA tuples for the CSS colours, shared by every `Color` created from a name
+_CSS_RGBA = {name: tuple([x/255 for x in rgb]) + (1,) for name, rgb in cssColors.items()}
+
+def _clamp(v):
+    try:
+        v = min(1, max(0, v)) #Clamp v between 0 and 1
+    except Exception as e:
+        raise ValueError('Numerical value required') from e
+    return v
+
 class Color():
     """
     `Color` holds an `rgba` colour object.
 
     All numerical input values are clamped in the range 0.0 to 1.0 (values less than 0.0 are replaced with 0.0, values greater than 1.0 are replaced with 1.0).
+
+    `Color` uses `__slots__`, so it is compact enough to create very large numbers of colours. For bulk work on many
+    colours at once, `ColorArray` is faster still.
     """
 
+    __slots__ = ('color', '_hls')
+
     def __init__(self, *args):
         """
         A color object always contains four values, `r`, `g`, `b` and `a`. Each value can have a value between
@@ -221,26 +240,31 @@ class Color():
             A `Color` object.
         """
 
-        if len(args) == 1:
-            if args[0] in cssColors:
-                self.color = tuple([x/255 for x in cssColors[args[0]]]) + (1,)
-            else:
-                g = Color.clamp(args[0])
-                self.color = (g,)*3 + (1,)
-        elif len(args) == 2:
-            if args[0] in cssColors:
-                self.color = tuple([x/255 for x in cssColors[args[0]]]) + (args[1],)
+        count = len(args)
+        if count == 4:
+            r, g, b, a = args
+            self.color = (_clamp(r), _clamp(g), _clamp(b), _clamp(a))
+        elif count == 3:
+            r, g, b = args
+            self.color = (_clamp(r), _clamp(g), _clamp(b), 1)
+        elif count == 1 or count == 2:
+            css = _CSS_RGBA.get(args[0]) if isinstance(args[0], str) else None
+            if css is not None:
+                self.color = css if count == 1 else css[:3] + (args[1],)
             else:
-                g = Color.clamp(args[0])
-                a = Color.clamp(args[1])
-                self.color = (g,) * 3 + (a,)
-        elif len(args) == 3:
-            self.color = tuple([Color.clamp(x) for x in args]) + (1,)
-        elif len(args) == 4:
-            self.color = tuple([Color.clamp(x) for x in args])
+                g = _clamp(args[0])
+                self.color = (g, g, g, _clamp(args[1]) if count == 2 else 1)
         else:
             raise ValueError("Color takes 1, 2, 3 or 4 arguments")
 
+    def _get_hls(self):
+        # The HLS values are calculated when they are first needed, then kept
+        try:
+            return self._hls
+        except AttributeError:
+            self._hls = colorsys.rgb_to_hls(self.color[0], self.color[1], self.color[2])
+            return self._hls
+
     @staticmethod
     def of_hsl(h, s, l):
         """
@@ -395,7 +419,7 @@ class Color():
         """
         Read-only property returns the h value of the colour as a float in range 0.0 to 1.0.
         """
-        h, l, s = colorsys.rgb_to_hls(self.color[0], self.color[1], self.color[2])
+        h, l, s = self._get_hls()
         return h
 
     def with_h(self, newval):
@@ -403,7 +427,7 @@ class Color():
         Read-only property returns a new `Color` object with its h value set to `newval`
         """
         newval = Color.clamp(newval)
-        h, l, s = colorsys.rgb_to_hls(self.color[0], self.color[1], self.color[2])
+        h, l, s = self._get_hls()
         r, g, b = colorsys.hls_to_rgb(newval, l, s)
         return Color(r, g, b, self.color[3])
 
@@ -411,7 +435,7 @@ class Color():
         """
         Read-only property returns a new `Color` object with its h value multiplied by `factor`
         """
-        h, l, s = colorsys.rgb_to_hls(self.color[0], self.color[1], self.color[2])
+        h, l, s = self._get_hls()
         r, g, b = colorsys.hls_to_rgb(Color.clamp(h*factor), l, s)
         return Color(r, g, b, self.color[3])
 
@@ -420,7 +444,7 @@ class Color():
         """
         Read-only property returns the s value of the colour as a float in range 0.0 to 1.0.
         """
-        h, l, s = colorsys.rgb_to_hls(self.color[0], self.color[1], self.color[2])
+        h, l, s = self._get_hls()
         return s
 
     def with_s(self, newval):
@@ -428,7 +452,7 @@ class Color():
         Read-only property returns a new `Color` object with its s value set to `newval`
         """
         newval = Color.clamp(newval)
-        h, l, s = colorsys.rgb_to_hls(self.color[0], self.color[1], self.color[2])
+        h, l, s = self._get_hls()
         r, g, b = colorsys.hls_to_rgb(h, l, newval)
         return Color(r, g, b, self.color[3])
 
@@ -436,7 +460,7 @@ class Color():
         """
         Read-only property returns a new `Color` object with its s value multiplied by `factor`
         """
-        h, l, s = colorsys.rgb_to_hls(self.color[0], self.color[1], self.color[2])
+        h, l, s = self._get_hls()
         r, g, b = colorsys.hls_to_rgb(h, l, Color.clamp(s*factor))
         return Color(r, g, b, self.color[3])
 
@@ -445,7 +469,7 @@ class Color():
         """
         Read-only property returns the l value of the colour as a float in range 0.0 to 1.0.
         """
-        h, l, s = colorsys.rgb_to_hls(self.color[0], self.color[1], self.color[2])
+        h, l, s = self._get_hls()
         return l
 
     def with_l(self, newval):
@@ -453,7 +477,7 @@ class Color():
         Read-only property returns a new `Color` object with its l value set to `newval`
         """
         newval = Color.clamp(newval)
-        h, l, s = colorsys.rgb_to_hls(self.color[0], self.color[1], self.color[2])
+        h, l, s = self._get_hls()
         r, g, b = colorsys.hls_to_rgb(h, newval, s)
         return Color(r, g, b, self.color[3])
 
@@ -461,7 +485,7 @@ class Color():
         """
         Read-only property returns a new `Color` object with its l value multiplied by `factor`
         """
-        h, l, s = colorsys.rgb_to_hls(self.color[0], self.color[1], self.color[2])
+        h, l, s = self._get_hls()
         r, g, b = colorsys.hls_to_rgb(h, Color.clamp(l*factor), s)
         return Color(r, g, b, self.color[3])
 
@@ -568,11 +592,7 @@ class Color():
 
     @staticmethod
     def clamp(v):
-        try:
-            v = min(1, max(0, v)) #Clamp v between 0 and 1
-        except Exception as e:
-            raise ValueError('Numerical value required') from e
-        return v
+        return _clamp(v)
 
     def __str__(self):
         return 'rgba' + str(self.color)
@@ -583,6 +603,246 @@ class Color():
         else:
             raise IndexError()
 
+    def __iter__(self):
+        return iter(self.color)
+
+    def __len__(self):
+        return 4
+
+
+class ColorArray():
+    """
+    `ColorArray` holds many colours as a single NumPy array, with shape (n, 4) and type float32. Each row holds the
+    `r`, `g`, `b` and `a` values of one colour, in the range 0.0 to 1.0.
+
+    It provides the same kinds of operations as `Color`, for example `lerp`, `with_l_factor` or `as_rgba_bytes`, but
+    each operation works on every colour at once, without creating a `Color` object per colour. This is useful for
+    particle systems and similar scenes, where each point has its own colour.
+
+    Most operations accept either a single value, which applies to every colour, or an array with one value per colour.
+
+    Like `Color`, `ColorArray` objects are immutable. Indexing with an integer gives a `Color`, indexing with a slice or
+    an index array gives a new `ColorArray`.
+    """
+
+    __slots__ = ('rgba',)
+
+    def __init__(self, colors):
+        """
+        Args:
+            colors: sequence of Color, or array - either a sequence of `Color` objects, or an array-like of shape
+                        (n, 3) or (n, 4) holding RGB or RGBA values. Values are clamped to the range 0.0 to 1.0. An
+                        empty sequence creates an empty `ColorArray`.
+        """
+        if len(colors) == 0:
+            rgba = np.zeros((0, 4), dtype=np.float32)
+        elif isinstance(colors[0], Color):
+            rgba = np.array([color.color for color in colors], dtype=np.float32)
+        else:
+            rgba = np.array(colors, dtype=np.float32)
+            if rgba.ndim != 2 or rgba.shape[1] not in (3, 4):
+                raise ValueError('colors must have shape (n, 3) or (n, 4)')
+            if rgba.shape[1] == 3:
+                rgba = np.concatenate((rgba, np.ones((len(rgba), 1), dtype=np.float32)), axis=1)
+        np.clip(rgba, 0, 1, out=rgba)
+        rgba.flags.writeable = False
+        self.rgba = rgba
+
+    @staticmethod
+    def of_hsl(h, s, l, a=1):
+        """
+        Static method to create a `ColorArray` from HSL values.
+
+        Args:
+            h: number or array - Hue of each colour.
+            s: number or array - Saturation of each colour.
+            l: number or array - Lightness of each colour.
+            a: number or array - Alpha (transparency) of each colour.
+
+        Returns:
+            A `ColorArray` object.
+        """
+        h, s, l, a = np.broadcast_arrays(*[np.clip(np.asarray(x, dtype=np.float64), 0, 1) for x in (h, s, l, a)])
+        return ColorArray(np.stack(_hsl_to_rgb(h, s, l) + (a,), axis=-1).reshape((-1, 4)))
+
+    def __len__(self):
+        return len(self.rgba)
+
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            return Color(*self.rgba[i].tolist())
+        return ColorArray(self.rgba[i])
+
+    def __iter__(self):
+        for rgba in self.rgba.tolist():
+            yield Color(*rgba)
+
+    @property
+    def rgb(self):
+        """
+        Read-only property returns RGB values as an (n, 3) array.
+        """
+        return self.rgba[:, :3]
+
+    @property
+    def r(self):
+        """
+        Read-only property returns the red values as an array.
+        """
+        return self.rgba[:, 0]
+
+    @property
+    def g(self):
+        """
+        Read-only property returns the green values as an array.
+        """
+        return self.rgba[:, 1]
+
+    @property
+    def b(self):
+        """
+        Read-only property returns the blue values as an array.
+        """
+        return self.rgba[:, 2]
+
+    @property
+    def a(self):
+        """
+        Read-only property returns the alpha values as an array.
+        """
+        return self.rgba[:, 3]
+
+    @property
+    def h(self):
+        """
+        Read-only property returns the hue values as a float64 array.
+        """
+        return self._hsl()[0]
+
+    @property
+    def s(self):
+        """
+        Read-only property returns the saturation values as a float64 array.
+        """
+        return self._hsl()[1]
+
+    @property
+    def l(self):
+        """
+        Read-only property returns the lightness values as a float64 array.
+        """
+        return self._hsl()[2]
+
+    def with_a(self, newval):
+        """
+        Returns a new `ColorArray` with its alpha values set to `newval`.
+        """
+        rgba = self.rgba.copy()
+        rgba[:, 3] = newval
+        return ColorArray(rgba)
+
+    def with_a_factor(self, factor):
+        """
+        Returns a new `ColorArray` with its alpha values multiplied by `factor`.
+        """
+        return self.with_a(self.rgba[:, 3]*np.asarray(factor, dtype=np.float32))
+
+    def with_h(self, newval):
+        """
+        Returns a new `ColorArray` with its hue values set to `newval`.
+        """
+        h, s, l = self._hsl()
+        return self._of_hsl(newval, s, l)
+
+    def with_h_factor(self, factor):
+        """
+        Returns a new `ColorArray` with its hue values multiplied by `factor`.
+        """
+        h, s, l = self._hsl()
+        return self._of_hsl(h*factor, s, l)
+
+    def with_s(self, newval):
+        """
+        Returns a new `ColorArray` with its saturation values set to `newval`.
+        """
+        h, s, l = self._hsl()
+        return self._of_hsl(h, newval, l)
+
+    def with_s_factor(self, factor):
+        """
+        Returns a new `ColorArray` with its saturation values multiplied by `factor`.
+        """
+        h, s, l = self._hsl()
+        return self._of_hsl(h, s*factor, l)
+
+    def with_l(self, newval):
+        """
+        Returns a new `ColorArray` with its lightness values set to `newval`.
+        """
+        h, s, l = self._hsl()
+        return self._of_hsl(h, s, newval)
+
+    def with_l_factor(self, factor):
+        """
+        Returns a new `ColorArray` with its lightness values multiplied by `factor`.
+        """
+        h, s, l = self._hsl()
+        return self._of_hsl(h, s, l*factor)
+
+    def lerp(self, other, factor):
+        """
+        Creates a new `ColorArray` that is part way between the current colours and the `other` colours, see
+        `Color.lerp`.
+
+        Args:
+            other: `ColorArray` or `Color` - the other colours. A `ColorArray` must be the same length.
+            factor: number or array - the amount of the other colour to mix, either a single value or one value per
+                        colour.
+
+        Returns:
+            The new `ColorArray`.
+        """
+        other = other.rgba if isinstance(other, ColorArray) else np.array(other.rgba, dtype=np.float32)
+        factor = np.clip(np.asarray(factor, dtype=np.float32), 0, 1)
+        if factor.ndim:
+            factor = factor[:, np.newaxis]
+        return ColorArray(self.rgba*(1 - factor) + other*factor)
+
+    def as_rgb_bytes(self):
+        """
+        Converts the colours into bytes, in the same way as `Color.as_rgb_bytes`.
+
+        Returns:
+            A uint8 array of shape (n, 3).
+        """
+        return (self.rgba[:, :3]*255).astype(np.uint8)
+
+    def as_rgba_bytes(self):
+        """
+        Converts the colours into bytes including alpha, in the same way as `Color.as_rgba_bytes`.
+
+        Returns:
+            A uint8 array of shape (n, 4).
+        """
+        return (self.rgba*255).astype(np.uint8)
+
+    def set_source(self, ctx, i):
+        """
+        Set one of the colours as the source of a Pycairo context, for example before drawing particle `i`.
+
+        Args:
+            ctx: Pycairo context - the drawing context.
+            i: int - the index of the colour.
+        """
+        r, g, b, a = self.rgba[i].tolist()
+        ctx.set_source_rgba(r, g, b, a)
+
+    def _hsl(self):
+        return _rgb_to_hsl(self.rgba[:, 0], self.rgba[:, 1], self.rgba[:, 2])
+
+    def _of_hsl(self, h, s, l):
+        return ColorArray.of_hsl(h, s, l, self.rgba[:, 3])
+
 
 def make_colormap(length, colors, bands=None):
     """
@@ -600,10 +860,11 @@ def make_colormap(length, colors, bands=None):
     Returns:
         A list of `Color` objects.
     """
+    return [Color(*rgba) for rgba in make_colormap_array(length, colors, bands).tolist()]
 
-    color_count = len(colors)
-
-    # Check parameters
+def _make_colormap_bands(length, color_count, bands):
+    # Returns, for each entry in the colormap, the index of the colour at the start of its band and the lerp factor
+    # within the band.
     if length <= 0:
         raise ValueError('length must be > 0')
     if color_count < 2:
@@ -613,27 +874,253 @@ def make_colormap(length, colors, bands=None):
     if color_count != len(bands) + 1:
         raise ValueError('colors list must be exactly 1 longer than bands list')
 
-
     band_total = sum(bands)
-    band_breakpoints = [int(x*length/band_total) for x in itertools.accumulate(bands)]
-
-    current_colour = 0
-    band_index = 0
-    colormap = [None]*length
-    band_size = []
-    for i in range(length):
-        while band_breakpoints[current_colour] <= i:
-            band_size.append(band_index)
-            current_colour += 1
-            band_index = 0
-        colormap[i] = (current_colour, band_index)
-        band_index += 1
-    band_size.append(band_index)
-
-    colormap = [colors[col].lerp(colors[col+1], band/(band_size[col]-1))
-                for col, band in colormap ]
-
-    return colormap
+    band_breakpoints = np.array([int(x*length/band_total) for x in itertools.accumulate(bands)])
+    # Rounding can leave the final breakpoint just short of the end
+    band_breakpoints[-1] = length
+    band_starts = np.concatenate(([0], band_breakpoints[:-1]))
+
+    positions = np.arange(length)
+    band = np.searchsorted(band_breakpoints, positions, side='right')
+    band_index = positions - band_starts[band]
+    band_size = band_breakpoints - band_starts
+    divisor = np.maximum(band_size[band] - 1, 1)
+    return band, band_index / divisor
+
+def make_colormap_array(length, colors, bands=None, hsl=False):
+    """
+    Create a colormap as a NumPy array of RGBA values, rather than a list of `Color` objects.
+
+    The colormap is calculated using array operations, so large colormaps can be created quickly. The RGB
+    interpolation uses the same arithmetic as `Color.lerp`, so the values are identical to the colours created by
+    `make_colormap`.
+
+    Args:
+        length: int - Total size of returned array.
+        colors: list[Colors] - Colours for creating the map. The list must be at least 2 long.
+        bands: list[number] - Relative size of each band, see `make_colormap`.
+        hsl: bool - if true, interpolate between colours in HSL space rather than RGB space. The hue changes the
+                    shorter way round the colour wheel.
+
+    Returns:
+        A float64 array of shape (length, 4) holding the r, g, b and a values of each entry, in the range 0.0 to 1.0.
+    """
+    band, factor = _make_colormap_bands(length, len(colors), bands)
+    factor = factor[:, np.newaxis]
+    values = np.array([color.rgba for color in colors], dtype=np.float64)
+    if hsl:
+        hls = np.array([colorsys.rgb_to_hls(*color.rgb) for color in colors], dtype=np.float64)
+        start = hls[band]
+        end = hls[band + 1]
+        # Interpolate the hue the shorter way round the colour wheel
+        end[:, 0] = start[:, 0] + (end[:, 0] - start[:, 0] + 0.5) % 1 - 0.5
+        h, l, s = (start*(1 - factor) + end*factor).T
+        rgba = np.empty((length, 4), dtype=np.float64)
+        rgba[:, 0], rgba[:, 1], rgba[:, 2] = _hsl_to_rgb(h % 1, s, l)
+        alpha = values[:, 3]
+        rgba[:, 3] = alpha[band]*(1 - factor[:, 0]) + alpha[band + 1]*factor[:, 0]
+    else:
+        rgba = values[band]*(1 - factor) + values[band + 1]*factor
+    return np.clip(rgba, 0, 1, out=rgba)
+
+def rgb_to_hsl(frame, out=None):
+    """
+    Convert a whole array of RGB colours, such as an image frame, to HSL. This gives the same results as the `h`, `s`
+    and `l` properties of `Color`, but converts every pixel at once.
+
+    The array can be a float array, holding values in the range 0.0 to 1.0, or a uint8 array, holding values 0 to 255.
+    For uint8 arrays, the hue is also scaled to the range 0 to 255.
+
+    Args:
+        frame: numpy array - an array whose last axis holds the r, g, b values of each colour, for example an image of
+                    shape (height, width, 3). If the last axis has a fourth, alpha, value it is copied unchanged.
+        out: numpy array - optional array for the result, with the same shape as `frame`. It can have a different
+                    type, for example float32 for a uint8 frame. It can be `frame` itself, to convert in place.
+
+    Returns:
+        An array of the same shape, holding h, s, l (and alpha) values. This is `out` if it was supplied, otherwise a
+        new array of the same type as `frame`.
+    """
+    return _convert_frame(_rgb_to_hsl, frame, out)
+
+def hsl_to_rgb(frame, out=None):
+    """
+    Convert a whole array of HSL colours, such as an image frame, to RGB. This gives the same results as
+    `Color.of_hsl`, but converts every pixel at once.
+
+    A typical use is to convert a frame to HSL with `rgb_to_hsl`, adjust the hue or lightness of every pixel using
+    NumPy operations, then convert it back to RGB with this function.
+
+    Args:
+        frame: numpy array - an array whose last axis holds the h, s, l values of each colour, see `rgb_to_hsl`. Hue
+                    values outside the normal range wrap around.
+        out: numpy array - optional array for the result, see `rgb_to_hsl`.
+
+    Returns:
+        An array of the same shape, holding r, g, b (and alpha) values.
+    """
+    return _convert_frame(_hsl_to_rgb_frame, frame, out)
+
+def rgb_to_hsv(frame, out=None):
+    """
+    Convert a whole array of RGB colours, such as an image frame, to HSV (hue, saturation, value). The results match
+    `colorsys.rgb_to_hsv`.
+
+    Args:
+        frame: numpy array - an array whose last axis holds the r, g, b values of each colour, see `rgb_to_hsl`.
+        out: numpy array - optional array for the result, see `rgb_to_hsl`.
+
+    Returns:
+        An array of the same shape, holding h, s, v (and alpha) values.
+    """
+    return _convert_frame(_rgb_to_hsv, frame, out)
+
+def hsv_to_rgb(frame, out=None):
+    """
+    Convert a whole array of HSV colours, such as an image frame, to RGB. The results match `colorsys.hsv_to_rgb`.
+
+    Args:
+        frame: numpy array - an array whose last axis holds the h, s, v values of each colour, see `rgb_to_hsl`. Hue
+                    values outside the normal range wrap around.
+        out: numpy array - optional array for the result, see `rgb_to_hsl`.
+
+    Returns:
+        An array of the same shape, holding r, g, b (and alpha) values.
+    """
+    return _convert_frame(_hsv_to_rgb, frame, out)
+
+# Number of pixels converted at a time. Working on part of a large frame at a time keeps the temporary arrays small.
+_CHUNK_PIXELS = 1 << 16
+
+def _frame_scale(array):
+    # The value that represents 1.0 in an array of colours
+    if array.dtype == np.uint8:
+        return 255
+    if np.issubdtype(array.dtype, np.floating):
+        return 1
+    raise ValueError('colour arrays must be uint8 or float')
+
+def _convert_frame(function, frame, out):
+    # Apply a vectorised conversion such as _rgb_to_hsl to the first 3 channels of a frame, a chunk at a time. Each
+    # chunk is completely read before it is written, so out can be the same array as frame.
+    frame = np.asarray(frame)
+    if frame.ndim < 1 or frame.shape[-1] not in (3, 4):
+        raise ValueError('the last axis of frame must hold 3 or 4 channels')
+    if out is None:
+        out = np.empty_like(frame)
+    elif out.shape != frame.shape:
+        raise ValueError('out must have the same shape as frame')
+    in_scale = _frame_scale(frame)
+    out_scale = _frame_scale(out)
+
+    if frame.ndim == 1:
+        chunks = [Ellipsis]
+    else:
+        step = max(1, _CHUNK_PIXELS*frame.shape[0]//max(1, frame.size//frame.shape[-1]))
+        chunks = [slice(start, start + step) for start in range(0, frame.shape[0], step)]
+
+    for chunk in chunks:
+        source = frame[chunk]
+        target = out[chunk]
+        channels = [_frame_channel(source, i, in_scale) for i in range(3)]
+        if frame.shape[-1] == 4 and in_scale != out_scale:
+            channels.append(_frame_channel(source, 3, in_scale))
+        results = list(function(*channels[:3])) + channels[3:]
+        for i, result in enumerate(results):
+            if out_scale == 1:
+                target[..., i] = result
+            else:
+                target[..., i] = np.clip(np.rint(result*out_scale), 0, out_scale)
+        if frame.shape[-1] == 4 and in_scale == out_scale and out is not frame:
+            target[..., 3] = source[..., 3]
+    return out
+
+def _frame_channel(source, i, scale):
+    # One channel of a chunk, as float values in the range 0.0 to 1.0. uint8 values are converted to float32.
+    if scale == 1:
+        return source[..., i]
+    return np.multiply(source[..., i], 1/scale, dtype=np.float32)
+
+def _as_float(x):
+    # Converts x to an array, keeping float32 or float64 values as they are
+    x = np.asarray(x)
+    return x if np.issubdtype(x.dtype, np.floating) else x.astype(np.float64)
+
+def _hsl_to_rgb(h, s, l):
+    # Vectorised equivalent of colorsys.hls_to_rgb, using the same arithmetic so the results are identical
+    h = _as_float(h)
+    s = _as_float(s)
+    l = _as_float(l)
+    m2 = np.where(l <= 0.5, l*(1 + s), l + s - l*s)
+    m1 = 2*l - m2
+    rgb = []
+    for hue in (h + 1/3, h, h - 1/3):
+        hue = hue % 1
+        value = np.select([hue < 1/6, hue < 0.5, hue < 2/3],
+                          [m1 + (m2 - m1)*hue*6, m2, m1 + (m2 - m1)*(2/3 - hue)*6],
+                          m1)
+        rgb.append(np.where(s == 0, l, value))
+    return tuple(rgb)
+
+def _hsl_to_rgb_frame(h, s, l):
+    # Faster version of _hsl_to_rgb, used for whole frames. Each channel is l plus or minus a, depending on where the
+    # hue lies relative to that channel. This avoids selecting between several arrays, and gives the same values to
+    # within rounding error.
+    a = s*np.minimum(l, 1 - l)
+    rgb = []
+    for n in (0, 8, 4):
+        k = (h*12 + n) % 12
+        rgb.append(l - a*np.clip(np.minimum(k - 3, 9 - k), -1, 1))
+    return tuple(rgb)
+
+def _rgb_to_hsl(r, g, b):
+    # Vectorised equivalent of colorsys.rgb_to_hls, returning h, s, l
+    r = _as_float(r)
+    g = _as_float(g)
+    b = _as_float(b)
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    l = sumc/2
+    grey = rangec == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.where(l <= 0.5, rangec/sumc, rangec/(2 - maxc - minc))
+    return _hue(r, g, b, maxc, rangec, grey), np.where(grey, 0.0, s), l
+
+def _hsv_to_rgb(h, s, v):
+    # Vectorised equivalent of colorsys.hsv_to_rgb, using the same approach as _hsl_to_rgb_frame
+    h = _as_float(h)
+    s = _as_float(s)
+    v = _as_float(v)
+    c = v*s
+    rgb = []
+    for n in (5, 3, 1):
+        k = (h*6 + n) % 6
+        rgb.append(v - c*np.clip(np.minimum(k, 4 - k), 0, 1))
+    return tuple(rgb)
+
+def _rgb_to_hsv(r, g, b):
+    # Vectorised equivalent of colorsys.rgb_to_hsv
+    r = _as_float(r)
+    g = _as_float(g)
+    b = _as_float(b)
+    maxc = np.maximum(np.maximum(r, g), b)
+    rangec = maxc - np.minimum(np.minimum(r, g), b)
+    grey = rangec == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = rangec/maxc
+    return _hue(r, g, b, maxc, rangec, grey), np.where(grey, 0.0, s), maxc
+
+def _hue(r, g, b, maxc, rangec, grey):
+    # The hue calculation shared by colorsys.rgb_to_hls and colorsys.rgb_to_hsv
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rc = (maxc - r)/rangec
+        gc = (maxc - g)/rangec
+        bc = (maxc - b)/rangec
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2 + rc - bc, 4 + gc - rc))
+    h = (h/6) % 1
+    return np.where(grey, 0.0, h)
 
 ## Colour schemes
 
@@ -0,0 +1,162 @@
+# Author:  Martin McBride
+# Created: 2026-10-16
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+"""
+The composite module combines several image frames into one, for example layers created by `make_image_frame` and
+`make_nparray_frame`.
+
+Frames are uint8 NumPy arrays with shape (pixel_height, pixel_width, channels). A frame with 4 channels is RGBA with
+unpremultiplied alpha, a frame with 3 channels is RGB and is treated as fully opaque. The layers are listed from the
+bottom up, so the first layer is the background.
+
+The supported modes are:
+
+* 'over' - the normal Porter-Duff source over operator. Each layer is drawn on top of the layers below, according to
+  its alpha.
+* 'add', 'multiply', 'screen' - separable blend modes, as defined by the W3C compositing specification. Where both
+  layers are opaque the colour channels are added (and limited to 255), multiplied, or screened. Where they are
+  partly transparent the blended colour is mixed with the layer colours, and composited using source over.
+* 'key' - each pixel of a layer completely replaces the pixel below, unless the layer pixel has the key colour (by
+  default pure white), in which case it is transparent. If the key is None, pixels with zero alpha are transparent.
+
+The calculations use integer arithmetic, so results are exact and repeatable. Each layer is rounded to 8 bits as it
+is applied, so compositing N layers in a single call gives the same result as compositing them one pair at a time.
+The frame is processed in bands of rows, so the temporary arrays stay small however large the frame is, and the bands
+can optionally be processed by several threads.
+"""
+
+import concurrent.futures
+import contextlib
+import numpy as np
+
+MODES = ('over', 'add', 'multiply', 'screen', 'key')
+
+# Maximum number of pixels in a band, if the band size isn't specified
+_CHUNK_PIXELS = 1 << 16
+
+
+def composite(layers, mode='over', out=None, key=(255, 255, 255), chunk_rows=None, threads=None):
+    """
+    Composite a list of layers into a single frame.
+
+    Args:
+        layers: list of numpy arrays - uint8 RGB or RGBA frames, all the same width and height, from the bottom layer
+                    to the top layer.
+        mode: str or sequence of str - one of the `MODES`, used to apply every layer. Alternatively, a sequence with
+                    one mode for each layer above the bottom layer.
+        out: numpy array - optional uint8 RGB or RGBA array to hold the result. It can be the bottom layer, in which
+                    case the layers are composited in place. If not supplied, a new array with the same number of
+                    channels as the bottom layer is created.
+        key: tuple - the RGB colour that is transparent in 'key' mode, or None to treat zero alpha as transparent.
+        chunk_rows: int - the number of rows processed at a time. By default this is chosen based on the frame width.
+        threads: int - the number of threads used to process the bands, or None to use the current thread.
+
+    Returns:
+        The composited frame (`out` if it was supplied).
+    """
+    if not len(layers):
+        raise ValueError('at least one layer is required')
+    height, width = layers[0].shape[:2]
+    for layer in layers:
+        if layer.dtype != np.uint8 or layer.ndim != 3 or layer.shape[:2] != (height, width) \
+                or layer.shape[2] not in (3, 4):
+            raise ValueError('layers must be uint8 RGB or RGBA frames with the same width and height')
+
+    modes = [mode]*(len(layers) - 1) if isinstance(mode, str) else list(mode)
+    if len(modes) != len(layers) - 1:
+        raise ValueError('mode must be a string, or a sequence with one mode for each layer above the bottom layer')
+    for m in modes:
+        if m not in MODES:
+            raise ValueError('mode must be one of ' + ', '.join(MODES))
+
+    if out is None:
+        out = np.empty(layers[0].shape, dtype=np.uint8)
+    elif out.dtype != np.uint8 or out.ndim != 3 or out.shape[:2] != (height, width) or out.shape[2] not in (3, 4):
+        raise ValueError('out must be a uint8 RGB or RGBA array with the same width and height as the layers')
+    if key is not None:
+        key = np.asarray(key, dtype=np.uint8)
+
+    if not chunk_rows:
+        chunk_rows = max(1, _CHUNK_PIXELS // max(width, 1))
+    chunks = [(start, min(start + chunk_rows, height)) for start in range(0, height, chunk_rows)]
+
+    def process(chunk):
+        start, stop = chunk
+        _composite_chunk([layer[start:stop] for layer in layers], modes, out[start:stop], key)
+
+    with concurrent.futures.ThreadPoolExecutor(threads) if threads else contextlib.nullcontext() as executor:
+        for _ in (executor.map if executor else map)(process, chunks):
+            pass
+    return out
+
+
+def _alpha(chunk, dtype=np.uint8):
+    if chunk.shape[2] == 4:
+        return chunk[:, :, 3].astype(dtype, copy=False)
+    return np.full(chunk.shape[:2], 255, dtype=dtype)
+
+
+def _composite_chunk(layers, modes, out, key):
+    # The result so far is held as 8 bit RGBA. Each channel is processed separately, as NumPy is much faster working on
+    # whole rows than broadcasting the alpha over interleaved channels.
+    result = np.empty(out.shape[:2] + (4,), dtype=np.uint8)
+    result[:, :, :3] = layers[0][:, :, :3]
+    result[:, :, 3] = _alpha(layers[0])
+    for layer, mode in zip(layers[1:], modes):
+        if mode == 'key':
+            if key is None:
+                mask = _alpha(layer) > 0
+            else:
+                mask = (layer[:, :, 0] != key[0]) | (layer[:, :, 1] != key[1]) | (layer[:, :, 2] != key[2])
+            for channel in range(3):
+                np.copyto(result[:, :, channel], layer[:, :, channel], where=mask)
+            np.copyto(result[:, :, 3], _alpha(layer), where=mask)
+        else:
+            _blend(result, layer, mode)
+    out[...] = result[:, :, :out.shape[2]]
+
+
+def _blend(result, layer, mode):
+    # With alpha values a/255, the W3C formulas are:
+    #   alpha = as + ab*(1 - as)
+    #   color = (as*((1 - ab)*cs + ab*B(cb, cs)) + ab*(1 - as)*cb) / alpha
+    # Everything is scaled by powers of 255 to keep it in integers, and the final division is rounded to nearest. The
+    # 'over' values fit in int32, the blend modes need int64.
+    dtype = np.int32 if mode == 'over' else np.int64
+    backdrop_alpha = result[:, :, 3].astype(dtype)
+    source_alpha = _alpha(layer, dtype)
+    inverse = 255 - source_alpha
+    total = source_alpha*255 + backdrop_alpha*inverse
+    if mode == 'over':
+        source_weight = source_alpha*255
+        backdrop_weight = backdrop_alpha*inverse
+        denominator = total
+    else:
+        source_weight = (255 - backdrop_alpha)*source_alpha*255
+        blend_weight = backdrop_alpha*source_alpha
+        backdrop_weight = backdrop_alpha*inverse*255
+        denominator = total*255
+    # If both pixels are fully transparent the numerator is 0, so the colour is 0
+    denominator = np.maximum(denominator, 1)
+    half = denominator//2
+
+    for channel in range(3):
+        backdrop = result[:, :, channel].astype(dtype)
+        source = layer[:, :, channel].astype(dtype)
+        numerator = source*source_weight
+        numerator += backdrop*backdrop_weight
+        if mode != 'over':
+            if mode == 'add':
+                blended = np.minimum(backdrop + source, 255)*255
+            elif mode == 'multiply':
+                blended = backdrop*source
+            else:
+                blended = (backdrop + source)*255 - backdrop*source
+            numerator += blended*blend_weight
+        numerator += half
+        # Floating point division is faster than integer division. The values are well within the range where float64
+        # represents them exactly, and the quotient is less than 256, so the floor is the exact integer quotient.
+        quotient = np.divide(numerator, denominator, dtype=np.float64)
+        result[:, :, channel] = np.floor(quotient, out=quotient)
+    result[:, :, 3] = (total + 127) // 255
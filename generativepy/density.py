@@ -0,0 +1,145 @@
+# Author:  Martin McBride
+# Created: 2026-10-16
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+"""
+The density module plots strange attractors (such as the Tinkerbell, Hopalong or King's Dream maps) as density images.
+
+An attractor is plotted by repeatedly applying a map to a point, and counting how many times the point lands in each
+pixel. Rather than following a single point in a Python loop, this module follows many points (seeds) at once. The
+map is applied to NumPy arrays holding the x and y coordinates of every seed, and the pixel positions are counted
+using `np.bincount`. The result is a 2D array of counts that can be coloured in the usual way, for example using
+`make_npcolormap` and `apply_npcolormap`.
+
+The map is a function that accepts arrays of x and y values, and returns new arrays of x and y values, for example:
+
+    def tinkerbell(x, y):
+        return x*x - y*y + A*x + B*y, 2*x*y + C*x + D*y
+
+The seeds can be split between worker processes (see the `parallel` module). Each worker counts the points from its
+own seeds, and the partial counts are added together at the end.
+
+Points that fall outside the image are ignored, as are points that become infinite or NaN.
+"""
+
+import functools
+import numpy as np
+from generativepy.bitmap import Scaler
+from generativepy.parallel import imap_ordered
+
+# The number of points counted by each call to np.bincount
+_BATCH_POINTS = 1 << 20
+
+
+def _bin_indices(scaler, x, y, out):
+    size = scaler.pixel_width*scaler.pixel_height
+    device_x = (x - scaler.startx) * scaler.pixel_width / scaler.width
+    device_y = (y - scaler.starty) * scaler.pixel_height / scaler.height
+    # Device coordinates are truncated towards zero, as in Scaler.user_to_device, so values just below 0 are in pixel 0
+    inside = (device_x > -1) & (device_x < scaler.pixel_width) & (device_y > -1) & (device_y < scaler.pixel_height)
+    out[...] = size
+    out[inside] = device_y[inside].astype(np.int64)*scaler.pixel_width + device_x[inside].astype(np.int64)
+
+
+def _accumulate_seeds(step, scaler, iterations, discard, seeds):
+    x, y = seeds
+    size = scaler.pixel_width*scaler.pixel_height
+    # Counts has an extra bin at the end for points outside the image
+    counts = np.zeros(size + 1, dtype=np.int64)
+    rows = max(1, _BATCH_POINTS // max(1, x.size))
+    indices = np.empty((rows, x.size), dtype=np.int64)
+    row = 0
+    with np.errstate(over='ignore', invalid='ignore'):
+        for i in range(discard + iterations):
+            x, y = step(x, y)
+            if i < discard:
+                continue
+            _bin_indices(scaler, np.asarray(x), np.asarray(y), indices[row])
+            row += 1
+            if row == rows:
+                counts += np.bincount(indices.ravel(), minlength=size + 1)
+                row = 0
+        if row:
+            counts += np.bincount(indices[:row].ravel(), minlength=size + 1)
+    return counts[:size]
+
+
+def random_seeds(count, startx, starty, width, height, seed=None):
+    """
+    Create seeds spread randomly over a rectangle.
+
+    Args:
+        count: int - the number of seeds.
+        startx: number - the minimum x value.
+        starty: number - the minimum y value.
+        width: number - the width of the rectangle.
+        height: number - the height of the rectangle.
+        seed: int - seed for the random number generator, so that the same seeds can be recreated.
+
+    Returns:
+        A tuple (x, y) of float arrays.
+    """
+    rng = np.random.default_rng(seed)
+    return startx + rng.random(count)*width, starty + rng.random(count)*height
+
+
+def accumulate_density(step, seeds, iterations, scaler, discard=0, workers=None, tasks=None):
+    """
+    Apply a map repeatedly to a set of seed points, and count how many times a point lands in each pixel.
+
+    Args:
+        step: function - the map. It is called as `step(x, y)` with arrays of x and y values, and must return a tuple
+                    of new x and y arrays.
+        seeds: tuple - a tuple (x, y) of arrays holding the starting points. A single seed can be given as two numbers.
+        iterations: int - the number of times the map is applied to each seed, after `discard`.
+        scaler: Scaler - a `generativepy.bitmap.Scaler` defining the image size and the area of the plane.
+        discard: int - the number of initial iterations that are not counted. This allows each seed to settle onto the
+                    attractor before it is plotted.
+        workers: int - the number of worker processes, or None to count every seed in the current process.
+        tasks: int - the number of groups the seeds are split into. Defaults to 1, or 4 per worker.
+
+    Returns:
+        An int64 numpy array of counts with shape (pixel_height, pixel_width).
+    """
+    x = np.atleast_1d(np.asarray(seeds[0], dtype=np.float64)).ravel()
+    y = np.atleast_1d(np.asarray(seeds[1], dtype=np.float64)).ravel()
+    if x.shape != y.shape:
+        raise ValueError('seeds x and y arrays must be the same size')
+    if tasks is None:
+        tasks = 4*workers if workers and workers > 1 else 1
+    tasks = max(1, min(tasks, x.size))
+    groups = zip(np.array_split(x, tasks), np.array_split(y, tasks))
+
+    counts = np.zeros(scaler.pixel_width*scaler.pixel_height, dtype=np.int64)
+    accumulate = functools.partial(_accumulate_seeds, step, scaler, iterations, discard)
+    for partial_counts in imap_ordered(accumulate, groups, workers):
+        counts += partial_counts
+    return counts.reshape((scaler.pixel_height, scaler.pixel_width))
+
+
+def make_density_paint(step, seeds, iterations, width=None, height=None, startx=0, starty=0, discard=0,
+                       workers=None):
+    """
+    Create a paint function, for use with `make_nparray_data`, that plots an attractor using `accumulate_density`. The
+    counts are added to channel 0 of the array, so the array should be created with `channels=1`.
+
+    Args:
+        step: function - the map, see `accumulate_density`.
+        seeds: tuple - the starting points, see `accumulate_density`.
+        iterations: int - the number of times the map is applied to each seed.
+        width: number - the image width in user coordinates, see `Scaler`.
+        height: number - the image height in user coordinates, see `Scaler`.
+        startx: number - the user space x coordinate of the device space origin.
+        starty: number - the user space y coordinate of the device space origin.
+        discard: int - the number of initial iterations that are not counted.
+        workers: int - the number of worker processes.
+
+    Returns:
+        A paint function.
+    """
+    def paint(image, pixel_width, pixel_height, frame_no, frame_count):
+        scaler = Scaler(pixel_width, pixel_height, width=width, height=height, startx=startx, starty=starty)
+        counts = accumulate_density(step, seeds, iterations, scaler, discard, workers)
+        image[:, :, 0] += counts.astype(image.dtype)
+
+    return paint
@@ -0,0 +1,177 @@
+# Author:  Martin McBride
+# Created: 2026-10-16
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+"""
+The draft module controls draft mode, which renders images and animations quickly at reduced quality, so that they can
+be previewed while they are being developed.
+
+In draft mode:
+
+* Frames are rendered at a fraction (`scale`) of their full size.
+* If `stride` is greater than 1, only every `stride`-th frame of a sequence is rendered, and each rendered frame is
+  repeated `stride` times. The sequence still has the same number of frames, so the timing of a movie is unchanged.
+* Povray scenes are rendered at a lower quality, without antialiasing.
+* If `upscale` is true, the frames are enlarged back to full size (by repeating pixels), so they can be used with
+  `MovieBuilder`, `composite` and so on, exactly like full quality frames.
+
+The same draw code works in draft mode:
+
+* For Pycairo draw functions (`make_image_frames` etc.), the drawing context is scaled before the draw function is
+  called, and the draw function is passed the full image size. Everything is drawn as normal, just at a lower
+  resolution.
+* Bitmap and nparray paint functions (`make_bitmap_frames`, `make_nparray_frames` etc.) are passed the reduced image
+  size. Paint functions that use a `Scaler` to convert between user coordinates and pixels work unchanged.
+* Povray draw functions are passed the full image size, only the rendered image is smaller.
+
+Draft mode can be turned on for a whole script using `set_draft`, for example depending on a command line option. It
+can also be set for a single call, using the `draft` parameter of the functions that support it, which overrides the
+global setting. Frames rendered in draft mode are never stored in a `RenderCache`.
+"""
+
+import numpy as np
+from generativepy.framestream import FrameSource
+
+_DRAFT = None
+
+
+class Draft:
+    """
+    Draft mode settings.
+    """
+
+    def __init__(self, scale=0.25, stride=1, upscale=True, quality=4, antialiasing=None):
+        """
+        Args:
+            scale: number - the scale factor applied to the image size, greater than 0 and no more than 1.
+            stride: int - render every `stride`-th frame of a sequence, repeating each frame to fill the gaps.
+            upscale: bool - if true, enlarge the frames back to full size.
+            quality: int - the povray render quality, 0 to 11. Full quality is 9.
+            antialiasing: number - the povray antialiasing threshold, or None for no antialiasing.
+        """
+        if not 0 < scale <= 1:
+            raise ValueError('scale must be greater than 0 and no more than 1')
+        if int(stride) != stride or stride < 1:
+            raise ValueError('stride must be a whole number, 1 or greater')
+        self.scale = scale
+        self.stride = int(stride)
+        self.upscale = upscale
+        self.quality = quality
+        self.antialiasing = antialiasing
+
+    def size(self, width, height):
+        """
+        Calculate the reduced image size.
+
+        Args:
+            width: int - the full width in pixels.
+            height: int - the full height in pixels.
+
+        Returns:
+            A tuple (width, height) of the draft size in pixels. Each is at least 1.
+        """
+        return max(1, round(width*self.scale)), max(1, round(height*self.scale))
+
+    def frame_numbers(self, count):
+        """
+        Get the numbers of the frames that are rendered for a sequence.
+
+        Args:
+            count: int - the number of frames in the full sequence.
+
+        Returns:
+            A range of frame numbers.
+        """
+        return range(0, count, self.stride)
+
+    def expand(self, frames, count):
+        """
+        Repeat each rendered frame to fill the sequence.
+
+        Args:
+            frames: iterable of frames - the frames rendered for `frame_numbers(count)`.
+            count: int - the number of frames in the full sequence.
+
+        Yields:
+            `count` frames.
+        """
+        remaining = count
+        for frame in frames:
+            for _ in range(min(self.stride, remaining)):
+                yield frame
+            remaining -= self.stride
+
+    def frame_source(self, render, count, cache_size=8):
+        """
+        Create a `FrameSource` for a draft sequence. Frame `n` of the source shows the rendered frame at or before `n`
+        in `frame_numbers(count)`.
+
+        Args:
+            render: function - accepts a frame number and returns the draft frame.
+            count: int - the number of frames in the full sequence.
+            cache_size: int - the number of recently used frames that are kept.
+
+        Returns:
+            A `FrameSource`.
+        """
+        source = FrameSource(render, count, cache_size)
+        return FrameSource(lambda frame_no: source[frame_no - frame_no % self.stride], count, 0)
+
+    def output(self, frame, width, height):
+        """
+        Prepare a rendered frame for output, enlarging it to full size if `upscale` is set. Each pixel is repeated, so
+        the preview shows the actual draft pixels.
+
+        Args:
+            frame: numpy array - the draft frame.
+            width: int - the full width in pixels.
+            height: int - the full height in pixels.
+
+        Returns:
+            The output frame.
+        """
+        if not self.upscale or frame.shape[:2] == (height, width):
+            return frame
+        rows = np.arange(height)*frame.shape[0]//height
+        columns = np.arange(width)*frame.shape[1]//width
+        return frame[rows[:, np.newaxis], columns]
+
+
+def set_draft(draft=True):
+    """
+    Set the global draft mode, used by every function that supports draft mode, unless it is overridden in the call.
+
+    Args:
+        draft: bool, number or Draft - True to use the default `Draft` settings, a number to use the default settings
+                    with that scale, a `Draft` object, or False or None to turn draft mode off.
+    """
+    global _DRAFT
+    _DRAFT = _make_draft(draft)
+
+
+def get_draft(draft=None):
+    """
+    Get the draft settings that apply to a call.
+
+    Args:
+        draft: bool, number or Draft - the `draft` parameter of the call, see `set_draft`. If None, the global setting
+                    is used. If False, draft mode is off for the call.
+
+    Returns:
+        A `Draft` object, or None if draft mode is off.
+    """
+    if draft is None:
+        return _DRAFT
+    return _make_draft(draft)
+
+
+def _make_draft(draft):
+    if draft is None or draft is False:
+        return None
+    if draft is True:
+        return Draft()
+    if isinstance(draft, Draft):
+        return draft
+    if isinstance(draft, (int, float)):
+        return Draft(scale=draft)
+    raise ValueError('draft must be a bool, a number, a Draft object or None')
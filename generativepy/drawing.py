@@ -12,8 +12,14 @@ of most of the primitive drawing functions.
 """
 
 import cairo
+import functools
 import generativepy.utils
+from generativepy.draft import get_draft
+from generativepy.framestream import FrameSource
+from generativepy.parallel import imap_ordered
+from generativepy.png import PngWriter, PngSequenceWriter
 import numpy as np
+from PIL import Image
 
 # Text align
 
@@ -125,7 +131,75 @@ def make_image(outfile, draw, width, height, channels=3):
     surface.write_to_png(outfile + '.png')
 
 
-def make_images(outfile, draw, width, height, count, channels=3):
+def make_image_tiled(outfile, draw, width, height, channels=3, tile_size=1024, workers=None, stream=False):
+    """
+    Used to create a single, very large PNG image. The result is the same as `make_image`, but the image is split into
+    square tiles, and each tile is drawn separately, optionally using a pool of worker processes.
+
+    For each tile, the user supplied `draw` function is called with a context that is translated so that the tile is
+    drawn at the correct position, and clipped to the tile. The `pixel_width` and `pixel_height` passed to `draw` are
+    the size of the full image, so `setup` works exactly the same as it does with `make_image`. The draw function must
+    not reset the context's transformation matrix (for example by calling `identity_matrix`), and it must give the same
+    result each time it is called.
+
+    If `stream` is true, the image is written to the PNG file one row of tiles at a time, so the full image never needs
+    to be held in memory.
+
+    The draw function must have the signature described for `example_draw_function`.
+
+    Args:
+        outfile: str - The path and filename for the output PNG file. The '.png' extension is optional, it will be added
+                    if it isn't present.
+        draw: function - A drawing function object, see below.
+        pixel_width: int - The width of the image that will be created, in pixels.
+        pixel_height: int - The height of the image that will be created, in pixels.
+        channels: int - The number of colour channels. 1 for greyscale, 3 for RGB, 4 for RGBA.
+        tile_size: int - The width and height of each tile, in pixels.
+        workers: int - The number of worker processes to use, or None to draw every tile in the current process.
+        stream: bool - If true, write the image a row of tiles at a time rather than creating the full image in memory.
+    """
+    if outfile.lower().endswith('.png'):
+        outfile = outfile[:-4]
+    if tile_size < 1:
+        raise ValueError('tile_size must be at least 1')
+
+    tiles = [(x, y, min(tile_size, width - x), min(tile_size, height - y))
+             for y in range(0, height, tile_size) for x in range(0, width, tile_size)]
+    render = functools.partial(_render_image_tile, draw, width, height, channels)
+    results = zip(tiles, imap_ordered(render, tiles, workers))
+
+    if stream:
+        with PngWriter(outfile + '.png', width, height, channels) as writer:
+            band = None
+            for (x, y, w, h), tile in results:
+                if x == 0:
+                    band = np.empty((h, width, channels), dtype=np.uint8)
+                band[:, x:x + w] = tile
+                if x + w == width:
+                    writer.write_rows(band)
+    else:
+        image = np.empty((height, width, channels), dtype=np.uint8)
+        for (x, y, w, h), tile in results:
+            image[y:y + h, x:x + w] = tile
+        Image.fromarray(image[:, :, 0] if channels == 1 else image).save(outfile + '.png')
+
+
+def _render_image_tile(draw, width, height, channels, tile):
+    x, y, w, h = tile
+    fmt = cairo.FORMAT_ARGB32 if channels==4 else cairo.FORMAT_RGB24
+    surface = cairo.ImageSurface(fmt, w, h)
+    ctx = cairo.Context(surface)
+    ctx.rectangle(0, 0, w, h)
+    ctx.clip()
+    ctx.translate(-x, -y)
+    draw(ctx, width, height, 0, 1)
+    surface.flush()
+    a = np.frombuffer(surface.get_data(), np.uint8)
+    a.shape = (h, w, 4)
+    return generativepy.utils.convert_pycairo_data(a, channels)
+
+
+def make_images(outfile, draw, width, height, count, channels=3, workers=None, encoders=None, compress_level=None):
     """
     Used to create a sequence of PNG images. These can be combined into an animated GIF or video. This is similar to
     `make_image` except it creates `count` files instead of just one.
@@ -139,6 +213,12 @@ def make_images(outfile, draw, width, height, count, channels=3):
     The paint function must have the signature described for `example_draw_function`. Each time the draw function is
     called, `fn` will contain the frame number - 0, 1 etc
 
+    If `workers` is set, the images are drawn and saved by a pool of worker processes (see the `parallel` module).
+
+    If `encoders` or `compress_level` is set, the images are converted to frames and saved using PIL rather than
+    Pycairo. With `encoders`, the frames are compressed and saved by background threads while the next frames are being
+    drawn (see `PngSequenceWriter`).
+
     Args:
         outfile: str - The path and filename template for the output PNG file. The '.png' extension is optional, it
                     will be added if it isn't present.
@@ -147,18 +227,35 @@ def make_images(outfile, draw, width, height, count, channels=3):
         pixel_height: int - The height of the image that will be created, in pixels.
         count: int - the number of images to create
         channels: int - The number of colour channels. 1 for greyscale, 3 for RGB, 4 for RGBA.
+        workers: int - The number of worker processes to use, or None to draw every image in the current process.
+        encoders: int - The number of encoder threads.
+        compress_level: int - zlib compression level, 0 (no compression) to 9 (best compression), or None for the
+                    default level.
     """
+    if encoders or compress_level is not None:
+        frames = make_image_frames(draw, width, height, count, channels, workers=workers)
+        with PngSequenceWriter(outfile, encoders, compress_level=compress_level) as writer:
+            for frame in frames:
+                writer.write(frame)
+        return
+
     if outfile.lower().endswith('.png'):
         outfile = outfile[:-4]
-    for i in range(count):
-        fmt = cairo.FORMAT_ARGB32 if channels==4 else cairo.FORMAT_RGB24
-        surface = cairo.ImageSurface(fmt, width, height)
-        ctx = cairo.Context(surface)
-        draw(ctx, width, height, i, count)
-        surface.write_to_png(outfile + str(i).zfill(8) + '.png')
+    write = functools.partial(_write_image, outfile, draw, width, height, channels, count)
+    for _ in imap_ordered(write, range(count), workers):
+        pass
+
+
+def _write_image(outfile, draw, width, height, channels, count, frame_no):
+    fmt = cairo.FORMAT_ARGB32 if channels==4 else cairo.FORMAT_RGB24
+    surface = cairo.ImageSurface(fmt, width, height)
+    ctx = cairo.Context(surface)
+    draw(ctx, width, height, frame_no, count)
+    surface.write_to_png(outfile + str(frame_no).zfill(8) + '.png')
 
 
-def make_image_frames(draw, width, height, count, channels=3):
+def make_image_frames(draw, width, height, count, channels=3, workers=None, buffers=None, out=None, cache=None,
+                      draft=None):
     """
     Used to create a single image as a frame. A frame is a NumPy array with shape (pixel_height, pixel_width, channels).
 
@@ -167,6 +264,21 @@ def make_image_frames(draw, width, height, count, channels=3):
 
     The function returns a lazy iterator. When this iterator is evaluated, the image frames are created on demand.
 
+    If `workers` is set, the frames are drawn by a pool of worker processes (see the `parallel` module). The frames are
+    still returned in order, and only a few frames are drawn ahead of the frame being consumed, so memory use stays
+    bounded however long the sequence is.
+
+    If `buffers` or `out` is set, a single Pycairo surface is reused for every frame, and each frame is written into
+    one of a small ring of output arrays, rather than allocating new ones for every frame. In that case a frame is only
+    valid until the ring wraps around, so a consumer that keeps frames must copy them. This mode can't be combined with
+    `workers`.
+
+    If `cache` is set, frames that have already been drawn by the same draw function, with the same settings, are
+    loaded from the cache rather than being drawn again (see the `cache` module).
+
+    In draft mode (see the `draft` module) the frames are drawn at a reduced size, and `buffers`, `out` and `cache`
+    are not used.
+
     The draw function must have the signature described for `example_draw_function`. Each time the paint function is
     called, `fn` will contain the frame number - 0, 1 etc
 
@@ -175,22 +287,126 @@ def make_image_frames(draw, width, height, count, channels=3):
         pixel_width: int - The width of the image that will be created, in pixels.
         pixel_height: int - The height of the image that will be created, in pixels.
         channels: int - The number of colour channels. 1 for greyscale, 3 for RGB, 4 for RGBA.
+        workers: int - The number of worker processes to use, or None to draw every frame in the current process.
+        buffers: int - The number of output arrays in the ring, if `out` isn't supplied.
+        out: numpy array or list of numpy arrays - Optional uint8 arrays of shape (pixel_height, pixel_width, channels)
+                    to hold the frames. They are used in rotation.
+        cache: RenderCache - Optional cache of previously drawn frames.
+        draft: bool, number or Draft - Draft mode setting for this call, see `draft.get_draft`.
 
     Yields:
         A frame.
     """
+    draft = get_draft(draft)
+    if draft is not None:
+        render = functools.partial(_render_draft_image_frame, draw, width, height, channels, count, draft)
+        yield from draft.expand(imap_ordered(render, draft.frame_numbers(count), workers), count)
+        return
+
+    if buffers or out is not None:
+        if workers and workers > 1:
+            raise ValueError('buffers and out cannot be used with workers')
+        yield from _make_pooled_image_frames(draw, width, height, count, channels, buffers, out, cache)
+        return
+
+    render = functools.partial(_render_image_frame, draw, width, height, channels, count)
+    if cache is not None:
+        render = cache.wrap(render, draw, ('image', width, height, channels, count))
+    yield from imap_ordered(render, range(count), workers)
+
+
+def make_image_frame_source(draw, width, height, count, channels=3, cache=None, cache_size=8, draft=None):
+    """
+    Create a random access sequence of frames. This is similar to `make_image_frames`, except that it returns a
+    `FrameSource`, so frames can be requested in any order, and only the frames that are requested are drawn.
+
+    Args:
+        draw: function - A drawing function object, see `example_draw_function`.
+        width: int - The width of the image that will be created, in pixels.
+        height: int - The height of the image that will be created, in pixels.
+        count: int - The number of frames.
+        channels: int - The number of colour channels. 1 for greyscale, 3 for RGB, 4 for RGBA.
+        cache: RenderCache - Optional cache of previously drawn frames.
+        cache_size: int - The number of recently used frames kept in memory.
+        draft: bool, number or Draft - Draft mode setting for this call, see `draft.get_draft`.
+
+    Returns:
+        A `FrameSource`.
+    """
+    draft = get_draft(draft)
+    if draft is not None:
+        render = functools.partial(_render_draft_image_frame, draw, width, height, channels, count, draft)
+        return draft.frame_source(render, count, cache_size)
+    render = functools.partial(_render_image_frame, draw, width, height, channels, count)
+    if cache is not None:
+        render = cache.wrap(render, draw, ('image', width, height, channels, count))
+    return FrameSource(render, count, cache_size)
+
+
+def _make_pooled_image_frames(draw, width, height, count, channels, buffers, out, cache):
+    if out is None:
+        out = [np.empty((height, width, channels), dtype=np.uint8) for _ in range(buffers)]
+    elif isinstance(out, np.ndarray):
+        out = [out]
+    for array in out:
+        if array.shape != (height, width, channels) or array.dtype != np.uint8:
+            raise ValueError('out arrays must be uint8 with shape (height, width, channels)')
+
     fmt = cairo.FORMAT_ARGB32 if channels==4 else cairo.FORMAT_RGB24
+    surface = cairo.ImageSurface(fmt, width, height)
+    ctx = cairo.Context(surface)
+    a = np.frombuffer(surface.get_data(), np.uint8)
+    a.shape = (height, width, 4)
+    cached = cache.wrap(None, draw, ('image', width, height, channels, count)) if cache is not None else None
     for i in range(count):
-        surface = cairo.ImageSurface(fmt, width, height)
-        ctx = cairo.Context(surface)
+        frame = out[i % len(out)]
+        if cached is not None:
+            cached_frame = cached.load(i)
+            if cached_frame is not None:
+                np.copyto(frame, cached_frame)
+                yield frame
+                continue
+        ctx.save()
+        ctx.set_operator(cairo.OPERATOR_CLEAR)
+        ctx.paint()
+        ctx.restore()
+        ctx.new_path()
+        ctx.save()
         draw(ctx, width, height, i, count)
-        buf = surface.get_data()
-        a = np.frombuffer(buf, np.uint8)
-        a.shape = (height, width, 4)
-        a = generativepy.utils.correct_pycairo_byte_order(a, channels)
-        yield a
+        ctx.restore()
+        surface.flush()
+        generativepy.utils.convert_pycairo_data(a, channels, frame)
+        if cached is not None:
+            cached.store(i, frame)
+        yield frame
 
-def make_image_frame(draw, width, height, channels=3):
+
+def _render_image_frame(draw, width, height, channels, count, frame_no):
+    fmt = cairo.FORMAT_ARGB32 if channels==4 else cairo.FORMAT_RGB24
+    surface = cairo.ImageSurface(fmt, width, height)
+    ctx = cairo.Context(surface)
+    draw(ctx, width, height, frame_no, count)
+    surface.flush()
+    buf = surface.get_data()
+    a = np.frombuffer(buf, np.uint8)
+    a.shape = (height, width, 4)
+    return generativepy.utils.convert_pycairo_data(a, channels)
+
+
+def _render_draft_image_frame(draw, width, height, channels, count, draft, frame_no):
+    # Draw on a smaller surface, scaled so that the draw function can use the full size
+    draft_width, draft_height = draft.size(width, height)
+    fmt = cairo.FORMAT_ARGB32 if channels==4 else cairo.FORMAT_RGB24
+    surface = cairo.ImageSurface(fmt, draft_width, draft_height)
+    ctx = cairo.Context(surface)
+    ctx.scale(draft_width / width, draft_height / height)
+    draw(ctx, width, height, frame_no, count)
+    surface.flush()
+    a = np.frombuffer(surface.get_data(), np.uint8)
+    a.shape = (draft_height, draft_width, 4)
+    return draft.output(generativepy.utils.convert_pycairo_data(a, channels), width, height)
+
+def make_image_frame(draw, width, height, channels=3, draft=None):
     """
     Used to create a single image as a frame. A frame is a NumPy array with shape (pixel_height, pixel_width, channels).
 
@@ -204,22 +420,23 @@ def make_image_frame(draw, width, height, channels=3):
         pixel_width: int - The width of the image that will be created, in pixels.
         pixel_height: int - The height of the image that will be created, in pixels.
         channels: int - The number of colour channels. 1 for greyscale, 3 for RGB, 4 for RGBA.
+        draft: bool, number or Draft - Draft mode setting for this call, see `draft.get_draft`.
 
     Yields:
         A frame.
     """
+    draft = get_draft(draft)
+    if draft is not None:
+        return _render_draft_image_frame(draw, width, height, channels, 1, draft, 0)
     fmt = cairo.FORMAT_ARGB32 if channels==4 else cairo.FORMAT_RGB24
     surface = cairo.ImageSurface(fmt, width, height)
     ctx = cairo.Context(surface)
     draw(ctx, width, height, 0, 1)
+    surface.flush()
     buf = surface.get_data()
     a = np.frombuffer(buf, np.uint8)
     a.shape = (height, width, 4)
-    if channels==3:
-        a[:, :, [0, 1, 2]] = a[:, :, [2, 1, 0]]
-    elif channels==4:
-        a[:, :, [0, 1, 2, 3]] = a[:, :, [2, 1, 0, 3]]
-    return a
+    return generativepy.utils.convert_pycairo_data(a, channels)
 
 
 def make_svg(outfile, draw, width, height):
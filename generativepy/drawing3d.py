@@ -3,10 +3,12 @@
 # Copyright (C) 2018, Martin McBride
 # License: MIT
 
+import functools
 import moderngl
 import numpy as np
 from PIL import Image
 from generativepy.color import Color
+from generativepy.framestream import FrameSource
 
 
 def make_3dimage(outfile, draw, width, height, background=Color(0), channels=3):
@@ -63,20 +65,39 @@ def make_3dimage_frames(draw, width, height, count, background=Color(0), channel
     :return:
     '''
     for i in range(count):
-        ctx = moderngl.create_standalone_context()
-        fbo = ctx.simple_framebuffer((width, height))
-        fbo.use()
-        fbo.clear(*background)
+        yield _render_3dimage_frame(draw, width, height, count, background, i)
 
-        draw(ctx, width, height, i, count)
+def make_3dimage_frame_source(draw, width, height, count, background=Color(0), channels=3, cache_size=8):
+    '''
+    Create a random access sequence of numpy frames using moderngl. Frames can be requested in any order, and only the
+    frames that are requested are drawn.
+    :param draw: the draw function
+    :param width: width in pixels, int
+    :param height: height in pixels, int
+    :param count: number of frames
+    :param background: background colour
+    :param channels: 3 for rgb, 4 for rgba
+    :param cache_size: number of recently used frames kept in memory
+    :return: a FrameSource
+    '''
+    render = functools.partial(_render_3dimage_frame, draw, width, height, count, background)
+    return FrameSource(render, count, cache_size)
 
-        data = fbo.read()
-        frame = np.frombuffer(data, dtype=np.uint8)
-        frame = frame.reshape((height, width, 3))
-        frame = frame[::-1]
-        ctx.release()
+def _render_3dimage_frame(draw, width, height, count, background, frame_no):
+    ctx = moderngl.create_standalone_context()
+    fbo = ctx.simple_framebuffer((width, height))
+    fbo.use()
+    fbo.clear(*background)
+
+    draw(ctx, width, height, frame_no, count)
 
-        yield frame
+    data = fbo.read()
+    frame = np.frombuffer(data, dtype=np.uint8)
+    frame = frame.reshape((height, width, 3))
+    frame = frame[::-1]
+    ctx.release()
+
+    return frame
 
 def make_3dimages(outfile, draw, width, height, background=Color(0), channels=3):
     '''
@@ -0,0 +1,257 @@
+# Author:  Martin McBride
+# Created: 2026-10-16
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+"""
+The fractal module calculates escape time fractals (Mandelbrot, Julia and Burning Ship sets) and Newton fractals,
+using NumPy array operations.
+
+The area of the complex plane is defined by a `generativepy.bitmap.Scaler`. Each function returns a 2D array with
+shape (pixel_height, pixel_width) holding the escape count of each pixel. The counts follow the usual generativepy
+convention: a pixel that escapes on iteration `i` (counting from 0) has count `i + 1`, and a pixel that never escapes
+has count 0. The counts array can be coloured using `make_npcolormap` and `apply_npcolormap` from the `nparray` module.
+
+The image is processed in bands of rows. Within a band, pixels that have escaped are removed from the working arrays,
+so each iteration only does work for the pixels that are still active. If `workers` is set, the bands are calculated
+in parallel by a pool of worker processes (see the `parallel` module).
+
+`zoom_frames` creates a sequence of frames that zoom into a point of a fractal, for use with `MovieBuilder` or
+`save_frames`.
+"""
+
+import functools
+import numpy as np
+from generativepy.bitmap import Scaler
+from generativepy.nparray import apply_npcolormap
+from generativepy.parallel import imap_ordered
+
+# Maximum number of pixels in a band, if the band size isn't specified
+_BAND_PIXELS = 1 << 16
+
+# The roots of z**3 - 1, in the order used by `newton`
+CUBE_ROOTS = (complex(-0.5, 0.866025), complex(-0.5, -0.866025), complex(1, 0))
+
+
+def _cube(z):
+    return z**3 - 1
+
+
+def _cube_derivative(z):
+    return 3*z**2
+
+
+def _band_grid(scaler, start, stop):
+    x, y = scaler.device_to_user_grid(rows=(start, stop))
+    return x.ravel(), y.ravel()
+
+
+def _escape_band(kind, c, max_count, escape_radius, smooth, scaler, band):
+    start, stop = band
+    x, y = _band_grid(scaler, start, stop)
+    if kind == 'julia':
+        cx = np.full(x.shape, c.real)
+        cy = np.full(x.shape, c.imag)
+    else:
+        cx, cy = x, y
+        x = np.zeros(cx.shape)
+        y = np.zeros(cx.shape)
+
+    counts = np.zeros(x.shape, dtype=np.float64 if smooth else np.int64)
+    index = np.arange(x.size)
+    limit = escape_radius*escape_radius
+    for i in range(max_count):
+        xy = x*y
+        if kind == 'burning_ship':
+            xy = np.abs(xy)
+        x, y = x*x - y*y + cx, 2*xy + cy
+        modulus = x*x + y*y
+        escaped = modulus > limit
+        if smooth:
+            # Reduce the count depending on how far past the radius the point escaped, so the values are continuous
+            counts[index[escaped]] = i + 1 - np.log2(np.log(modulus[escaped]) / (2*np.log(escape_radius)))
+        else:
+            counts[index[escaped]] = i + 1
+        remaining = ~escaped
+        x, y, cx, cy, index = x[remaining], y[remaining], cx[remaining], cy[remaining], index[remaining]
+        if not index.size:
+            break
+    return counts.reshape((stop - start, scaler.pixel_width))
+
+
+def _newton_band(roots, function, derivative, max_count, limit, scaler, band):
+    start, stop = band
+    x, y = _band_grid(scaler, start, stop)
+    z = x + y*1j
+    found_roots = np.zeros(z.shape, dtype=np.int64)
+    counts = np.zeros(z.shape, dtype=np.int64)
+    index = np.arange(z.size)
+    for i in range(max_count):
+        dz = derivative(z)
+        nonzero = dz != 0
+        z[nonzero] = z[nonzero] - function(z[nonzero])/dz[nonzero]
+        found = np.zeros(z.shape, dtype=bool)
+        for root_index, root in enumerate(roots, 1):
+            converged = ~found & (np.abs(z - root) < limit)
+            found_roots[index[converged]] = root_index
+            counts[index[converged]] = i + 1
+            found |= converged
+        remaining = ~found
+        z, index = z[remaining], index[remaining]
+        if not index.size:
+            break
+    shape = (stop - start, scaler.pixel_width)
+    return found_roots.reshape(shape), counts.reshape(shape)
+
+
+def _bands(scaler, band_rows, workers):
+    if band_rows is None:
+        band_rows = max(1, _BAND_PIXELS // scaler.pixel_width)
+        if workers and workers > 1:
+            # Make sure there are enough bands to keep every worker busy
+            band_rows = max(1, min(band_rows, scaler.pixel_height // (4*workers)))
+    return [(start, min(start + band_rows, scaler.pixel_height)) for start in range(0, scaler.pixel_height, band_rows)]
+
+
+def _escape_counts(kind, scaler, c, max_count, escape_radius, smooth, workers, band_rows):
+    if max_count < 1:
+        raise ValueError('max_count must be at least 1')
+    render = functools.partial(_escape_band, kind, c, max_count, escape_radius, smooth, scaler)
+    return np.concatenate(list(imap_ordered(render, _bands(scaler, band_rows, workers), workers)))
+
+
+def mandelbrot(scaler, max_count=256, escape_radius=2, smooth=False, workers=None, band_rows=None):
+    """
+    Calculate the escape counts of the Mandelbrot set, z -> z*z + c, where c is the position of the pixel and z starts
+    at 0.
+
+    Args:
+        scaler: Scaler - defines the image size and the area of the complex plane. The real part is the x axis.
+        max_count: int - the maximum number of iterations.
+        escape_radius: number - a point has escaped when its modulus is greater than this value.
+        smooth: bool - if true, return float counts that vary continuously. An escaped point has a value slightly less
+                    than its integer count, usually between `count - 1` and `count`. A larger `escape_radius` (for
+                    example 100) gives smoother results.
+        workers: int - the number of worker processes, or None to calculate every band in the current process.
+        band_rows: int - the number of rows in each band. By default this is chosen based on the image size.
+
+    Returns:
+        A numpy array of counts with shape (pixel_height, pixel_width). The array is int64, or float64 if `smooth` is
+        true.
+    """
+    return _escape_counts('mandelbrot', scaler, None, max_count, escape_radius, smooth, workers, band_rows)
+
+
+def julia(scaler, c, max_count=256, escape_radius=2, smooth=False, workers=None, band_rows=None):
+    """
+    Calculate the escape counts of a Julia set, z -> z*z + c, where c is constant and z starts at the position of the
+    pixel.
+
+    Args:
+        scaler: Scaler - defines the image size and the area of the complex plane. The real part is the x axis.
+        c: complex - the constant that defines the Julia set.
+        max_count: int - the maximum number of iterations.
+        escape_radius: number - a point has escaped when its modulus is greater than this value.
+        smooth: bool - if true, return float counts that vary continuously, see `mandelbrot`.
+        workers: int - the number of worker processes, or None to calculate every band in the current process.
+        band_rows: int - the number of rows in each band. By default this is chosen based on the image size.
+
+    Returns:
+        A numpy array of counts with shape (pixel_height, pixel_width). The array is int64, or float64 if `smooth` is
+        true.
+    """
+    return _escape_counts('julia', scaler, complex(c), max_count, escape_radius, smooth, workers, band_rows)
+
+
+def burning_ship(scaler, max_count=256, escape_radius=2, smooth=False, workers=None, band_rows=None):
+    """
+    Calculate the escape counts of the Burning Ship fractal. This is similar to the Mandelbrot set, except that the
+    imaginary part of each new value uses the absolute value of x*y, that is (x, y) -> (x*x - y*y + cx, abs(2*x*y) + cy).
+
+    Args:
+        scaler: Scaler - defines the image size and the area of the complex plane. The real part is the x axis.
+        max_count: int - the maximum number of iterations.
+        escape_radius: number - a point has escaped when its modulus is greater than this value.
+        smooth: bool - if true, return float counts that vary continuously, see `mandelbrot`.
+        workers: int - the number of worker processes, or None to calculate every band in the current process.
+        band_rows: int - the number of rows in each band. By default this is chosen based on the image size.
+
+    Returns:
+        A numpy array of counts with shape (pixel_height, pixel_width). The array is int64, or float64 if `smooth` is
+        true.
+    """
+    return _escape_counts('burning_ship', scaler, None, max_count, escape_radius, smooth, workers, band_rows)
+
+
+def newton(scaler, roots=CUBE_ROOTS, function=None, derivative=None, max_count=100, limit=0.01, workers=None,
+           band_rows=None):
+    """
+    Calculate a Newton fractal. Newton's method is applied to each pixel, z -> z - f(z)/f'(z), until z is within
+    `limit` of one of the roots of f. A point where f'(z) is 0 doesn't move.
+
+    By default f is z**3 - 1. Other functions can be used by supplying `function`, `derivative` and `roots`. The
+    functions are called with a complex numpy array, and should return an array of the same shape.
+
+    Args:
+        scaler: Scaler - defines the image size and the area of the complex plane. The real part is the x axis.
+        roots: sequence of complex - the roots of the function.
+        function: function - the function f, or None for z**3 - 1.
+        derivative: function - the derivative of f, or None for 3*z**2.
+        max_count: int - the maximum number of iterations.
+        limit: number - a point has converged when it is closer than this to a root.
+        workers: int - the number of worker processes, or None to calculate every band in the current process.
+        band_rows: int - the number of rows in each band. By default this is chosen based on the image size.
+
+    Returns:
+        A tuple (roots, counts) of int64 numpy arrays, with shape (pixel_height, pixel_width). `roots` holds the
+        1-based index of the root each pixel converged to, and `counts` holds the number of iterations it took. Both
+        are 0 for pixels that didn't converge.
+    """
+    if max_count < 1:
+        raise ValueError('max_count must be at least 1')
+    if function is None:
+        function, derivative = _cube, _cube_derivative
+    elif derivative is None:
+        raise ValueError('derivative must be supplied with function')
+    render = functools.partial(_newton_band, tuple(roots), function, derivative, max_count, limit, scaler)
+    bands = list(imap_ordered(render, _bands(scaler, band_rows, workers), workers))
+    return np.concatenate([band[0] for band in bands]), np.concatenate([band[1] for band in bands])
+
+
+def zoom_frames(fractal, center, start_width, end_width, pixel_width, pixel_height, count, colormap=None, **kwargs):
+    """
+    Create a sequence of frames that zoom into a point of a fractal. The width of the visible area changes
+    geometrically from `start_width` to `end_width`, so the zoom appears to move at a constant speed.
+
+    The calculations use float64, so the zoom is limited to widths of about 1e-13 times the start width, beyond which
+    the image becomes pixelated.
+
+    Args:
+        fractal: function - `mandelbrot`, `julia`, `burning_ship`, or any function with the same signature.
+        center: complex - the point to zoom into.
+        start_width: number - the width of the visible area in the first frame.
+        end_width: number - the width of the visible area in the last frame.
+        pixel_width: int - the width of each frame in pixels.
+        pixel_height: int - the height of each frame in pixels.
+        count: int - the number of frames.
+        colormap: numpy array - optional colormap created by `make_npcolormap`. If supplied, each frame is an RGB image
+                    ready to be used with `MovieBuilder`. Otherwise each frame is a counts array.
+        **kwargs: other parameters passed to `fractal`, for example `c` or `max_count`.
+
+    Yields:
+        A frame or counts array for each step of the zoom.
+    """
+    if start_width <= 0 or end_width <= 0:
+        raise ValueError('start_width and end_width must be greater than 0')
+    center = complex(center)
+    for i in range(count):
+        width = start_width * (end_width / start_width) ** (i / (count - 1) if count > 1 else 0)
+        height = width * pixel_height / pixel_width
+        scaler = Scaler(pixel_width, pixel_height, width=width, startx=center.real - width/2,
+                        starty=center.imag - height/2)
+        counts = fractal(scaler, **kwargs)
+        if colormap is None:
+            yield counts
+        else:
+            frame = np.empty((pixel_height, pixel_width, colormap.shape[1]), dtype=np.uint8)
+            apply_npcolormap(frame, counts.astype(np.int64), colormap)
+            yield frame
@@ -0,0 +1,375 @@
+# Author:  Martin McBride
+# Created: 2026-10-16
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+"""
+The framestream module provides functions for combining and transforming frame sequences.
+
+A frame sequence (or stream) is any iterable of frames, such as the lazy iterators returned by `make_image_frames` or
+`make_nparray_frames`. Each function here accepts one or more streams and returns a new lazy iterator, so streams can
+be chained together and passed to `MovieBuilder.add_scene` or `save_frames`. Frames are only created as they are
+consumed, and a stream is never read into memory as a whole.
+
+For example, a scene that fades from one animation into another, then holds the final frame for a second:
+
+    frames = hold(crossfade(frames1, frames2, 15), after=30)
+
+Functions that create new frames (`crossfade`, `time_remap`, `resample` and `overlay`) accept a `buffers` parameter.
+If it is set, the output frames are written into a small ring of reused arrays rather than new arrays, in the same way
+as `make_image_frames`. A frame is then only valid until the ring wraps around, so a consumer that keeps frames must
+copy them. Frames that are passed through unchanged are the frames from the input stream.
+
+Blending between frames uses 8 bit fixed point weights, so results are exact and repeatable. Frames that are blended
+or overlaid must be uint8 arrays with the same shape.
+
+A `FrameSource` is a frame sequence that also supports random access, using `len(source)` and `source[frame_no]`.
+Frame sources are created by `make_image_frame_source`, `make_nparray_frame_source` and similar functions. Only the
+frames that are actually requested are rendered, so a preview, a thumbnail or part of a scene can be created without
+rendering the whole sequence. `create_videoclip` and `time_remap` use random access when it is available.
+"""
+
+import collections
+import itertools
+import math
+import numpy as np
+from generativepy.composite import composite
+from generativepy.parallel import imap_ordered
+
+
+class FrameSource:
+    """
+    A frame sequence that supports random access. Frames are rendered on demand by calling a render function with the
+    frame number, and the most recently used frames are kept, so asking for the same frame again doesn't render it
+    again.
+
+    A `FrameSource` can be used anywhere a lazy frame sequence can be used, for example with `MovieBuilder`. In
+    addition:
+
+    * `len(source)` gives the number of frames.
+    * `source[frame_no]` gives a single frame. Negative frame numbers count back from the end.
+    * `source[start:stop:step]` gives a new `FrameSource` containing part of the sequence. It renders frames using the
+      original source, so they share the recently used frames.
+
+    The frames that are kept are returned each time they are requested, so they shouldn't be modified.
+    """
+
+    def __init__(self, render, count, cache_size=8):
+        """
+        Args:
+            render: function - accepts a frame number from 0 to `count` - 1, and returns the frame.
+            count: int - the number of frames.
+            cache_size: int - the number of recently used frames that are kept.
+        """
+        if count < 0:
+            raise ValueError('count must not be negative')
+        self.render = render
+        self.count = count
+        self.cache_size = cache_size
+        self.frames = collections.OrderedDict()
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, frame_no):
+        if isinstance(frame_no, slice):
+            frame_numbers = range(self.count)[frame_no]
+            return FrameSource(lambda i: self[frame_numbers[i]], len(frame_numbers), 0)
+        frame_no = range(self.count)[frame_no]
+        frame = self.frames.get(frame_no)
+        if frame is not None:
+            self.frames.move_to_end(frame_no)
+            return frame
+        frame = self.render(frame_no)
+        if self.cache_size > 0:
+            self.frames[frame_no] = frame
+            if len(self.frames) > self.cache_size:
+                self.frames.popitem(last=False)
+        return frame
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+
+class _OutputRing:
+    # Supplies output arrays, either new arrays or a ring of reused arrays
+
+    def __init__(self, buffers):
+        self.arrays = [None]*buffers if buffers else None
+        self.index = 0
+
+    def next(self, shape):
+        if self.arrays is None:
+            return np.empty(shape, dtype=np.uint8)
+        array = self.arrays[self.index]
+        if array is None or array.shape != shape:
+            array = self.arrays[self.index] = np.empty(shape, dtype=np.uint8)
+        self.index = (self.index + 1) % len(self.arrays)
+        return array
+
+
+class _Cursor:
+    # Reads frames from a stream by index. Random access is used if the stream supports it, otherwise the stream is
+    # read in order. If keep_previous is true, a copy of the frame before the current frame is kept, so the index can
+    # go back by one frame. An index past the end gives the last frame.
+
+    def __init__(self, frames, keep_previous=False):
+        self.frames = frames
+        self.keep_previous = keep_previous
+        self.random_access = hasattr(frames, '__getitem__') and hasattr(frames, '__len__')
+        self.iterator = None if self.random_access else iter(frames)
+        self.index = -1
+        self.current = None
+        self.previous = None
+        self.spare = None
+        self.exhausted = False
+
+    def get(self, index):
+        if self.random_access:
+            if not len(self.frames):
+                raise ValueError('Frame stream is empty')
+            return self.frames[min(index, len(self.frames) - 1)]
+        if index == self.index - 1 and self.previous is not None:
+            return self.previous
+        if index < self.index:
+            raise ValueError('Frame stream can only be read in order, unless it supports random access')
+        while self.index < index and not self.exhausted:
+            keep = self.keep_previous and self.current is not None and self.index == index - 1
+            if keep:
+                # The stream might reuse the array of the current frame for the next frame, so copy it first
+                if self.spare is None or self.spare.shape != self.current.shape:
+                    self.spare = np.empty_like(self.current)
+                np.copyto(self.spare, self.current)
+            frame = next(self.iterator, None)
+            if frame is None:
+                self.exhausted = True
+                break
+            if keep:
+                self.previous, self.spare = self.spare, self.previous
+            else:
+                self.previous = None
+            self.current = frame
+            self.index += 1
+        if self.current is None:
+            raise ValueError('Frame stream is empty')
+        return self.current
+
+    def past_end(self, index):
+        if self.random_access:
+            return index >= len(self.frames)
+        self.get(index)
+        return self.exhausted and index > self.index
+
+
+def _check_frames(frame1, frame2):
+    if frame1.shape != frame2.shape or frame1.dtype != np.uint8 or frame2.dtype != np.uint8:
+        raise ValueError('Frames must be uint8 arrays with the same shape')
+
+
+def _mix(frame1, frame2, weight, out):
+    # Blend two frames, weight is the proportion of frame2 from 0 to 256
+    _check_frames(frame1, frame2)
+    mixed = frame1.astype(np.uint16)
+    mixed *= 256 - weight
+    mixed += frame2.astype(np.uint16)*np.uint16(weight)
+    mixed += 128
+    mixed >>= 8
+    out[...] = mixed
+    return out
+
+
+def concat(*streams):
+    """
+    Join several frame streams, one after the other.
+
+    Args:
+        *streams: iterables of frames - the streams to join.
+
+    Yields:
+        The frames of each stream in turn.
+    """
+    return itertools.chain.from_iterable(streams)
+
+
+def hold(frames, before=0, after=0):
+    """
+    Hold the first and last frames of a stream, for example to add a pause at the start or end of a scene.
+
+    Args:
+        frames: iterable of frames - the stream.
+        before: int - the number of times the first frame is repeated before the stream.
+        after: int - the number of times the last frame is repeated after the stream.
+
+    Yields:
+        The frames.
+    """
+    frame = None
+    for i, frame in enumerate(frames):
+        if i == 0:
+            for _ in range(before):
+                yield frame
+        yield frame
+    if frame is None:
+        raise ValueError('Frame stream is empty')
+    for _ in range(after):
+        yield frame
+
+
+def crossfade(frames1, frames2, count, length1=None, buffers=None):
+    """
+    Join two frame streams, fading from the end of the first stream to the start of the second. The last `count`
+    frames of `frames1` are blended with the first `count` frames of `frames2`, so the result is `count` frames shorter
+    than the two streams joined together.
+
+    To find the end of the first stream, its length must be known. It is taken from `length1`, or from `len(frames1)`
+    if the stream supports it. Otherwise the stream is read `count` frames ahead, and those frames are copied.
+
+    If `count` is 0 the streams are simply joined. If `frames2` has fewer than `count` frames, the transition ends
+    early and the rest of `frames1` is shown without fading, so no frames are lost.
+
+    Args:
+        frames1: iterable of frames - the first stream.
+        frames2: iterable of frames - the second stream.
+        count: int - the number of frames in the transition.
+        length1: int - the number of frames in the first stream, if known.
+        buffers: int - the number of output arrays in the ring, or None to create new arrays for blended frames.
+
+    Yields:
+        The frames.
+    """
+    if count < 0:
+        raise ValueError('count must not be negative')
+    if count == 0:
+        yield from concat(frames1, frames2)
+        return
+    if length1 is None and hasattr(frames1, '__len__'):
+        length1 = len(frames1)
+    ring = _OutputRing(buffers)
+    frames1 = iter(frames1)
+    frames2 = iter(frames2)
+
+    if length1 is not None:
+        yield from itertools.islice(frames1, max(length1 - count, 0))
+        tail = frames1
+    else:
+        # Keep copies of the most recent frames, as the stream might reuse its arrays
+        tail = []
+        for frame in frames1:
+            tail.append(np.array(frame))
+            if len(tail) > count:
+                yield tail.pop(0)
+        tail = iter(tail)
+
+    for i, frame1 in enumerate(tail):
+        frame2 = next(frames2, None)
+        if frame2 is None:
+            # The second stream ended during the transition, so the rest of the first stream is shown unchanged
+            yield frame1
+            yield from tail
+            return
+        weight = round(256*(i + 1)/(count + 1))
+        yield _mix(frame1, frame2, weight, ring.next(frame1.shape))
+    yield from frames2
+
+
+def time_remap(frames, mapping, count=None, blend=False, buffers=None):
+    """
+    Change the timing of a stream, for example to slow it down, speed it up, or ease in and out.
+
+    Output frame `i` shows the input frame at position `mapping(i)`. Positions can be fractional. They are rounded
+    down to a whole frame, or if `blend` is true, the two nearest frames are blended. Positions before the start of the
+    stream show the first frame. Positions after the end show the last frame, but if `count` is None the output ends
+    when the position passes the end of the stream.
+
+    If the stream supports random access (`len` and indexing, for example a list), positions can be in any order.
+    Otherwise the stream is read in order, so the positions must not decrease.
+
+    Args:
+        frames: iterable of frames - the input stream.
+        mapping: function or sequence - a function that accepts an output frame number and returns a position in the
+                    input stream, or a sequence of positions.
+        count: int - the number of output frames. Defaults to the length of `mapping` if it is a sequence.
+        blend: bool - if true, blend between frames at fractional positions.
+        buffers: int - the number of output arrays in the ring, or None to create new arrays for blended frames.
+
+    Yields:
+        The frames.
+    """
+    if count is None and not callable(mapping):
+        count = len(mapping)
+    cursor = _Cursor(frames, blend)
+    ring = _OutputRing(buffers)
+    for i in itertools.count() if count is None else range(count):
+        position = max(float(mapping(i) if callable(mapping) else mapping[i]), 0)
+        index = math.floor(position)
+        if count is None and cursor.past_end(index):
+            return
+        weight = round(256*(position - index)) if blend else 0
+        if weight and not cursor.past_end(index + 1):
+            # Read the later frame first, as the cursor keeps a copy of the frame before the current one
+            frame2 = cursor.get(index + 1)
+            frame1 = cursor.get(index)
+            yield _mix(frame1, frame2, weight, ring.next(frame1.shape))
+        else:
+            yield cursor.get(index)
+
+
+def resample(frames, source_rate, target_rate, count=None, blend=False, buffers=None):
+    """
+    Convert a stream to a different frame rate, by dropping or repeating frames, or if `blend` is true, by blending
+    neighbouring frames.
+
+    Args:
+        frames: iterable of frames - the input stream.
+        source_rate: number - the frame rate of the input stream.
+        target_rate: number - the required frame rate.
+        count: int - the number of output frames. If None, the output ends at the end of the input stream.
+        blend: bool - if true, blend between frames.
+        buffers: int - the number of output arrays in the ring, or None to create new arrays for blended frames.
+
+    Yields:
+        The frames.
+    """
+    if source_rate <= 0 or target_rate <= 0:
+        raise ValueError('source_rate and target_rate must be greater than 0')
+    return time_remap(frames, lambda i: i*source_rate/target_rate, count, blend, buffers)
+
+
+def overlay(frames1, frames2, mode='over', buffers=None, **kwargs):
+    """
+    Composite one stream on top of another, frame by frame, using the `composite` module. The output ends when either
+    stream ends.
+
+    Args:
+        frames1: iterable of frames - the lower stream.
+        frames2: iterable of frames - the upper stream.
+        mode: str - the composite mode, see `composite`.
+        buffers: int - the number of output arrays in the ring, or None to create new arrays.
+        **kwargs: other parameters passed to `composite`, for example `key` or `threads`.
+
+    Yields:
+        The frames.
+    """
+    ring = _OutputRing(buffers)
+    for frame1, frame2 in zip(frames1, frames2):
+        yield composite([frame1, frame2], mode, out=ring.next(frame1.shape), **kwargs)
+
+
+def map_frames(function, frames, workers=None):
+    """
+    Apply a function to every frame of a stream, for example a colour effect or a blur.
+
+    If `workers` is set, the frames are processed by a pool of worker processes (see the `parallel` module). The
+    frames are copied before they are sent to the workers, so the input stream can reuse its arrays.
+
+    Args:
+        function: function - accepts a frame and returns a new frame.
+        frames: iterable of frames - the input stream.
+        workers: int - the number of worker processes, or None to process every frame in the current process.
+
+    Yields:
+        The frames.
+    """
+    if workers and workers > 1:
+        frames = (np.array(frame) for frame in frames)
+    return imap_ordered(function, frames, workers)
@@ -13,12 +13,16 @@ into complete movies.
 import numpy as np
 from PIL import Image
 from generativepy.utils import temp_file
+from generativepy.png import PngSequenceWriter
+from generativepy.parallel import imap_ordered
 from moviepy.audio.io.AudioFileClip import AudioFileClip
 from moviepy.video.VideoClip import VideoClip
 from moviepy.video.compositing.CompositeVideoClip import concatenate_videoclips
 import subprocess as sp
+import os
 import pathlib
 import logging
+import tempfile
 import time
 
 
@@ -70,25 +74,39 @@ def save_frame(outfile, frame):
     image = Image.fromarray(normalise_array(frame))
     image.save(outfile + '.png')
 
-def save_frames(outfile, frames):
+def save_frames(outfile, frames, encoders=None, compress_level=None, copy=None):
     """
     Save a sequence of frame as a sequence of png images
 
+    If `encoders` is set, the images are compressed and saved by background threads while the next frames are being
+    created (see `PngSequenceWriter`). By default each frame is then copied before it is queued, because many frame
+    sources (for example `make_nparray_frames` with `buffers`) reuse their arrays for later frames. If the frames are
+    never reused, set `copy` to False to avoid the copy.
+
     Args:
         outfile: str - base name and path of the file (.png extension optional).
         frames: numpy arrays - the sequence of frames.
+        encoders: int - number of encoder threads, or None to save each frame before the next one is created.
+        compress_level: int - zlib compression level, 0 (no compression) to 9 (best compression), or None for the
+                    default level.
+        copy: bool - whether to copy each frame before it is queued. If None, frames are copied if `encoders` is set.
     """
-
-    if outfile.lower().endswith('.png'):
-        outfile = outfile[:-4]
-    for i, frame in enumerate(frames):
-        image = Image.fromarray(normalise_array(frame))
-        image.save(outfile + str(i).zfill(8) + '.png')
+    if copy is None:
+        copy = bool(encoders)
+    with PngSequenceWriter(outfile, encoders, compress_level=compress_level, copy=copy) as writer:
+        for frame in frames:
+            writer.write(normalise_array(frame))
 
 
 def create_videoclip(frames, duration, frame_rate, audio_in=None):
     """
     Create a VideoClip object from a sequence of frames and an optional audio file.
+
+    If `frames` supports random access (`len` and indexing, for example a `FrameSource` or a list), each frame is
+    fetched when MoviePy asks for it, so MoviePy can seek to any time, for example to create a preview or a subclip.
+    Otherwise the frames are read in order, skipping any frames MoviePy doesn't use, and seeking backwards raises a
+    `ValueError`. In either case, if the frames run out, the last frame is repeated.
+
     Args:
         frames: numpy arrays - the sequence of frames.
         duration: number - duration of clip in seconds.
@@ -99,19 +117,35 @@ def create_videoclip(frames, duration, frame_rate, audio_in=None):
         A `VideoClip` object.
     """
 
-    def make_frame(t):
-        nonlocal current_frame
-        nonlocal current_frame_index
-        required_frame_index = int(t*frame_rate)
-        if required_frame_index > current_frame_index:
-            current_frame = next(frames)
-            current_frame_index += 1
-        rgb_frame = np.empty((current_frame.shape[0], current_frame.shape[1], 3), dtype=np.uint8)
-        rgb_frame[:, :] = current_frame[:, :, 0:3]
+    def to_rgb(frame):
+        rgb_frame = np.empty((frame.shape[0], frame.shape[1], 3), dtype=np.uint8)
+        rgb_frame[:, :] = frame[:, :, 0:3]
         return rgb_frame
 
-    current_frame = next(frames)
-    current_frame_index = 0
+    if hasattr(frames, '__getitem__') and hasattr(frames, '__len__'):
+        if not len(frames):
+            raise ValueError('frames must not be empty')
+
+        def make_frame(t):
+            return to_rgb(frames[min(max(int(t*frame_rate), 0), len(frames) - 1)])
+    else:
+        frames = iter(frames)
+
+        def make_frame(t):
+            nonlocal current_frame
+            nonlocal current_frame_index
+            required_frame_index = int(t*frame_rate)
+            if required_frame_index < current_frame_index:
+                raise ValueError('Cannot seek backwards in a sequential frame source. Use a FrameSource, for example '
+                                 'from make_image_frame_source, to allow random access.')
+            while current_frame_index < required_frame_index:
+                current_frame = next(frames, current_frame)
+                current_frame_index += 1
+            return to_rgb(current_frame)
+
+        current_frame = next(frames)
+        current_frame_index = 0
+
     video_clip = VideoClip(make_frame, duration=duration)
     if audio_in:
         print("Adding audio clip", audio_in)
@@ -120,17 +154,168 @@ def create_videoclip(frames, duration, frame_rate, audio_in=None):
     return video_clip
 
 
+def _match_channels(frame, channels):
+    """
+    Convert a frame to uint8 data with the required number of channels. The original frame is returned if it is
+    already in the correct form.
+    """
+    if frame.ndim == 2:
+        frame = frame[:, :, np.newaxis]
+    if frame.shape[2] != channels:
+        if channels == 1:
+            frame = frame[:, :, :1]
+        elif frame.shape[2] == 1:
+            frame = np.repeat(frame, channels, axis=2)
+            if channels == 4:
+                frame[:, :, 3] = 255
+        elif channels == 3:
+            frame = frame[:, :, :3]
+        else:
+            alpha = np.full(frame.shape[:2] + (1,), 255, dtype=frame.dtype)
+            frame = np.concatenate((frame, alpha), axis=2)
+    return np.ascontiguousarray(frame, dtype=np.uint8)
+
+
+class FFmpegWriter:
+    """
+    Encodes a video file by streaming raw frames directly into an `ffmpeg` process.
+
+    The frame data is written to the standard input of a single `ffmpeg` process, which encodes the video and muxes in
+    the audio (if any) in the same pass. No temporary files are created. Frames that are already contiguous uint8
+    arrays are written without being copied.
+
+    The size and number of channels of the video are taken from the first frame written. Later frames must be the same
+    size. If they have a different number of channels they are converted.
+
+    `FFmpegWriter` can be used as a context manager, in which case it is closed automatically.
+    """
+
+    def __init__(self, video_out, frame_rate, audio=None, codec="libx264", audio_codec="aac", ffmpeg="ffmpeg"):
+        """
+        Args:
+            video_out: str - Filename of output file.
+            frame_rate: number - frame rate, frames per second.
+            audio: list of tuples - a list of (audio_file, duration) tuples, or None for no audio. Each audio file is
+                        trimmed or padded with silence to the duration (in seconds), and the results are joined.
+            codec: str - the ffmpeg video codec.
+            audio_codec: str - the ffmpeg audio codec.
+            ffmpeg: str - the ffmpeg executable.
+        """
+        self.video_out = video_out
+        self.frame_rate = frame_rate
+        self.audio = audio
+        self.codec = codec
+        self.audio_codec = audio_codec
+        self.ffmpeg = ffmpeg
+        self.process = None
+        self.shape = None
+        self.frame_count = 0
+        self.start_time = None
+        self.elapsed = 0
+
+    def write(self, frame):
+        """
+        Write the next frame of the video.
+
+        Args:
+            frame: numpy array - the frame, with shape (height, width) or (height, width, channels).
+        """
+        if self.process is None:
+            self._start(frame)
+        frame = _match_channels(frame, self.shape[2])
+        if frame.shape != self.shape:
+            raise ValueError('All frames must be the same size')
+        try:
+            self.process.stdin.write(frame.data)
+        except BrokenPipeError as e:
+            raise RuntimeError('ffmpeg stopped unexpectedly while writing ' + self.video_out) from e
+        self.frame_count += 1
+
+    def close(self):
+        """
+        Finish writing the video, and wait for ffmpeg to complete.
+        """
+        if self.process is None:
+            return
+        process = self.process
+        self.process = None
+        process.stdin.close()
+        returncode = process.wait()
+        self.elapsed = time.time() - self.start_time
+        if returncode:
+            raise RuntimeError('ffmpeg failed with return code {} while writing {}'.format(returncode, self.video_out))
+
+    @property
+    def frames_per_second(self):
+        """
+        Read-only property gives the average number of frames encoded per second, including the time taken to create
+        the frames.
+        """
+        return self.frame_count / self.elapsed if self.elapsed else 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        elif self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+
+    def _start(self, frame):
+        channels = 1 if frame.ndim == 2 else frame.shape[2]
+        if channels not in (1, 3, 4):
+            raise ValueError('Frames must have 1, 3 or 4 channels')
+        self.shape = (frame.shape[0], frame.shape[1], channels)
+        pixel_format = {1: "gray", 3: "rgb24", 4: "rgba"}[channels]
+        height, width = frame.shape[:2]
+
+        command = [self.ffmpeg,
+                   "-y", #approve output file overwite
+                   "-loglevel", "error",
+                   "-f", "rawvideo",
+                   "-pix_fmt", pixel_format,
+                   "-s", "{}x{}".format(width, height),
+                   "-framerate", str(self.frame_rate),
+                   "-i", "-"]
+        for audio_file, _ in self.audio or []:
+            command.extend(["-i", audio_file])
+        command.extend(self._output_options(width, height))
+        command.append(self.video_out)
+
+        self.start_time = time.time()
+        self.process = sp.Popen(command, stdin=sp.PIPE)
+
+    def _output_options(self, width, height):
+        options = ["-map", "0:v", "-c:v", self.codec]
+        if self.codec == "libx264" and width % 2 == 0 and height % 2 == 0:
+            options.extend(["-pix_fmt", "yuv420p"])
+        if self.audio:
+            # Pad or trim each audio input to the scene duration, then join them
+            filters = ["[{}:a]apad,atrim=duration={}[a{}]".format(i + 1, duration, i)
+                       for i, (_, duration) in enumerate(self.audio)]
+            inputs = "".join("[a{}]".format(i) for i in range(len(self.audio)))
+            filters.append("{}concat=n={}:v=0:a=1[audio]".format(inputs, len(self.audio)))
+            options.extend(["-filter_complex", ";".join(filters), "-map", "[audio]", "-c:a", self.audio_codec])
+        options.extend(["-r", str(self.frame_rate)])
+        return options
+
+
 class MovieBuilder():
     """
     Builds up a movie from a set of clips.
     """
 
-    def __init__(self, frame_rate):
+    def __init__(self, frame_rate, ffmpeg="ffmpeg"):
         """
         Args:
             frame_rate: number - frame rate, frames per second.
+            ffmpeg: str - the ffmpeg executable used to encode and join videos.
         """
         self.frame_rate = frame_rate
+        self.ffmpeg = ffmpeg
         self.frame_sources = []
         self.audio_files = []
         self.duration = []
@@ -157,14 +342,47 @@ class MovieBuilder():
         self.duration.append(frame_source_duration[1])
         self.audio_files.append(audio_file)
 
-    def make_movie(self, video_out, source=None):
+    def make_movie(self, video_out, source=None, backend="moviepy", workers=None, segment_dir=None,
+                   reuse_segments=False):
         """
         Make a movie of either all the clips that have been added, or just a single clip if source is not None.
 
+        There are two backends available:
+
+        * "moviepy" builds the movie using MoviePy, and then uses ffmpeg to combine the video and audio.
+        * "ffmpeg" streams the frames directly into a single ffmpeg process, which encodes the video and audio in one
+        pass without creating any temporary files. Each scene provides `int(duration*frame_rate)` frames. If a frame
+        source runs out early, its last frame is repeated.
+
+        If `workers` or `segment_dir` is set, the movie is built in segment mode, which always uses the ffmpeg encoder.
+        Each scene is encoded into its own segment file, using a pool of `workers` processes, with identical encoding
+        parameters. The segments are then joined using ffmpeg's concat demuxer, without encoding them again. Frame
+        sources are usually generators, which can't be sent to worker processes, so the workers are forked where
+        possible (see the `parallel` module).
+
+        If `segment_dir` is given, the segments are kept in that folder, and if `reuse_segments` is true, any scene
+        that already has a segment there isn't encoded again. Calling `make_movie` with `source` set in segment mode
+        always encodes that scene, replacing its segment. So after changing a single scene, it can be previewed using
+        `source`, and then the full movie can be rebuilt using `reuse_segments`, which only joins the segments.
+
         Args:
             video_out: str - Filename of output file.
             source: int - set to index of a clip to use just that clip, or None to join all clips.
+            backend: str - "moviepy" or "ffmpeg".
+            workers: int - number of worker processes used to encode scenes in segment mode.
+            segment_dir: str - folder used to store the scene segments in segment mode. If None, a temporary folder is
+                        used.
+            reuse_segments: bool - if true, reuse existing segments in `segment_dir` rather than encoding them again.
         """
+        if backend not in ("moviepy", "ffmpeg"):
+            raise ValueError('backend must be "moviepy" or "ffmpeg"')
+        if workers or segment_dir is not None:
+            self._make_movie_segments(video_out, source, workers, segment_dir, reuse_segments)
+            return
+        if backend == "ffmpeg":
+            self._make_movie_ffmpeg(video_out, source)
+            return
+
         if source is not None:
             video = create_videoclip(self.frame_sources[source], self.duration[source], self.frame_rate, self.audio_files[source])
         else:
@@ -185,7 +403,7 @@ class MovieBuilder():
             video.write_videofile(temp_video_filename, temp_audiofile=temp_audio_filename, codec="libx264",
                                   remove_temp=False, audio_codec="aac", fps=self.frame_rate)
 
-            command = ["ffmpeg",
+            command = [self.ffmpeg,
                        "-y", #approve output file overwite
                        "-i", temp_video_filename,
                        "-i", temp_audio_filename,
@@ -195,3 +413,77 @@ class MovieBuilder():
                        "-r", str(self.frame_rate),
                        video_out ]
             process = sp.run(command)
+
+    def _make_movie_ffmpeg(self, video_out, source):
+        scenes = self._get_scenes(source)
+        audio = self._get_audio(scenes)
+        with FFmpegWriter(video_out, self.frame_rate, audio, ffmpeg=self.ffmpeg) as writer:
+            for i in scenes:
+                _write_scene(writer, self.frame_sources[i], int(self.duration[i]*self.frame_rate))
+        _print_throughput(writer.frame_count, writer.elapsed)
+
+    def _make_movie_segments(self, video_out, source, workers, segment_dir, reuse_segments):
+        scenes = self._get_scenes(source)
+        audio = self._get_audio(scenes)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            if segment_dir is None:
+                segment_dir = temp_dir
+            os.makedirs(segment_dir, exist_ok=True)
+            segments = [os.path.abspath(os.path.join(segment_dir, "scene{}.mp4".format(str(i).zfill(4)))) for i in scenes]
+
+            required = [(i, segment, audio[n] if audio else None) for n, (i, segment) in enumerate(zip(scenes, segments))
+                        if source is not None or not reuse_segments or not os.path.exists(segment)]
+            if required:
+                start_time = time.time()
+                frame_count = sum(imap_ordered(self._encode_segment, required, workers, buffer_size=len(required)))
+                _print_throughput(frame_count, time.time() - start_time)
+
+            list_file = os.path.join(temp_dir, "segments.txt")
+            with open(list_file, "w") as f:
+                for segment in segments:
+                    f.write("file '{}'\n".format(segment.replace("'", "'\\''")))
+            command = [self.ffmpeg,
+                       "-y", #approve output file overwite
+                       "-loglevel", "error",
+                       "-f", "concat",
+                       "-safe", "0",
+                       "-i", list_file,
+                       "-c", "copy",
+                       video_out]
+            if sp.run(command).returncode:
+                raise RuntimeError('ffmpeg failed to join the scene segments into ' + video_out)
+
+    def _encode_segment(self, item):
+        i, segment, audio = item
+        with FFmpegWriter(segment, self.frame_rate, [audio] if audio else None, ffmpeg=self.ffmpeg) as writer:
+            _write_scene(writer, self.frame_sources[i], int(self.duration[i]*self.frame_rate))
+        return writer.frame_count
+
+    def _get_scenes(self, source):
+        return [source] if source is not None else list(range(len(self.frame_sources)))
+
+    def _get_audio(self, scenes):
+        audio_files = [self.audio_files[i] for i in scenes]
+        if all(audio_files):
+            return [(self.audio_files[i], self.duration[i]) for i in scenes]
+        if any(audio_files):
+            logging.warning("MovieBuilder - some of the scenes have audio data, some do not, so the final video will have no audio data")
+        return None
+
+
+def _print_throughput(frame_count, elapsed):
+    print("Encoded {} frames in {:.1f} seconds ({:.1f} frames per second)".format(frame_count, elapsed,
+                                                                                 frame_count/elapsed if elapsed else 0))
+
+
+def _write_scene(writer, frames, count):
+    """
+    Write exactly `count` frames from a frame source, repeating the last frame if the source runs out early.
+    """
+    frame = None
+    frames = iter(frames)
+    for _ in range(count):
+        frame = next(frames, frame)
+        if frame is None:
+            raise ValueError('Frame source for scene is empty')
+        writer.write(frame)
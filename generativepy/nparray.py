@@ -3,33 +3,57 @@
 # Copyright (C) 2020, Martin McBride
 # License: MIT
 
+import concurrent.futures
+import contextlib
+import functools
+import json
+import os
+import struct
 import numpy as np
 from generativepy.movie import save_frame, save_frames
-from generativepy.color import make_colormap
+from generativepy.color import make_colormap_array
+from generativepy.composite import composite
+from generativepy.draft import get_draft
+from generativepy.framestream import FrameSource
 
-def make_nparray_frame(paint, pixel_width, pixel_height, channels=3, out=None):
+def make_nparray_frame(paint, pixel_width, pixel_height, channels=3, out=None, dtype=np.uint, draft=None):
     """
     Create a frame using numpy
 
+    The paint function draws into an array of type `dtype`, which is filled with 255 (white) before it is called. With
+    the default type, np.uint, the paint function can set or add values that go outside the range 0 to 255. The values
+    are clipped (in place, and only if some are out of range) and converted to a uint8 frame. If the paint function
+    always keeps its values in range, `dtype=np.uint8` is faster, because the painted array is returned as it is. Values
+    that go out of range then wrap around or raise an error, as for any uint8 NumPy array.
+
+    In draft mode (see the `draft` module) the paint function is called with a reduced image size, unless `out` is
+    supplied.
+
     Args:
         paint: function - the paint function.
         pixel_width: int - width in pixels.
         pixel_height: int - height in pixels.
         channels: int - 1 for greyscale, 3 for rgb, 4 for rgba.
         out: numpy array - optional array to hold result. Must be correct width, height and channels, but can be any int type.
+                    It isn't filled before the paint function is called. If it is uint8 it is returned as the frame,
+                    otherwise it may be clipped in place.
+        dtype: numpy data type - the type of the array passed to the paint function, if `out` isn't supplied.
+        draft: bool, number or Draft - draft mode setting for this call, see `draft.get_draft`.
 
     Returns:
         A numpy array frame buffer
     """
+    draft = get_draft(draft) if out is None else None
+    if draft is not None:
+        return _render_draft_nparray_frame(paint, pixel_width, pixel_height, channels, 1, dtype, draft, 0)
     if out is not None:
         if out.shape != (pixel_height, pixel_width, channels):
             raise ValueError('out array shape not compatible with image dimensions')
         array = out
     else:
-        array = np.full((pixel_height, pixel_width, channels), 255, dtype=np.uint)
+        array = np.full((pixel_height, pixel_width, channels), 255, dtype=dtype)
     paint(array, pixel_width, pixel_height, 0, 1)
-    array = np.clip(array, 0, 255).astype(np.uint8)
-    return array
+    return _to_frame(array)
 
 def make_nparray_data(paint, pixel_width, pixel_height, channels=3, dtype=np.uint):
     """
@@ -55,31 +79,176 @@ def make_nparray_data(paint, pixel_width, pixel_height, channels=3, dtype=np.uin
     paint(array, pixel_width, pixel_height, 0, 1)
     return array
 
-def make_nparray_frames(paint, pixel_width, pixel_height, count, channels=3):
+def make_nparray_data_grid(paint, scaler, channels=1, dtype=np.uint, complex_plane=True):
+    """
+    Create a data array using numpy, passing the user space coordinates of every pixel to the paint function.
+
+    This is similar to `make_nparray_data`, but is designed for paint functions that calculate every pixel using
+    array operations (for example escape time fractals). The paint function has the signature:
+
+        paint(array, grid, frame_no, frame_count)
+
+    where `array` is the data array, with shape (pixel_height, pixel_width, channels), and `grid` holds the user space
+    coordinates of each pixel, as returned by `scaler.device_to_user_grid(complex_plane)`. That is, either a complex
+    array with shape (pixel_height, pixel_width), or a tuple of x and y arrays.
+
+    Args:
+        paint: function - the paint function.
+        scaler: Scaler - a `generativepy.bitmap.Scaler` that defines the image size and the user space.
+        channels: int - number of channels.
+        dtype: numpy data type - the type of the array.
+        complex_plane: bool - if true the grid is a complex array, otherwise it is a tuple of x and y arrays.
+
+    Returns:
+        A numpy array
+    """
+    array = np.full((scaler.pixel_height, scaler.pixel_width, channels), 0, dtype=dtype)
+    paint(array, scaler.device_to_user_grid(complex_plane), 0, 1)
+    return array
+
+def make_nparray_frames(paint, pixel_width, pixel_height, count, channels=3, cache=None, dtype=np.uint, buffers=None,
+                        out=None, draft=None):
     """
     Create a frame sequence using numpy.
 
     This function returns a lazy iterator that can be used to access the sequence. Images will be
     created as they are requested.
 
+    The paint function draws into an array of type `dtype`, filled with 255, see `make_nparray_frame`.
+
+    If `buffers` or `out` is set, each frame is written into one of a small ring of uint8 output arrays, rather than
+    allocating new arrays for every frame. If `dtype` isn't uint8, a single array of that type is also reused for
+    painting. In that case a frame is only valid until the ring wraps around, so a consumer that keeps frames must copy
+    them.
+
+    If `cache` is set, frames that have already been painted by the same paint function, with the same settings, are
+    loaded from the cache rather than being painted again (see the `cache` module).
+
+    In draft mode (see the `draft` module) the paint function is called with a reduced image size, and `cache`,
+    `buffers` and `out` are not used.
+
     Args:
         paint: function - the paint function.
         pixel_width: int - width in pixels.
         pixel_height: int - height in pixels.
         count: int - number of frames ot create.
         channels: int - 1 for greyscale, 3 for rgb, 4 for rgba.
+        cache: RenderCache - optional cache of previously painted frames.
+        dtype: numpy data type - the type of the array passed to the paint function.
+        buffers: int - the number of output arrays in the ring, if `out` isn't supplied.
+        out: numpy array or list of numpy arrays - optional uint8 arrays of shape (pixel_height, pixel_width, channels)
+                    to hold the frames. They are used in rotation.
+        draft: bool, number or Draft - draft mode setting for this call, see `draft.get_draft`.
 
     Yields:
         Lazy iterator of frames.
     """
+    draft = get_draft(draft)
+    if draft is not None:
+        render = functools.partial(_render_draft_nparray_frame, paint, pixel_width, pixel_height, channels, count,
+                                   dtype, draft)
+        yield from draft.expand(map(render, draft.frame_numbers(count)), count)
+        return
+
+    params = ('nparray', pixel_width, pixel_height, channels, count, np.dtype(dtype).str)
+    if buffers or out is not None:
+        yield from _make_pooled_nparray_frames(paint, pixel_width, pixel_height, count, channels, cache, dtype, buffers,
+                                               out, params)
+        return
+
+    render = functools.partial(_render_nparray_frame, paint, pixel_width, pixel_height, channels, count, dtype)
+    if cache is not None:
+        render = cache.wrap(render, paint, params)
+    for i in range(count):
+        yield render(i)
+
+
+def make_nparray_frame_source(paint, pixel_width, pixel_height, count, channels=3, cache=None, dtype=np.uint,
+                              cache_size=8, draft=None):
+    """
+    Create a random access sequence of frames. This is similar to `make_nparray_frames`, except that it returns a
+    `FrameSource`, so frames can be requested in any order, and only the frames that are requested are painted.
+
+    Args:
+        paint: function - the paint function.
+        pixel_width: int - width in pixels.
+        pixel_height: int - height in pixels.
+        count: int - number of frames.
+        channels: int - 1 for greyscale, 3 for rgb, 4 for rgba.
+        cache: RenderCache - optional cache of previously painted frames.
+        dtype: numpy data type - the type of the array passed to the paint function.
+        cache_size: int - the number of recently used frames kept in memory.
+        draft: bool, number or Draft - draft mode setting for this call, see `draft.get_draft`.
+
+    Returns:
+        A `FrameSource`.
+    """
+    draft = get_draft(draft)
+    if draft is not None:
+        render = functools.partial(_render_draft_nparray_frame, paint, pixel_width, pixel_height, channels, count,
+                                   dtype, draft)
+        return draft.frame_source(render, count, cache_size)
+    render = functools.partial(_render_nparray_frame, paint, pixel_width, pixel_height, channels, count, dtype)
+    if cache is not None:
+        render = cache.wrap(render, paint, ('nparray', pixel_width, pixel_height, channels, count,
+                                            np.dtype(dtype).str))
+    return FrameSource(render, count, cache_size)
+
+
+def _render_nparray_frame(paint, pixel_width, pixel_height, channels, count, dtype, frame_no):
+    array = np.full((pixel_height, pixel_width, channels), 255, dtype=dtype)
+    paint(array, pixel_width, pixel_height, frame_no, count)
+    return _to_frame(array)
+
+
+def _render_draft_nparray_frame(paint, pixel_width, pixel_height, channels, count, dtype, draft, frame_no):
+    frame = _render_nparray_frame(paint, *draft.size(pixel_width, pixel_height), channels, count, dtype, frame_no)
+    return draft.output(frame, pixel_width, pixel_height)
+
+
+def _make_pooled_nparray_frames(paint, pixel_width, pixel_height, count, channels, cache, dtype, buffers, out, params):
+    shape = (pixel_height, pixel_width, channels)
+    if out is None:
+        out = [np.empty(shape, dtype=np.uint8) for _ in range(buffers)]
+    elif isinstance(out, np.ndarray):
+        out = [out]
+    for array in out:
+        if array.shape != shape or array.dtype != np.uint8:
+            raise ValueError('out arrays must be uint8 with shape (pixel_height, pixel_width, channels)')
+
+    # Frames are painted directly into the ring if they are uint8, otherwise into a single working array
+    work = None if np.dtype(dtype) == np.uint8 else np.empty(shape, dtype=dtype)
+    cached = cache.wrap(None, paint, params) if cache is not None else None
     for i in range(count):
-        array = np.full((pixel_height, pixel_width, channels), 255, dtype=np.uint)
+        frame = out[i % len(out)]
+        if cached is not None:
+            cached_frame = cached.load(i)
+            if cached_frame is not None:
+                np.copyto(frame, cached_frame)
+                yield frame
+                continue
+        array = frame if work is None else work
+        array.fill(255)
         paint(array, pixel_width, pixel_height, i, count)
-        array = np.clip(array, 0, 255).astype(np.uint8)
-        yield array
+        _to_frame(array, frame)
+        if cached is not None:
+            cached.store(i, frame)
+        yield frame
+
 
+def _to_frame(array, out=None):
+    # Convert a painted array to a uint8 frame, clipping in place only if some values are out of range. A uint8 array
+    # is returned as it is, unless out is supplied.
+    if array.dtype != np.uint8 and array.size and (array.min() < 0 or array.max() > 255):
+        np.clip(array, 0, 255, out=array)
+    if out is None:
+        return array if array.dtype == np.uint8 else array.astype(np.uint8)
+    if out is not array:
+        np.copyto(out, array, casting='unsafe')
+    return out
 
-def make_nparray(outfile, paint, pixel_width, pixel_height, channels=3):
+
+def make_nparray(outfile, paint, pixel_width, pixel_height, channels=3, dtype=np.uint):
     """
     Create a PNG file using numpy.
 
@@ -89,11 +258,13 @@ def make_nparray(outfile, paint, pixel_width, pixel_height, channels=3):
         pixel_width: int - width in pixels.
         pixel_height: int - height in pixels.
         channels: int - 1 for greyscale, 3 for rgb, 4 for rgba.
+        dtype: numpy data type - the type of the array passed to the paint function, see `make_nparray_frame`.
     """
-    frame = make_nparray_frame(paint, pixel_width, pixel_height, channels)
+    frame = make_nparray_frame(paint, pixel_width, pixel_height, channels, dtype=dtype)
     save_frame(outfile, frame)
 
-def make_nparrays(outfile, paint, pixel_width, pixel_height, count, channels=3):
+def make_nparrays(outfile, paint, pixel_width, pixel_height, count, channels=3, encoders=None, compress_level=None,
+                  dtype=np.uint):
     """
     Create a set of PNG files using numpy.
 
@@ -104,15 +275,20 @@ def make_nparrays(outfile, paint, pixel_width, pixel_height, count, channels=3):
         pixel_height: int - height in pixels.
         count: int - number of frames to create.
         channels: int - 1 for greyscale, 3 for rgb, 4 for rgba.
+        encoders: int - number of background threads used to save the files, see `PngSequenceWriter`.
+        compress_level: int - zlib compression level, 0 (no compression) to 9 (best compression), or None for the
+                    default level.
+        dtype: numpy data type - the type of the array passed to the paint function, see `make_nparray_frame`.
     """
-    frames = make_nparray_frames(paint, pixel_width, pixel_height, count, channels)
-    save_frames(outfile, frames)
+    frames = make_nparray_frames(paint, pixel_width, pixel_height, count, channels, dtype=dtype)
+    save_frames(outfile, frames, encoders, compress_level)
 
 def overlay_nparrays(array1, array2):
     """
     Overlay array2 on top of array1. Any pixels in array2 that are fully white are treated as transparent.
 
-    Both frames nust be same size, and both must be 4 channel RGBA data.
+    Both frames nust be same size, and both must be 4 channel RGBA data. See the `composite` module for other ways to
+    combine frames.
 
     Args:
         array1: numpy frame - first (lower) frame.
@@ -128,34 +304,37 @@ def overlay_nparrays(array1, array2):
             or array2.shape[2] != 4):
         raise ValueError("array1 and array2 must be same shape and must contain 4 channel (RGBA) data.")
 
-    # Create a mask. The mask has value 255 if the corresponding array2 pixel is pure white.
-    m0 = array2[:, :, 0]
-    m1 = array2[:, :, 1]
-    m2 = array2[:, :, 2]
-    mask = m0 & m1 & m2 # Bitwise AND of RGB values is 255 only if all 3 values are 255.
-
-    # Extend the mask to be width by height by 4 to match image data
-    mask = np.repeat(mask[:, :, np.newaxis], 4, axis=2)
-
-    # Array full of 255 for comparison
-    white = np.full_like(mask, 255)
+    return composite([array1, array2], 'key')
 
-    # Create a merged image, using the array1 pixel if the mask is white, else array2
-    image = np.where(mask==white, array1, array2)
-    return image
-
-def save_nparray(outfile, array):
+def save_nparray(outfile, array, metadata=None, compressed=False):
     """
     Save a general array to file in mumpy format. The saved file is not an image file.
 
     The file created can be read back in using `load_nparray`.
 
+    Metadata, for example the `Scaler` extents and iteration count used to create the data, can be stored with the
+    array and read back using `load_nparray_metadata`. This allows the data to be recoloured later without having to
+    remember how it was made. For an uncompressed file, the metadata is stored in a JSON file alongside the data file,
+    with '.json' added to the name. For a compressed file it is stored inside the file.
+
     Args:
         outfile: str - numpy file path including extension.
         array: numpy array - data to be saved.
+        metadata: dict - optional metadata. It must be JSON serialisable, although NumPy numbers and arrays are
+                    converted automatically.
+        compressed: bool - if true, save the data in compressed npz format. This is often much smaller for count
+                    data, but the file can't be memory mapped by `load_nparray`.
     """
-    with open(outfile, 'wb') as f:
-        np.save(f, array)
+    if compressed:
+        arrays = {'array': array}
+        if metadata is not None:
+            arrays['metadata'] = np.array(_metadata_to_json(metadata))
+        with open(outfile, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+    else:
+        with open(outfile, 'wb') as f:
+            np.save(f, array)
+        _save_metadata_file(outfile, metadata)
 
 def save_nparray_image(outfile, array):
     """
@@ -168,51 +347,249 @@ def save_nparray_image(outfile, array):
     array = np.clip(array, 0, 255).astype(np.uint8)
     save_frame(outfile, array)
 
-def load_nparray(infile):
+def load_nparray(infile, mmap_mode=None):
     """
     Load a numpy array from file
 
+    If `mmap_mode` is set, the array is memory mapped rather than being read into memory. Only the parts of the array
+    that are used are read from disk, so very large arrays can be processed, for example one frame of a stack created
+    by `NparrayStack`, or a band of rows at a time with `apply_scaled_npcolormap`.
+
     Args:
         infile: str - file path including extension.
+        mmap_mode: str - None to read the whole array into memory, or a memory map mode - 'r' (read only), 'r+' (read
+                    and write, changes are saved to the file), or 'c' (copy on write, changes are not saved). A
+                    compressed file can't be memory mapped.
 
     Returns:
         A numpy array. No checking is done on the array.
     """
+    if _is_npz(infile):
+        if mmap_mode:
+            raise ValueError('compressed files cannot be memory mapped')
+        with np.load(infile) as data:
+            return data['array']
+    if mmap_mode:
+        return np.load(infile, mmap_mode=mmap_mode)
     with open(infile, 'rb') as f:
         return np.load(f)
 
-def make_npcolormap(length, colors, bands=None, channels=3):
+def load_nparray_metadata(infile):
+    """
+    Load the metadata that was saved with an array by `save_nparray` or `NparrayStack`.
+
+    Args:
+        infile: str - file path including extension.
+
+    Returns:
+        The metadata dictionary, or None if the file has no metadata.
+    """
+    if _is_npz(infile):
+        with np.load(infile) as data:
+            return json.loads(str(data['metadata'])) if 'metadata' in data.files else None
+    try:
+        with open(infile + '.json') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+class NparrayStack:
+    """
+    Stores a sequence of equally sized arrays, for example animation frames or the count arrays of a fractal zoom, as a
+    single growing file in numpy format.
+
+    Each call to `append` adds an array to the end of the file. The header is updated every time, so the file is always
+    a valid numpy file containing all the arrays appended so far, with shape (count, ...). It can be read using
+    `load_nparray`, and memory mapping it gives fast access to individual arrays without reading the whole file.
+
+    An existing stack file can be reopened to append more arrays. `NparrayStack` can be used as a context manager. If
+    the stack is closed before any arrays are appended, the file holds an empty float64 array, and arrays of any shape
+    can be appended to it later.
+
+    The header has a fixed size, so arrays with a very large number of dimensions, or a very long structured type,
+    can't be stored in a stack.
+    """
+
+    def __init__(self, outfile, metadata=None, append=False):
+        """
+        Args:
+            outfile: str - numpy file path including extension.
+            metadata: dict - optional metadata, stored alongside the file as for `save_nparray`.
+            append: bool - if true, and the file exists, add arrays to the end of it. Otherwise any existing file is
+                        replaced.
+        """
+        self.outfile = outfile
+        self.count = 0
+        self.item_shape = None
+        self.dtype = None
+        if append and os.path.exists(outfile):
+            self.file = open(outfile, 'r+b')
+            self._read_header()
+            self.file.seek(0, os.SEEK_END)
+            if metadata is not None:
+                _save_metadata_file(outfile, metadata)
+        else:
+            self.file = open(outfile, 'w+b')
+            _save_metadata_file(outfile, metadata)
+
+    def append(self, array):
+        """
+        Add an array to the end of the stack.
+
+        Args:
+            array: numpy array - the array. Every array must have the same shape and type as the first one.
+        """
+        array = np.asarray(array)
+        if self.item_shape is None:
+            # Check that the header will still fit when the count is as large as it can be
+            _stack_header(array.dtype, (np.iinfo(np.int64).max,) + array.shape)
+            self.item_shape = array.shape
+            self.dtype = array.dtype
+            self.file.write(b' '*_STACK_HEADER_SIZE)
+        elif array.shape != self.item_shape or array.dtype != self.dtype:
+            raise ValueError('array shape and type must match the stack {} {}'.format(self.item_shape, self.dtype))
+        self.file.write(np.ascontiguousarray(array).tobytes())
+        self.count += 1
+        self._write_header()
+
+    def close(self):
+        """
+        Close the file.
+        """
+        if self.file is not None:
+            if self.item_shape is None:
+                # Nothing has been appended, so store an empty array to leave a valid numpy file
+                self.file.seek(0)
+                self.file.truncate()
+                self.file.write(_stack_header(np.dtype(np.float64), (0,)))
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write_header(self):
+        position = self.file.tell()
+        self.file.seek(0)
+        self.file.write(_stack_header(self.dtype, (self.count,) + tuple(self.item_shape)))
+        self.file.seek(position)
+        self.file.flush()
+
+    def _read_header(self):
+        version = np.lib.format.read_magic(self.file)
+        if version != (1, 0):
+            raise ValueError('{} is not a stack file'.format(self.outfile))
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(self.file)
+        if self.file.tell() != _STACK_HEADER_SIZE or fortran_order or not shape:
+            raise ValueError('{} is not a stack file'.format(self.outfile))
+        if shape[0] == 0:
+            # An empty stack, the first array appended sets the shape and type
+            self.file.seek(0)
+            self.file.truncate()
+            return
+        self.count = shape[0]
+        self.item_shape = shape[1:]
+        self.dtype = dtype
+
+# Size of the NparrayStack file header, which must be a multiple of 64 bytes
+_STACK_HEADER_SIZE = 256
+
+def _stack_header(dtype, shape):
+    # The header is padded to a fixed size, so it can be rewritten in place as the count grows
+    header = "{{'descr': {!r}, 'fortran_order': False, 'shape': {!r}, }}".format(
+        np.lib.format.dtype_to_descr(dtype), shape).encode('latin1')
+    if len(header) > _STACK_HEADER_SIZE - 11:
+        raise ValueError('array shape and type are too large for a stack file header')
+    header = header.ljust(_STACK_HEADER_SIZE - 11) + b'\n'
+    return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header
+
+def _is_npz(infile):
+    with open(infile, 'rb') as f:
+        return f.read(4) == b'PK\x03\x04'
+
+def _metadata_to_json(metadata):
+    def convert(value):
+        if isinstance(value, (np.generic, np.ndarray)):
+            return value.tolist()
+        raise TypeError('metadata value {!r} is not JSON serialisable'.format(value))
+    return json.dumps(metadata, default=convert)
+
+def _save_metadata_file(outfile, metadata):
+    if metadata is not None:
+        with open(outfile + '.json', 'w') as f:
+            f.write(_metadata_to_json(metadata))
+    elif os.path.exists(outfile + '.json'):
+        # Don't leave stale metadata from a previous file with the same name
+        os.remove(outfile + '.json')
+
+def make_npcolormap(length, colors, bands=None, channels=3, dtype=np.uint8, hsl=False):
     """
     Create a colormap, a list of varying colors, as a numpy array.
 
+    The colormap is calculated directly as an array, so large colormaps (for example 65536 entries for smooth fractal
+    colouring) can be created quickly. The RGB entries are identical to those in the `Color` list created by
+    `make_colormap`.
+
     Args:
         length: - int, required size of list
         colors: - tuple of Color objects - the list of colours, must be at least 2 long.
         bands: tuple of numbers - Relative size of each band. bands[i] gives the size of the band between color[i] and color[i+1].
                                   len(bands) must be exactly 1 less than len(colors). If bands is None, equal bands will be used.
         channels: int 3 for RGB, 4 for RGBA
+        dtype: numpy data type - np.uint8 for values 0-255, or a float type (eg np.float32) for values 0.0-1.0.
+        hsl: bool - if true, interpolate between colours in HSL space rather than RGB space. The hue changes the
+                    shorter way round the colour wheel.
 
     Returns:
-        An array of shape (length, channels) containing the RGB(A) values for each entry, as integers from 0-255
+        An array of shape (length, channels) containing the RGB(A) values for each entry, as integers from 0-255, or floats
+        if `dtype` is a float type.
     """
-
-    colors = make_colormap(length, colors, bands)
-
-    npcolormap = np.zeros((length, channels), dtype=np.uint8)
-    for i in range(length):
-        rgba = colors[i].as_rgba_bytes()
-        npcolormap[i, 0] = rgba[0]
-        npcolormap[i, 1] = rgba[1]
-        npcolormap[i, 2] = rgba[2]
-        if channels==4:
-            npcolormap[i, 3] = rgba[3]
-
-    return npcolormap
+    if channels not in (3, 4):
+        raise ValueError('channels must be 3 or 4')
+    rgba = make_colormap_array(length, colors, bands, hsl)[:, :channels]
+    if np.issubdtype(dtype, np.floating):
+        return rgba.astype(dtype)
+    # Truncate like Color.as_rgba_bytes
+    return (rgba*255).astype(dtype)
+
+# Number of histogram bins used to equalize float data
+_EQUALIZE_BINS = 1 << 16
+
+def _row_chunks(height, width, chunk_rows):
+    if not chunk_rows:
+        chunk_rows = max(1, (1 << 16) // max(width, 1))
+    return [(start, min(start + chunk_rows, height)) for start in range(0, height, chunk_rows)]
+
+def _chunk_limits(chunk):
+    if np.issubdtype(chunk.dtype, np.floating):
+        chunk = chunk[~np.isnan(chunk)]
+    if not chunk.size:
+        return None
+    return np.min(chunk), np.max(chunk)
+
+def _chunk_normalised(chunk, vmin, span):
+    # Offset from vmin as float64, clipped to the range 0 to span. NaN is treated as vmin.
+    t = chunk.astype(np.float64)
+    t -= vmin
+    np.clip(t, 0, span, out=t)
+    if np.issubdtype(chunk.dtype, np.floating):
+        t[np.isnan(t)] = 0
+    return t
+
+def _chunk_bins(chunk, vmin, span, bins, bin_scale):
+    t = _chunk_normalised(chunk, vmin, span)
+    t *= bin_scale
+    return np.minimum(t.astype(np.intp), bins - 1)
 
 def apply_npcolormap(out, counts, npcolormap):
     """
     Apply a color map to an array of counts, filling an existing output array
 
+    The output is filled a band of rows at a time, so no full size temporary arrays are created.
+
     Args:
         out: numpy array - the output array, height x width x channels (channels is 3 or 4).
         counts: numpy array - the counts array, height x width, count range 0 to max_count.
@@ -222,7 +599,123 @@ def apply_npcolormap(out, counts, npcolormap):
     if out.shape[0] != counts.shape[0] or out.shape[1] != counts.shape[1]:
         raise ValueError('out and counts are incompatible shapes')
 
-    if np.max(counts) > npcolormap.shape[0]:
-        raise ValueError('npcolormap too small for maximum value in counts array')
+    for start, stop in _row_chunks(counts.shape[0], counts.shape[1], None):
+        try:
+            if out.dtype == npcolormap.dtype:
+                np.take(npcolormap, counts[start:stop], axis=0, out=out[start:stop])
+            else:
+                out[start:stop] = np.take(npcolormap, counts[start:stop], axis=0)
+        except IndexError as e:
+            raise ValueError('npcolormap too small for maximum value in counts array') from e
+
+def apply_scaled_npcolormap(data, npcolormap, out=None, vmin=None, vmax=None, power=1, log=False, equalize=False,
+                            interpolate=False, chunk_rows=None, threads=None):
+    """
+    Apply a color map to an array of data values, which can be integers or floats (for example smooth escape counts, or
+    the counts from a density plot).
 
-    out[...] = npcolormap[counts]
\ No newline at end of file
+    The data is first normalised so that `vmin` maps to the first entry of the color map and `vmax` maps to the last
+    entry. Values outside that range are clipped, and NaN values are treated as `vmin`. Then:
+
+    * If `log` is true, the values are log scaled, which brings out detail in data with a very large range.
+    * If `equalize` is true, histogram equalisation is used instead, so that each part of the colormap is used by
+    roughly the same number of pixels. Integer data with a range of less than 65536 is equalised exactly, otherwise the
+    data is split into 65536 bins.
+    * If `power` isn't 1, the normalised values are raised to that power. A value less than 1 brightens low values,
+    similar to a gamma correction.
+
+    Each value is then used to select an entry from the colormap. If `interpolate` is true, the colour is blended
+    between the two nearest entries, so a short colormap can give smooth results.
+
+    The output is processed a band of rows at a time, so the only full size array is the output. The bands can be
+    processed by several threads. NumPy releases the global interpreter lock for most of the work, so this can speed up
+    large images.
+
+    Args:
+        data: numpy array - the data, height x width, or height x width x 1.
+        npcolormap: numpy array - a numpy color map, for example from `make_npcolormap`.
+        out: numpy array - optional output array, height x width x channels. If None, a new array is created with the
+                    same type as `npcolormap`.
+        vmin: number - the value that maps onto the first colormap entry. Defaults to the minimum value in `data`.
+        vmax: number - the value that maps onto the last colormap entry. Defaults to the maximum value in `data`.
+        power: number - power law applied to the normalised values.
+        log: bool - use log scaling.
+        equalize: bool - use histogram equalisation.
+        interpolate: bool - blend between colormap entries.
+        chunk_rows: int - the number of rows in each band. By default this is chosen based on the image width.
+        threads: int - the number of threads used to process the bands, or None to use the current thread.
+
+    Returns:
+        The output array.
+    """
+    if data.ndim == 3 and data.shape[2] == 1:
+        data = data[:, :, 0]
+    if data.ndim != 2:
+        raise ValueError('data must be a 2 dimensional array')
+    height, width = data.shape
+    channels = npcolormap.shape[1]
+    if out is None:
+        out = np.empty((height, width, channels), dtype=npcolormap.dtype)
+    elif out.shape != (height, width, channels):
+        raise ValueError('out must have shape (height, width, channels) to match data and npcolormap')
+    if power <= 0:
+        raise ValueError('power must be greater than 0')
+
+    chunks = _row_chunks(height, width, chunk_rows)
+    with concurrent.futures.ThreadPoolExecutor(threads) if threads else contextlib.nullcontext() as executor:
+        map_chunks = executor.map if executor else map
+
+        if vmin is None or vmax is None:
+            limits = [limit for limit in map_chunks(lambda chunk: _chunk_limits(data[chunk[0]:chunk[1]]), chunks)
+                      if limit is not None]
+            if vmin is None:
+                vmin = min((limit[0] for limit in limits), default=0)
+            if vmax is None:
+                vmax = max((limit[1] for limit in limits), default=vmin)
+        span = max(float(vmax) - float(vmin), 0)
+
+        cdf = None
+        if equalize:
+            # One bin per value for integer data with a small range, otherwise a fixed number of equal width bins
+            if np.issubdtype(data.dtype, np.integer) and span < _EQUALIZE_BINS:
+                bins, bin_scale = int(span) + 1, 1
+            else:
+                bins, bin_scale = _EQUALIZE_BINS, _EQUALIZE_BINS / span if span > 0 else 0
+            histogram = sum(map_chunks(lambda chunk: np.bincount(
+                _chunk_bins(data[chunk[0]:chunk[1]], vmin, span, bins, bin_scale).ravel(), minlength=bins), chunks))
+            cdf = np.cumsum(histogram)
+            first = cdf[np.argmax(histogram > 0)]
+            cdf = (cdf - first) / max(cdf[-1] - first, 1)
+
+        def process(chunk):
+            start, stop = chunk
+            if cdf is not None:
+                t = cdf[_chunk_bins(data[start:stop], vmin, span, bins, bin_scale)]
+            else:
+                t = _chunk_normalised(data[start:stop], vmin, span)
+                if log:
+                    np.log1p(t, out=t)
+                    scale = np.log1p(span)
+                else:
+                    scale = span
+                if scale > 0:
+                    t /= scale
+            if power != 1:
+                np.power(t, power, out=t)
+            t *= len(npcolormap) - 1
+            if interpolate:
+                index = np.minimum(t.astype(np.intp), len(npcolormap) - 2) if len(npcolormap) > 1 \
+                    else np.zeros(t.shape, dtype=np.intp)
+                factor = (t - index)[:, :, np.newaxis]
+                blend = np.take(npcolormap, index, axis=0) * (1 - factor)
+                blend += np.take(npcolormap, np.minimum(index + 1, len(npcolormap) - 1), axis=0) * factor
+                if np.issubdtype(out.dtype, np.integer):
+                    np.rint(blend, out=blend)
+                out[start:stop] = blend
+            else:
+                out[start:stop] = np.take(npcolormap, t.astype(np.intp), axis=0)
+
+        for _ in map_chunks(process, chunks):
+            pass
+
+    return out
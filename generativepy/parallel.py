@@ -0,0 +1,107 @@
+# Author:  Martin McBride
+# Created: 2026-10-16
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+"""
+The parallel module provides helper functions for spreading work, such as rendering the frames of an animation, across
+a pool of worker processes.
+
+Results are always returned in the same order as the inputs, so a parallel frame sequence can be used anywhere a normal
+frame sequence can be used (for example with `MovieBuilder` or `save_frames`).
+
+Worker processes need access to the function being called. Normally the function is pickled and sent to each worker.
+If the function can't be pickled (for example it is a lambda, or a function defined inside another function) the worker
+processes are started using `fork`, so that they inherit the function from the main process. `fork` is not available
+on every platform. Where it isn't, a `ValueError` is raised, and the function should be moved to module level.
+
+On platforms that don't use `fork`, the main script should protect its entry point with `if __name__ == '__main__':`.
+"""
+
+import collections
+import concurrent.futures
+import itertools
+import multiprocessing
+import pickle
+
+# Function used by a forked worker process when it can't be pickled. It is only set in the worker, by
+# `_set_fork_function`, so several `imap_ordered` calls can be active at once. See `imap_ordered`.
+_fork_function = None
+
+
+def _set_fork_function(function):
+    global _fork_function
+    _fork_function = function
+
+
+def _call_fork_function(item):
+    return _fork_function(item)
+
+
+def is_picklable(obj):
+    """
+    Check whether an object can be pickled, and so can be sent to a worker process.
+
+    Args:
+        obj: any - the object to check.
+
+    Returns:
+        True if `obj` can be pickled, False otherwise.
+    """
+    try:
+        pickle.dumps(obj)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def imap_ordered(function, items, workers=None, buffer_size=None):
+    """
+    Call `function(item)` for every item in `items`, using a pool of worker processes, and yield the results in the
+    same order as `items`.
+
+    Items are submitted to the pool as results are consumed, so that at most `buffer_size` results are pending or
+    waiting to be yielded at any time. This bounds the memory used, even for very long sequences.
+
+    Args:
+        function: function - a function that accepts a single item. If it can't be pickled, forked workers are used.
+        items: iterable - the items to process. This can be a lazy iterator.
+        workers: int - the number of worker processes. If None, 0 or 1, the items are processed in the current
+                    process, one at a time.
+        buffer_size: int - the maximum number of items in flight. Defaults to twice the number of workers.
+
+    Yields:
+        The result of `function` for each item, in order.
+    """
+    if not workers or workers < 2:
+        for item in items:
+            yield function(item)
+        return
+
+    if buffer_size is None:
+        buffer_size = 2*workers
+    if buffer_size < 1:
+        raise ValueError('buffer_size must be at least 1')
+
+    if is_picklable(function):
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        task = function
+    else:
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise ValueError('function cannot be pickled, and worker processes cannot be forked on this platform. '
+                             'Use a module level function instead.')
+        # Forked workers receive the initializer arguments without pickling them
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                          mp_context=multiprocessing.get_context('fork'),
+                                                          initializer=_set_fork_function, initargs=(function,))
+        task = _call_fork_function
+
+    try:
+        items = iter(items)
+        pending = collections.deque(executor.submit(task, item) for item in itertools.islice(items, buffer_size))
+        while pending:
+            result = pending.popleft().result()
+            for item in itertools.islice(items, 1):
+                pending.append(executor.submit(task, item))
+            yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
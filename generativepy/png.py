@@ -0,0 +1,261 @@
+# Author:  Martin McBride
+# Created: 2026-10-16
+# Copyright (C) 2026, Martin McBride
+# License: MIT
+"""
+The png module provides PNG writers that are optimised for particular uses.
+
+`PngWriter` writes a PNG file a band of rows at a time. This is useful for very large images, because the full image
+never needs to be held in memory. Each band is filtered, compressed, and written to the file as soon as it is available.
+
+`PngSequenceWriter` writes a sequence of frames as numbered PNG files, using background threads to compress and save
+the files. PNG compression is often slower than drawing the frame, so this allows drawing and saving to overlap.
+"""
+
+import queue
+import struct
+import threading
+import zlib
+import numpy as np
+from PIL import Image
+
+_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# PNG colour types, indexed by number of channels
+_COLOR_TYPES = {1: 0, 3: 2, 4: 6}
+
+# PNG row filter types
+FILTER_NONE = 0
+FILTER_SUB = 1
+FILTER_UP = 2
+
+
+class PngWriter:
+    """
+    Writes an 8 bit greyscale, RGB or RGBA PNG file, one band of rows at a time.
+
+    The rows must be written in order, from top to bottom, and the total number of rows written must equal the image
+    height. `PngWriter` can be used as a context manager, in which case the file is closed automatically.
+    """
+
+    def __init__(self, outfile, width, height, channels=3, compress_level=6, png_filter=FILTER_UP):
+        """
+        Args:
+            outfile: str - The path and filename for the output PNG file. The '.png' extension is optional, it will be
+                        added if it isn't present.
+            width: int - The width of the image in pixels.
+            height: int - The height of the image in pixels.
+            channels: int - The number of colour channels. 1 for greyscale, 3 for RGB, 4 for RGBA.
+            compress_level: int - zlib compression level, 0 (no compression) to 9 (best compression).
+            png_filter: int - The PNG row filter, `FILTER_NONE`, `FILTER_SUB` or `FILTER_UP`. Filtering usually
+                        improves compression of drawn images.
+        """
+        if channels not in _COLOR_TYPES:
+            raise ValueError('channels must be 1, 3 or 4')
+        if png_filter not in (FILTER_NONE, FILTER_SUB, FILTER_UP):
+            raise ValueError('png_filter must be FILTER_NONE, FILTER_SUB or FILTER_UP')
+        if not outfile.lower().endswith('.png'):
+            outfile += '.png'
+
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.png_filter = png_filter
+        self.rows_written = 0
+        self.previous_row = np.zeros((width*channels,), dtype=np.uint8)
+        self.compressor = zlib.compressobj(compress_level)
+        self.file = open(outfile, 'wb')
+        self.file.write(_SIGNATURE)
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, _COLOR_TYPES[channels], 0, 0, 0))
+
+    def write_rows(self, rows):
+        """
+        Write a band of rows to the file.
+
+        Args:
+            rows: numpy array - uint8 image data with shape (rows, width, channels).
+        """
+        if rows.ndim == 2 and self.channels == 1:
+            rows = rows[:, :, np.newaxis]
+        if rows.shape[1:] != (self.width, self.channels):
+            raise ValueError('rows must have shape (rows, width, channels)')
+        if self.rows_written + rows.shape[0] > self.height:
+            raise ValueError('too many rows written')
+
+        rows = rows.reshape((rows.shape[0], self.width*self.channels))
+        data = np.empty((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+        data[:, 0] = self.png_filter
+        if self.png_filter == FILTER_UP:
+            data[0, 1:] = rows[0] - self.previous_row
+            np.subtract(rows[1:], rows[:-1], out=data[1:, 1:])
+        elif self.png_filter == FILTER_SUB:
+            data[:, 1:self.channels + 1] = rows[:, :self.channels]
+            np.subtract(rows[:, self.channels:], rows[:, :-self.channels], out=data[:, self.channels + 1:])
+        else:
+            data[:, 1:] = rows
+        if rows.shape[0]:
+            self.previous_row[:] = rows[-1]
+        self.rows_written += rows.shape[0]
+
+        compressed = self.compressor.compress(data.tobytes())
+        if compressed:
+            self._write_chunk(b'IDAT', compressed)
+
+    def close(self):
+        """
+        Finish writing the file and close it.
+        """
+        if self.file is None:
+            return
+        try:
+            if self.rows_written != self.height:
+                raise ValueError('PNG file closed after {} of {} rows'.format(self.rows_written, self.height))
+            self._write_chunk(b'IDAT', self.compressor.flush())
+            self._write_chunk(b'IEND', b'')
+        finally:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+            self.file = None
+
+    def _write_chunk(self, chunk_type, data):
+        self.file.write(struct.pack('>I', len(data)))
+        self.file.write(chunk_type)
+        self.file.write(data)
+        self.file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(chunk_type))))
+
+
+class PngSequenceWriter:
+    """
+    Writes a sequence of frames as numbered PNG files, using a pool of encoder threads.
+
+    The image files are stored in numbered files. For example if `outfile` is "myfolder/myname.png" the files
+    will be saved as "myfolder/myname00000000.png", "myfolder/myname00000001.png" and so on.
+
+    Frames are passed to the encoder threads through a queue. If the queue is full, `write` waits until there is space,
+    so that the memory used stays bounded even if frames are created faster than they can be saved. PIL releases the
+    Python global interpreter lock while it compresses the image data, so encoder threads run in parallel with each
+    other and with the code creating the frames.
+
+    The writer keeps a reference to each frame until it has been saved. If the frame source reuses its frame buffers,
+    set `copy` so that each frame is copied before it is queued.
+
+    `PngSequenceWriter` can be used as a context manager, in which case it is closed automatically. Any exception raised
+    while saving a file is raised again by the next call to `write` or `close`.
+    """
+
+    def __init__(self, outfile, encoders=None, queue_size=None, compress_level=None, compress_type=None, copy=False):
+        """
+        Args:
+            outfile: str - The path and filename template for the output PNG files. The '.png' extension is optional.
+            encoders: int - The number of encoder threads. If None or 0, each frame is saved immediately by `write`.
+            queue_size: int - The maximum number of frames waiting to be saved. Defaults to twice the number of
+                        encoders.
+            compress_level: int - zlib compression level, 0 (no compression) to 9 (best compression). Low values are
+                        useful for intermediate frames that will be processed further. None uses the PIL default.
+            compress_type: int - zlib compression strategy, for example `zlib.Z_RLE` or `zlib.Z_FILTERED`. None uses
+                        the PIL default.
+            copy: bool - If true, copy each frame before queueing it.
+        """
+        if outfile.lower().endswith('.png'):
+            outfile = outfile[:-4]
+        self.outfile = outfile
+        self.copy = copy
+        self.save_options = {}
+        if compress_level is not None:
+            self.save_options['compress_level'] = compress_level
+        if compress_type is not None:
+            self.save_options['compress_type'] = compress_type
+        self.index = 0
+        self.error = None
+        self.threads = []
+        self.queue = None
+        if encoders:
+            self.queue = queue.Queue(maxsize=queue_size if queue_size else 2*encoders)
+            for _ in range(encoders):
+                thread = threading.Thread(target=self._encode, daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def write(self, frame):
+        """
+        Save the next frame in the sequence.
+
+        Args:
+            frame: numpy array or PIL Image - the frame. A numpy frame must have uint8 data, with shape (height, width),
+                        or (height, width, channels) where channels is 1, 3 or 4.
+        """
+        self._check_error()
+        if self.copy:
+            frame = frame.copy()
+        filename = self.outfile + str(self.index).zfill(8) + '.png'
+        self.index += 1
+        if self.queue is None:
+            self._save(filename, frame)
+        else:
+            self.queue.put((filename, frame))
+
+    def close(self):
+        """
+        Wait for all the queued frames to be saved, and stop the encoder threads.
+        """
+        self._stop_encoders()
+        self._check_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Discard the queued frames and stop the encoders, without raising an encoder error that would hide the
+            # original exception
+            self._stop_encoders(discard=True)
+
+    def _stop_encoders(self, discard=False):
+        if self.queue is not None:
+            if discard:
+                try:
+                    while True:
+                        self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+            for _ in self.threads:
+                self.queue.put(None)
+            for thread in self.threads:
+                thread.join()
+            self.threads = []
+            self.queue = None
+
+    def _encode(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            if self.error is None:
+                try:
+                    self._save(*item)
+                except Exception as e:
+                    self.error = e
+
+    def _save(self, filename, frame):
+        if isinstance(frame, np.ndarray):
+            if frame.ndim == 3 and frame.shape[2] == 1:
+                frame = frame[:, :, 0]
+            frame = Image.fromarray(frame)
+        frame.save(filename, **self.save_options)
+
+    def _check_error(self):
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
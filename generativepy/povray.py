@@ -9,9 +9,12 @@ It uses the Vapory Python library to allow scenes to be described in Python.
 
 This module also provides 3d axes, function plotting, and default camera and light configurations.
 """
+import functools
 import numpy as np
 
 from generativepy.color import Color
+from generativepy.draft import get_draft
+from generativepy.framestream import FrameSource
 from generativepy.math import Vector as V
 from vapory import Camera, LightSource, Background, Scene, Texture, Pigment, Finish, Cylinder, Union, Text
 import math
@@ -625,7 +628,7 @@ def make_povray_image(outfile, draw, width, height):
     scene.render(outfile + '.png', width=width, height=height, antialiasing=0.001)
 
 
-def make_povray_frame(draw, width, height):
+def make_povray_frame(draw, width, height, draft=None):
     """
     Used to create a single povray image as a frame. A frame is a NumPy array with shape (pixel_height, pixel_width, 3). Povray images
     are always RGB images.
@@ -639,18 +642,15 @@ def make_povray_frame(draw, width, height):
         draw: function - A drawing function object, see below.
         width: int - The width of the image that will be created, in pixels.
         height: int - The height of the image that will be created, in pixels.
+        draft: bool, number or Draft - Draft mode setting for this call, see `draft.get_draft`.
 
     Returns:
         A frame.
     """
-    scene = draw(width, height, 0, 1)
-    rgbdata = scene.render(width=width, height=height, antialiasing=0.001)
-    rgbadata = np.full((width, height, 4), 255)
-    rgbadata[:, :, :-1] = rgbdata
-    return rgbadata
+    return _render_povray_frame(draw, width, height, 1, get_draft(draft), 0)
 
 
-def make_povray_frames(draw, width, height, count):
+def make_povray_frames(draw, width, height, count, cache=None, draft=None):
     """
     Used to sequence of povray images as a frame. A frame is a NumPy array with shape (pixel_height, pixel_width, 3). Povray images
     are always RGB images.
@@ -660,6 +660,13 @@ def make_povray_frames(draw, width, height, count):
 
     Each image is rendered to a NumPy array (a "frame").
 
+    If `cache` is set, frames that have already been rendered from the same draw function, with the same settings, are
+    loaded from the cache rather than being rendered again (see the `cache` module). Povray rendering is slow, so this
+    can save a lot of time.
+
+    In draft mode (see the `draft` module) the scenes are rendered at a reduced size and quality, and `cache` is not
+    used.
+
     The draw function must have the signature described for `example_draw_function`.
 
     Args:
@@ -667,16 +674,62 @@ def make_povray_frames(draw, width, height, count):
         width: int - The width of the image that will be created, in pixels.
         height: int - The height of the image that will be created, in pixels.
         count: int - The number of frames to create.
+        cache: RenderCache - Optional cache of previously rendered frames.
+        draft: bool, number or Draft - Draft mode setting for this call, see `draft.get_draft`.
 
     Yield:
         A lazy iterator returning a sequncve of frames. The number of frames is determined by the `count` parameter.
     """
+    draft = get_draft(draft)
+    if draft is not None:
+        render = functools.partial(_render_povray_frame, draw, width, height, count, draft)
+        yield from draft.expand(map(render, draft.frame_numbers(count)), count)
+        return
+    render = functools.partial(_render_povray_frame, draw, width, height, count, None)
+    if cache is not None:
+        render = cache.wrap(render, draw, ('povray', width, height, count))
     for i in range(count):
-        scene = draw(width, height, i, count)
+        yield render(i)
+
+
+def make_povray_frame_source(draw, width, height, count, cache=None, cache_size=8, draft=None):
+    """
+    Create a random access sequence of povray frames. This is similar to `make_povray_frames`, except that it returns
+    a `FrameSource`, so frames can be requested in any order, and only the frames that are requested are rendered.
+
+    Args:
+        draw: function - A drawing function object, see `example_povray_draw_function`.
+        width: int - The width of the image that will be created, in pixels.
+        height: int - The height of the image that will be created, in pixels.
+        count: int - The number of frames.
+        cache: RenderCache - Optional cache of previously rendered frames.
+        cache_size: int - The number of recently used frames kept in memory.
+        draft: bool, number or Draft - Draft mode setting for this call, see `draft.get_draft`.
+
+    Returns:
+        A `FrameSource`.
+    """
+    draft = get_draft(draft)
+    if draft is not None:
+        render = functools.partial(_render_povray_frame, draw, width, height, count, draft)
+        return draft.frame_source(render, count, cache_size)
+    render = functools.partial(_render_povray_frame, draw, width, height, count, None)
+    if cache is not None:
+        render = cache.wrap(render, draw, ('povray', width, height, count))
+    return FrameSource(render, count, cache_size)
+
+
+def _render_povray_frame(draw, width, height, count, draft, frame_no):
+    scene = draw(width, height, frame_no, count)
+    if draft is None:
         rgbdata = scene.render(width=width, height=height, antialiasing=0.001)
-        rgbadata = np.full((width, height, 4), 255)
-        rgbadata[:, :, :-1] = rgbdata
-        yield rgbadata
+    else:
+        draft_width, draft_height = draft.size(width, height)
+        rgbdata = scene.render(width=draft_width, height=draft_height, quality=draft.quality,
+                               antialiasing=draft.antialiasing)
+    rgbadata = np.full(rgbdata.shape[:2] + (4,), 255, dtype=np.uint8)
+    rgbadata[:, :, :-1] = rgbdata
+    return rgbadata if draft is None else draft.output(rgbadata, width, height)
 
 
 def example_povray_draw_function(pixel_width, pixel_height, frame_no, frame_count):
@@ -2,8 +2,10 @@
 # Created: 2019-01-25
 # Copyright (C) 2018, Martin McBride
 # License: MIT
+import bisect
 import collections
 import math
+import numpy as np
 
 """
 The tween module provides tweening functionality to help with animation,
@@ -19,11 +21,14 @@ def set_frame_rate(rate):
         rate: number - Number of frames per second
     """
     global _FRAME_RATE
+    _check_frame_rate(rate)
+    _FRAME_RATE = rate
+
+def _check_frame_rate(rate):
     if not isinstance(rate, (int, float)):
         raise ValueError('Frame rate must be a numeric value')
     if rate < 1:
         raise ValueError('Frame rate must be one or greater')
-    _FRAME_RATE = rate
 
 class Tween():
     '''
@@ -44,6 +49,10 @@ class Tween():
 
     You can use get(n) to get the nth frame, or alternatively you can use tween[n]. The built in len() function can be
     used to find the sequence length. Tween are iterable, so they can be used with for loops etc.
+
+    A tween doesn't store a value for every frame. Each call to wait(), to() or ease() adds a single segment, holding its
+    start and end frames, the start and end values, and the easing function. Values are calculated when they are
+    requested, so a long tween uses very little memory. values() calculates many frames at once, as a NumPy array.
     '''
 
     def __init__(self, value=0):
@@ -55,7 +64,10 @@ class Tween():
             self
         """
         self.check_value(value, None)
-        self.frames = []
+        # Each segment is a tuple (start, end, from_value, to_value, ease_function). _ends holds the end frame of each
+        # segment, for bisecting.
+        self.segments = []
+        self._ends = []
         self.previous = value
         self.nextFrame = 0
 
@@ -69,8 +81,8 @@ class Tween():
         Returns:
             self
         """
-        count = self.check_and_convert_time(time, len(self.frames))
-        self.frames.extend([self.previous for i in range(count)])
+        count = self.check_and_convert_time(time, len(self))
+        self._add_segment(self.previous, count, None)
         return self
 
     def wait_d(self, time):
@@ -84,7 +96,7 @@ class Tween():
             self
         """
         count = self.check_and_convert_time_d(time)
-        self.frames.extend([self.previous for i in range(count)])
+        self._add_segment(self.previous, count, None)
         return self
 
     def set(self, value):
@@ -114,11 +126,8 @@ class Tween():
             self
         """
         self.check_value(value, self.previous)
-        count = self.check_and_convert_time(time, len(self.frames))
-        for i in range(count):
-            factor = (i + 1) / count
-            self.frames.append(self.previous + factor * (value - self.previous))
-        self.previous = value
+        count = self.check_and_convert_time(time, len(self))
+        self._add_segment(value, count, _ease_none)
         return self
 
     def to_d(self, value, time):
@@ -135,10 +144,7 @@ class Tween():
         """
         self.check_value(value, self.previous)
         count = self.check_and_convert_time_d(time)
-        for i in range(count):
-            factor = (i + 1) / count
-            self.frames.append(self.previous + factor * (value - self.previous))
-        self.previous = value
+        self._add_segment(value, count, _ease_none)
         return self
 
     def ease(self, value, time, ease_function):
@@ -155,11 +161,8 @@ class Tween():
             self
         """
         self.check_value(value, self.previous)
-        count = self.check_and_convert_time(time, len(self.frames))
-        for i in range(count):
-            factor = ease_function((i + 1) / count)
-            self.frames.append(self.previous + factor * (value - self.previous))
-        self.previous = value
+        count = self.check_and_convert_time(time, len(self))
+        self._add_segment(value, count, ease_function)
         return self
 
     def ease_d(self, value, time, ease_function):
@@ -177,10 +180,7 @@ class Tween():
         """
         self.check_value(value, self.previous)
         count = self.check_and_convert_time_d(time)
-        for i in range(count):
-            factor = ease_function((i + 1) / count)
-            self.frames.append(self.previous + factor * (value - self.previous))
-        self.previous = value
+        self._add_segment(value, count, ease_function)
         return self
 
     def get(self, frame):
@@ -190,15 +190,82 @@ class Tween():
         Returns:
             The tween value for the frame. If a frame is requested that is beyond the last frame available, return the value of the final frame.
         """
-        if frame >= len(self.frames):
+        length = len(self)
+        if frame >= length:
             return self.previous
-        return self.frames[frame]
+        if frame < 0:
+            frame += length
+            if frame < 0:
+                raise IndexError('tween index out of range')
+        start, end, from_value, to_value, ease_function = self.segments[bisect.bisect_right(self._ends, frame)]
+        if ease_function is None:
+            return from_value
+        if ease_function is _ease_none:
+            factor = (frame - start + 1) / (end - start)
+        else:
+            factor = ease_function((frame - start + 1) / (end - start))
+        return self._interpolate(from_value, to_value, factor)
+
+    def values(self, frames=None):
+        """
+        Get the tween values for many frames at once. This gives the same values as `get`, to within rounding error,
+        but is much faster than calling `get` for each frame. Each easing function is called once, with an array of all
+        the frames in its segment, if it accepts arrays (see `sample_ease`).
+
+        Args:
+            frames: array-like of int - the frame numbers. If None, every frame of the tween is used.
+
+        Returns:
+            A float64 NumPy array of values, one for each frame. For a `TweenVector`, each value is a row of the array.
+        """
+        frames = np.arange(len(self)) if frames is None else np.asarray(frames, dtype=np.int64)
+        length = len(self)
+        final = np.array(self.previous, dtype=np.float64)
+        result = np.empty(frames.shape + final.shape, dtype=np.float64)
+        result[...] = final
+        frames = np.where(frames < 0, frames + length, frames)
+        if np.any(frames < 0):
+            raise IndexError('tween index out of range')
+        inside = frames < length
+        if not np.any(inside):
+            return result
+
+        frames = frames[inside]
+        segments = np.searchsorted(self._ends, frames, side='right')
+        starts = np.array([segment[0] for segment in self.segments], dtype=np.int64)
+        counts = np.array([segment[1] for segment in self.segments], dtype=np.int64) - starts
+        from_values = np.array([segment[2] for segment in self.segments], dtype=np.float64)
+        to_values = np.array([segment[3] for segment in self.segments], dtype=np.float64)
+        factor = (frames - starts[segments] + 1) / counts[segments]
+        # Group the frames by segment, and apply each easing function to all of its frames in one call. Waits and
+        # linear segments don't need an easing function, as the from and to values of a wait are equal.
+        order = np.argsort(segments, kind='stable')
+        indexes, firsts = np.unique(segments[order], return_index=True)
+        lasts = np.append(firsts[1:], len(order))
+        for index, first, last in zip(indexes.tolist(), firsts.tolist(), lasts.tolist()):
+            ease_function = self.segments[index][4]
+            if ease_function is not None and ease_function is not _ease_none:
+                selected = order[first:last]
+                factor[selected] = _ease_array(ease_function, factor[selected])
+        if final.ndim:
+            factor = factor[:, np.newaxis]
+        from_values = from_values[segments]
+        result[inside] = from_values + factor*(to_values[segments] - from_values)
+        return result
+
+    @property
+    def frames(self):
+        """
+        Read-only property returns a list of the values of every frame. The list is created each time the property is
+        read, so for long tweens it is better to use `get` or `values`.
+        """
+        return [self.get(frame) for frame in range(len(self))]
 
     def __getitem__(self, key):
         return self.get(key)
 
     def __next__(self):
-        if self.nextFrame >= len(self.frames):
+        if self.nextFrame >= len(self):
             raise StopIteration()
         frame = self.get(self.nextFrame)
         self.nextFrame += 1
@@ -226,8 +293,20 @@ class Tween():
             raise ValueError('time must not be negative')
         return int(_FRAME_RATE*time)
 
+    def _add_segment(self, value, count, ease_function):
+        # Adds a segment of count frames moving from the current value to value, and makes value the current value.
+        # ease_function is None for a wait, or _ease_none for a linear transition.
+        if count > 0:
+            start = len(self)
+            self.segments.append((start, start + count, self.previous, value, ease_function))
+            self._ends.append(start + count)
+        self.previous = value
+
+    def _interpolate(self, from_value, to_value, factor):
+        return from_value + factor * (to_value - from_value)
+
     def __len__(self):
-        return len(self.frames)
+        return self._ends[-1] if self._ends else 0
 
 
 class TweenVector(Tween):
@@ -240,137 +319,471 @@ class TweenVector(Tween):
     The vector quantities must have at least 1 element, but normally it will be 2 or more. Every value added must have
     the same length as the initial value, for example if you start with an (x, y) value, every new value must also
     have 2 dimensions.
+
+    While a value is changing, get() returns a list. While the tween is waiting, get() returns the value that was
+    supplied.
     '''
 
     def __init__(self, value=(0, 0)):
         self.check_value(value, None)
         Tween.__init__(self, value)
 
-    def to(self, value, time):
+    def check_value(self, value, previous):
+        if not isinstance(value, collections.abc.Sequence) or isinstance(value, str):
+            raise ValueError('Sequence value required')
+        if len(value) <= 0:
+            raise ValueError('Vectors of rank 0 are not supported')
+        if previous and len(value) != len(self.previous):
+            raise ValueError('All values must be vectors of equal rank')
+
+    def _interpolate(self, from_value, to_value, factor):
+        return [a + factor * (b - a) for a, b in zip(from_value, to_value)]
+
+
+class Timeline():
+    '''
+    A timeline animates many values, called channels, together. It is intended for scenes with thousands of animated
+    values, for example the positions and sizes of particles, where creating a separate `Tween` for each value would be
+    slow.
+
+    Each channel works like a `Tween`. It has a current value, and wait(), set(), to() and ease() add to its sequence of
+    values in the same way. Each of these methods accepts a selection of channels, and the values and times can be
+    numbers, that apply to every selected channel, or arrays with one entry per selected channel. So a single call can
+    move thousands of particles, each to its own position, each finishing at a different time.
+
+    Channels are created with add_channel() or add_channels(). A channel can have a name, or it can be selected by its
+    index. Channels can be selected by:
+
+    * An int index or a str name, for a single channel.
+    * A slice of channel indexes.
+    * A sequence of indexes and names, or an array of indexes, for example the array returned by add_channels().
+
+    A selection can't include the same channel more than once.
+
+    get(n) returns the values of every channel at frame n as a float64 NumPy array, indexed by channel, so it can be
+    used directly for vectorised drawing. Like `Tween`, if frame n is after the end of a channel's sequence, the
+    channel's current value is used.
+
+    The segments of every channel are held together in a few NumPy arrays, rather than in per-channel objects. A timeline
+    has its own frame rate, rather than using the rate set by set_frame_rate.
+    '''
+
+    def __init__(self, frame_rate=None):
         """
-        Make the tween value move from its current value to a new value, finishing at the specified time.
+        Args:
+            frame_rate: number - Number of frames per second. If None, the current global rate set by `set_frame_rate`
+                        is used.
+        """
+        if frame_rate is None:
+            frame_rate = _FRAME_RATE
+        _check_frame_rate(frame_rate)
+        self.frame_rate = frame_rate
+        self.names = {}
+        self._current = np.zeros((0,), dtype=np.float64)
+        self._cursor = np.zeros((0,), dtype=np.int64)
+        # Segments are added in batches, one batch per call, and joined into single arrays when they are needed. Each
+        # batch holds arrays of channel index, start frame, end frame, from value, to value and easing function id.
+        self._batches = [(np.zeros((0,), dtype=np.int64),)*3 + (np.zeros((0,)),)*2 + (np.zeros((0,), dtype=np.int32),)]
+        self._segments = None
+        self._ease_functions = []
+
+    def add_channel(self, name=None, value=0):
+        """
+        Add a channel.
+
+        Args:
+            name: str - Optional name of the channel.
+            value: number - The initial value, defaults to 0.
+
+        Returns:
+            The index of the new channel.
+        """
+        if name is not None:
+            if not isinstance(name, str):
+                raise ValueError('Channel name must be a string')
+            if name in self.names:
+                raise ValueError('Channel name {} is already used'.format(name))
+        index = self.add_channels(1, value)[0]
+        if name is not None:
+            self.names[name] = int(index)
+        return int(index)
+
+    def add_channels(self, count, value=0):
+        """
+        Add several unnamed channels.
+
+        Args:
+            count: int - The number of channels to add.
+            value: number or array - The initial value of every channel, or an array of `count` initial values.
+
+        Returns:
+            A NumPy array of the indexes of the new channels.
+        """
+        if not isinstance(count, int) or count < 0:
+            raise ValueError('count must be a non-negative int')
+        values = self._check_values(value, count)
+        first = len(self._current)
+        self._current = np.concatenate((self._current, values))
+        self._cursor = np.concatenate((self._cursor, np.zeros((count,), dtype=np.int64)))
+        return np.arange(first, first + count)
+
+    def wait(self, channels, time):
+        """
+        Wait, maintaining the current value of the channels, until the specified absolute time.
+
+        Args:
+            channels: channel selection - The channels.
+            time: number or array - Absolute time to wait, for all the channels or for each channel.
+
+        Returns:
+            self
+        """
+        indexes = self._channel_indexes(channels)
+        self._add_segments(indexes, self._current[indexes], self._time_to_count(indexes, time), 0)
+        return self
+
+    def wait_d(self, channels, time):
+        """
+        Wait, maintaining the current value of the channels, for the specified time period.
+
+        Args:
+            channels: channel selection - The channels.
+            time: number or array - Relative time to wait, for all the channels or for each channel.
+
+        Returns:
+            self
+        """
+        indexes = self._channel_indexes(channels)
+        self._add_segments(indexes, self._current[indexes], self._duration_to_count(indexes, time), 0)
+        return self
+
+    def set(self, channels, value):
+        """
+        Set the value of the channels.
+
+        Args:
+            channels: channel selection - The channels.
+            value: number or array - New value, for all the channels or for each channel.
+
+        Returns:
+            self
+        """
+        indexes = self._channel_indexes(channels)
+        self._current[indexes] = self._check_values(value, len(indexes))
+        return self
+
+    def to(self, channels, value, time):
+        """
+        Make the channels move from their current values to new values, finishing at the specified time.
         The transition is linear.
 
         Args:
-            value: sequence of numbers - New tween value.
-            time: number - Absolute time to reach final value.
+            channels: channel selection - The channels.
+            value: number or array - New value, for all the channels or for each channel.
+            time: number or array - Absolute time to reach the final value, for all the channels or for each channel.
 
         Returns:
             self
         """
-        self.check_value(value, self.previous)
-        count = self.check_and_convert_time(time, len(self.frames))
-        for i in range(count):
-            nextvalue = []
-            factor = (i + 1) / count
-            for a, b in zip(self.previous, value):
-                nextvalue.append(a + factor * (b - a))
-            self.frames.append(nextvalue)
-        self.previous = value
+        indexes = self._channel_indexes(channels)
+        values = self._check_values(value, len(indexes))
+        self._add_segments(indexes, values, self._time_to_count(indexes, time), 0)
         return self
 
-    def to_d(self, value, time):
+    def to_d(self, channels, value, time):
         """
-        Make the tween value move from its current value to a new value, finishing after the specified time period.
+        Make the channels move from their current values to new values, finishing after the specified time period.
         The transition is linear.
 
         Args:
-            value: sequence of numbers - New tween value.
-            time: number - Relative time period to reach final value.
+            channels: channel selection - The channels.
+            value: number or array - New value, for all the channels or for each channel.
+            time: number or array - Relative time period to reach the final value, for all the channels or for each
+                        channel.
 
         Returns:
             self
         """
-        self.check_value(value, self.previous)
-        count = self.check_and_convert_time_d(time)
-        for i in range(count):
-            nextvalue = []
-            factor = (i + 1) / count
-            for a, b in zip(self.previous, value):
-                nextvalue.append(a + factor * (b - a))
-            self.frames.append(nextvalue)
-        self.previous = value
+        indexes = self._channel_indexes(channels)
+        values = self._check_values(value, len(indexes))
+        self._add_segments(indexes, values, self._duration_to_count(indexes, time), 0)
         return self
 
-    def ease(self, value, time, ease_function):
+    def ease(self, channels, value, time, ease_function):
         """
-        Make the tween value move from its current value to a new value, finishing at the specified time.
+        Make the channels move from their current values to new values, finishing at the specified time.
         The transition is controlled by the easing function.
 
         Args:
-            value: sequence of numbers - New tween value.
-            time: number - Absolute time to reach final value.
-            ease_function: function - Easing function. Thus accepts a value that varies between 0 and 1.0.
+            channels: channel selection - The channels.
+            value: number or array - New value, for all the channels or for each channel.
+            time: number or array - Absolute time to reach the final value, for all the channels or for each channel.
+            ease_function: function - Easing function. The easing functions in this module are applied to every
+                        channel in one call, see `sample_ease`.
 
         Returns:
             self
         """
-        self.check_value(value, self.previous)
-        count = self.check_and_convert_time(time, len(self.frames))
-        for i in range(count):
-            nextvalue = []
-            factor = ease_function((i + 1) / count)
-            for a, b in zip(self.previous, value):
-                nextvalue.append(a + factor * (b - a))
-            self.frames.append(nextvalue)
-        self.previous = value
+        indexes = self._channel_indexes(channels)
+        values = self._check_values(value, len(indexes))
+        self._add_segments(indexes, values, self._time_to_count(indexes, time), self._ease_id(ease_function))
         return self
 
-    def ease_d(self, value, time, ease_function):
+    def ease_d(self, channels, value, time, ease_function):
         """
-        Make the tween value move from its current value to a new value, finishing after the specified time period.
+        Make the channels move from their current values to new values, finishing after the specified time period.
         The transition is controlled by the easing function.
 
         Args:
-            value: sequence of numbers - New tween value.
-            time: number - Absolute time to reach final value.
-            ease_function: function - Easing function. Thus accepts a value that varies between 0 and 1.0.
+            channels: channel selection - The channels.
+            value: number or array - New value, for all the channels or for each channel.
+            time: number or array - Relative time period to reach the final value, for all the channels or for each
+                        channel.
+            ease_function: function - Easing function, see `ease`.
 
         Returns:
             self
         """
-        self.check_value(value, self.previous)
-        count = self.check_and_convert_time_d(time)
-        for i in range(count):
-            nextvalue = []
-            factor = ease_function((i + 1) / count)
-            for a, b in zip(self.previous, value):
-                nextvalue.append(a + factor * (b - a))
-            self.frames.append(nextvalue)
-        self.previous = value
+        indexes = self._channel_indexes(channels)
+        values = self._check_values(value, len(indexes))
+        self._add_segments(indexes, values, self._duration_to_count(indexes, time), self._ease_id(ease_function))
         return self
 
-    def check_value(self, value, previous):
-        if not isinstance(value, collections.abc.Sequence) or isinstance(value, str):
-            raise ValueError('Sequence value required')
-        if len(value) <= 0:
-            raise ValueError('Vectors of rank 0 are not supported')
-        if previous and len(value) != len(self.previous):
-            raise ValueError('All values must be vectors of equal rank')
+    def get(self, frame):
+        """
+        Get the values of every channel at the specified frame.
+
+        Args:
+            frame: int - The frame number.
+
+        Returns:
+            A float64 NumPy array with one value for each channel. For channels whose sequence ends before the frame,
+            the current value of the channel is used.
+        """
+        if frame < 0:
+            frame += len(self)
+            if frame < 0:
+                raise IndexError('timeline index out of range')
+        result = self._current.copy()
+        channels, starts, ends, from_values, to_values, ease_ids = self._compile()
+        active = np.flatnonzero((starts <= frame) & (ends > frame))
+        if not len(active):
+            return result
+        factor = (frame - starts[active] + 1) / (ends[active] - starts[active])
+        ease_ids = ease_ids[active]
+        for ease_id in np.unique(ease_ids).tolist():
+            if ease_id:
+                selected = ease_ids == ease_id
+                factor[selected] = _ease_array(self._ease_functions[ease_id - 1], factor[selected])
+        from_values = from_values[active]
+        result[channels[active]] = from_values + factor * (to_values[active] - from_values)
+        return result
+
+    def get_channel(self, channel, frame):
+        """
+        Get the value of a single channel at the specified frame.
+
+        Args:
+            channel: int or str - The channel index or name.
+            frame: int - The frame number.
+
+        Returns:
+            The value, as a float.
+        """
+        index = self._channel_indexes(channel)[0]
+        return float(self.get(frame)[index])
+
+    @property
+    def channel_count(self):
+        """
+        Read-only property returns the number of channels.
+        """
+        return len(self._current)
+
+    def __getitem__(self, frame):
+        return self.get(frame)
+
+    def __iter__(self):
+        for frame in range(len(self)):
+            yield self.get(frame)
+
+    def __len__(self):
+        """
+        The length of the longest channel sequence, in frames.
+        """
+        return int(self._cursor.max()) if len(self._cursor) else 0
+
+    def _channel_indexes(self, channels):
+        # Converts a channel selection into an array of channel indexes
+        if isinstance(channels, slice):
+            return np.arange(self.channel_count)[channels]
+        if isinstance(channels, (int, np.integer, str)):
+            channels = [channels]
+        if not isinstance(channels, np.ndarray):
+            channels = [self._channel_index(c) if isinstance(c, str) else c for c in channels]
+        indexes = np.asarray(channels)
+        if indexes.ndim != 1 or not (len(indexes) == 0 or np.issubdtype(indexes.dtype, np.integer)):
+            raise ValueError('Channels must be selected by index or name')
+        indexes = indexes.astype(np.int64)
+        if len(indexes) and (indexes.min() < 0 or indexes.max() >= self.channel_count):
+            raise ValueError('Channel index out of range')
+        if len(np.unique(indexes)) != len(indexes):
+            raise ValueError('Each channel can only be selected once')
+        return indexes
+
+    def _channel_index(self, name):
+        if name not in self.names:
+            raise ValueError('Unknown channel name {}'.format(name))
+        return self.names[name]
+
+    def _check_values(self, value, count):
+        values = np.asarray(value)
+        if not np.issubdtype(values.dtype, np.number):
+            raise ValueError('Numeric value required')
+        if values.ndim > 1 or (values.ndim == 1 and len(values) != count):
+            raise ValueError('value must be a number, or a sequence with one value per channel')
+        return np.broadcast_to(values.astype(np.float64), (count,))
+
+    def _time_to_count(self, indexes, time):
+        counts = self._check_times(time, indexes) - self._cursor[indexes]
+        if np.any(counts < 0):
+            raise ValueError('New time must not be less than previous time')
+        return counts
+
+    def _duration_to_count(self, indexes, time):
+        counts = self._check_times(time, indexes)
+        if np.any(counts < 0):
+            raise ValueError('time must not be negative')
+        return counts
+
+    def _check_times(self, time, indexes):
+        # Converts times in seconds to frame counts, one for each channel
+        times = np.asarray(time)
+        if not np.issubdtype(times.dtype, np.number):
+            raise ValueError('time must be a number')
+        if times.ndim > 1 or (times.ndim == 1 and len(times) != len(indexes)):
+            raise ValueError('time must be a number, or a sequence with one time per channel')
+        return np.broadcast_to(np.trunc(self.frame_rate * times).astype(np.int64), indexes.shape)
+
+    def _ease_id(self, ease_function):
+        # Easing functions are stored by id, 1 or greater. 0 is used for waits and linear transitions.
+        for i, function in enumerate(self._ease_functions):
+            if function is ease_function:
+                return i + 1
+        self._ease_functions.append(ease_function)
+        return len(self._ease_functions)
+
+    def _add_segments(self, indexes, values, counts, ease_id):
+        # Adds a segment of counts frames to each channel, moving from its current value to values. Channels with a
+        # count of 0 just take the new value.
+        used = counts > 0
+        if np.any(used):
+            channels = indexes[used]
+            starts = self._cursor[channels]
+            self._batches.append((channels, starts, starts + counts[used], self._current[channels], values[used],
+                                  np.full(len(channels), ease_id, dtype=np.int32)))
+            self._segments = None
+            self._cursor[channels] += counts[used]
+        self._current[indexes] = values
+
+    def _compile(self):
+        # Joins the batches of segments into one array for each field
+        if self._segments is None:
+            self._segments = tuple(np.concatenate(field) for field in zip(*self._batches))
+            self._batches = [self._segments]
+        return self._segments
+
+
+def _ease_none(x):
+    # Marks a linear segment, so that the factor can be calculated without calling an easing function
+    return x
+
+
+def sample_ease(ease_function, time, start=0, duration=1, from_value=0, to_value=1):
+    """
+    Calculate eased values for many items at once, for example a staggered animation where each particle starts
+    moving at a different time. Each item moves from `from_value` to `to_value`, starting at `start` and taking
+    `duration`. Before it starts it has `from_value`, after it finishes it has `to_value`.
+
+    Every parameter can be a number or an array, and they are broadcast together. For example, if `start` is an array
+    of n start times, the result is an array of n values. If `time` is an array of shape (frames, 1), the result has
+    shape (frames, n), the values of every particle for every frame. If `from_value` and `to_value` have an extra axis,
+    for example (n, 2) positions, the result has that extra axis too.
+
+    The easing functions in this module are evaluated in a single call for all the items. Other easing functions are
+    called once per item, unless they have a `vectorised` attribute that is true, to show that they accept NumPy
+    arrays.
+
+    Args:
+        ease_function: function - Easing function, for example `ease_in_out_harm()`.
+        time: number or array - the current time, in any units, for example seconds or frames.
+        start: number or array - the time each item starts to move.
+        duration: number or array - the time each item takes to move. Must be greater than 0.
+        from_value: number or array - the value of each item before it starts to move.
+        to_value: number or array - the value of each item after it has finished moving.
+
+    Returns:
+        A float64 NumPy array of values.
+    """
+    duration = np.asarray(duration, dtype=np.float64)
+    if np.any(duration <= 0):
+        raise ValueError('duration must be greater than 0')
+    factor = np.clip((np.asarray(time, dtype=np.float64) - start) / duration, 0, 1)
+    eased = _ease_array(ease_function, factor)
+    from_value = np.asarray(from_value, dtype=np.float64)
+    difference = np.asarray(to_value, dtype=np.float64) - from_value
+    if difference.ndim > eased.ndim:
+        eased = eased.reshape(eased.shape + (1,)*(difference.ndim - eased.ndim))
+    return from_value + eased * difference
+
+
+def _ease_array(ease_function, x):
+    # Applies an easing function to an array of values, in one call if the function accepts arrays
+    x = np.asarray(x, dtype=np.float64)
+    if getattr(ease_function, 'vectorised', False):
+        return np.broadcast_to(ease_function(x), x.shape).astype(np.float64)
+    return np.array([ease_function(v) for v in x.ravel().tolist()], dtype=np.float64).reshape(x.shape)
+
+
+def _easing(scalar_function, array_function):
+    # Creates an easing function that accepts a number or a NumPy array. Numbers use scalar_function, which uses the
+    # math module, so the results are the same as they have always been. Arrays use array_function.
+    def fn(x):
+        if isinstance(x, (int, float)):
+            return scalar_function(x)
+        return array_function(np.asarray(x, dtype=np.float64))
+
+    fn.vectorised = True
+    return fn
 
 
 def ease_linear():
-    return lambda x: x
+    return _easing(lambda x: x, lambda x: x)
 
 
 def ease_in_harm():
-    return lambda x: 1 + math.sin(math.pi * (x / 2 - 0.5))
+    return _easing(lambda x: 1 + math.sin(math.pi * (x / 2 - 0.5)),
+                   lambda x: 1 + np.sin(np.pi * (x / 2 - 0.5)))
 
 
 def ease_out_harm():
-    return lambda x: math.sin(math.pi * x / 2)
+    return _easing(lambda x: math.sin(math.pi * x / 2),
+                   lambda x: np.sin(np.pi * x / 2))
 
 
 def ease_in_out_harm():
-    return lambda x: 0.5 + 0.5 * math.sin(math.pi * (x - 0.5))
+    return _easing(lambda x: 0.5 + 0.5 * math.sin(math.pi * (x - 0.5)),
+                   lambda x: 0.5 + 0.5 * np.sin(np.pi * (x - 0.5)))
 
 
 def ease_in_elastic():
-    return lambda x: math.sin(2.25 * 2 * math.pi * (x)) * pow(2, 10 * (x - 1))
+    return _easing(lambda x: math.sin(2.25 * 2 * math.pi * (x)) * pow(2, 10 * (x - 1)),
+                   lambda x: np.sin(2.25 * 2 * np.pi * x) * np.exp2(10 * (x - 1)))
 
 
 def ease_out_elastic():
-    return lambda x: 1 - math.sin(2.25 * 2 * math.pi * (1 - x)) * pow(2, -10 * x)
+    return _easing(lambda x: 1 - math.sin(2.25 * 2 * math.pi * (1 - x)) * pow(2, -10 * x),
+                   lambda x: 1 - np.sin(2.25 * 2 * np.pi * (1 - x)) * np.exp2(-10 * x))
 
 
 def ease_in_out_elastic():
@@ -382,11 +795,19 @@ def ease_in_out_elastic():
             f = (2 * x - 1)
             return 0.5 * (1 - math.sin(2.25 * 2 * math.pi * (1 - f)) * pow(2, -10 * f)) + 0.5
 
-    return fn
+    def array_fn(x):
+        f = 2 * x
+        first = 0.5 * (np.sin(2.25 * 2 * np.pi * f) * np.exp2(10 * (f - 1)))
+        f = 2 * x - 1
+        second = 0.5 * (1 - np.sin(2.25 * 2 * np.pi * (1 - f)) * np.exp2(-10 * f)) + 0.5
+        return np.where(x < 0.5, first, second)
+
+    return _easing(fn, array_fn)
 
 
 def ease_in_back():
-    return lambda x: x * x * x - x * math.sin(x * math.pi)
+    return _easing(lambda x: x * x * x - x * math.sin(x * math.pi),
+                   lambda x: x * x * x - x * np.sin(x * np.pi))
 
 
 def ease_out_back():
@@ -394,7 +815,11 @@ def ease_out_back():
         f = (1 - x)
         return 1 - (f * f * f - f * math.sin(f * math.pi))
 
-    return fn
+    def array_fn(x):
+        f = 1 - x
+        return 1 - (f * f * f - f * np.sin(f * np.pi))
+
+    return _easing(fn, array_fn)
 
 
 def ease_in_out_back():
@@ -406,7 +831,12 @@ def ease_in_out_back():
             f = (1 - (2 * x - 1))
             return 0.5 * (1 - (f * f * f - f * math.sin(f * math.pi))) + 0.5
 
-    return fn
+    def array_fn(x):
+        f = np.where(x < 0.5, 2 * x, 1 - (2 * x - 1))
+        curve = f * f * f - f * np.sin(f * np.pi)
+        return np.where(x < 0.5, 0.5 * curve, 0.5 * (1 - curve) + 0.5)
+
+    return _easing(fn, array_fn)
 
 
 # Basic bounce function used by the bounce easing functions.
@@ -422,12 +852,23 @@ def _bounce(x):
         return (54 / 5.0 * x * x) - (513 / 25.0 * x) + 268 / 25.0
 
 
+# Array version of _bounce
+def _bounce_array(x):
+    return np.select([x < 4 / 11.0, x < 8 / 11.0, x < 9 / 10.0],
+                     [(121 * x * x) / 16.0,
+                      (363 / 40.0 * x * x) - (99 / 10.0 * x) + 17 / 5.0,
+                      (4356 / 361.0 * x * x) - (35442 / 1805.0 * x) + 16061 / 1805.0],
+                     (54 / 5.0 * x * x) - (513 / 25.0 * x) + 268 / 25.0)
+
+
 def ease_in_bounce():
-    return lambda x: 1 - _bounce(1 - x)
+    return _easing(lambda x: 1 - _bounce(1 - x),
+                   lambda x: 1 - _bounce_array(1 - x))
 
 
 def ease_out_bounce():
-    return lambda x: _bounce(x)
+    return _easing(lambda x: _bounce(x),
+                   lambda x: _bounce_array(x))
 
 
 def ease_in_out_bounce():
@@ -437,5 +878,7 @@ def ease_in_out_bounce():
         else:
             return 0.5 * _bounce(x * 2 - 1) + 0.5
 
-    return fn
+    def array_fn(x):
+        return np.where(x < 0.5, 0.5 * (1 - _bounce_array(1 - x * 2)), 0.5 * _bounce_array(x * 2 - 1) + 0.5)
 
+    return _easing(fn, array_fn)
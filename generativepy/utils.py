@@ -6,6 +6,26 @@
 import sys
 import tempfile
 import os.path
+import numpy as np
+
+# Pycairo stores each pixel as a native endian 32 bit value, A in the top byte, then R, G, B.
+# This gives the byte offset of each channel within a pixel.
+_PYCAIRO_OFFSETS = {'B': 0, 'G': 1, 'R': 2, 'A': 3} if sys.byteorder == 'little' else {'A': 0, 'R': 1, 'G': 2, 'B': 3}
+
+# Lookup table to unpremultiply a colour value c with alpha a, indexed by (a << 8) | c. This uses the same rounding as
+# Cairo uses when it writes a PNG file.
+_UNPREMULTIPLY = np.array([(c*255 + a//2)//a if a else 0 for a in range(256) for c in range(256)], dtype=np.uint16)
+_UNPREMULTIPLY = np.minimum(_UNPREMULTIPLY, 255).astype(np.uint8)
+
+# Conversions are done in bands of rows containing roughly this many pixels, to limit the size of temporary arrays.
+_CHUNK_PIXELS = 1 << 16
+
+
+def _row_bands(height, width):
+    rows = max(1, _CHUNK_PIXELS // max(1, width))
+    for start in range(0, height, rows):
+        yield slice(start, min(start + rows, height))
+
 
 def correct_pycairo_byte_order(array, channels):
     """
@@ -13,6 +33,9 @@ def correct_pycairo_byte_order(array, channels):
     Convert a numpy array from BGR/BGRA ordering to RGB/RGBA.
     Conversion is performed in place
 
+    The swap is done in bands of rows, so only a small temporary array is needed. This function doesn't change the
+    alpha values, see `convert_pycairo_data` for a full conversion.
+
     Args:
         array: numpy array - the image data.
         channels: int - number of colour channels (3 or 4 for RGB or RGBA).
@@ -21,14 +44,117 @@ def correct_pycairo_byte_order(array, channels):
         Converted array (will be original array if no conversion needed).
     """
 
-    if sys.byteorder == 'little' and array.ndim == 3:
-        if channels==3:
-            array[:, :, [0, 1, 2]] = array[:, :, [2, 1, 0]]
-        elif channels==4:
-            array[:, :, [0, 1, 2, 3]] = array[:, :, [2, 1, 0, 3]]
+    if sys.byteorder == 'little' and array.ndim == 3 and channels in (3, 4):
+        for band in _row_bands(array.shape[0], array.shape[1]):
+            red = array[band, :, 2].copy()
+            array[band, :, 2] = array[band, :, 0]
+            array[band, :, 0] = red
 
     return array
 
+def convert_pycairo_data(array, channels, out=None, unpremultiply=None):
+    """
+    Convert bitmap data from a Pycairo image surface into a frame with RGB, RGBA or greyscale data.
+
+    Pycairo surface data always has 4 bytes per pixel, in native byte order. For `FORMAT_ARGB32` surfaces the colour
+    values are premultiplied by alpha, so they are divided by alpha to give normal RGBA values. For `FORMAT_RGB24`
+    surfaces the fourth byte is unused, and is ignored.
+
+    Greyscale values are calculated from the RGB values using the same weighting as PIL.
+
+    The conversion is done in bands of rows, directly into the output array, so only small temporary arrays are needed.
+
+    Args:
+        array: numpy array - the Pycairo surface data, uint8 with shape (height, width, 4).
+        channels: int - number of channels in the result, 1 for greyscale, 3 for RGB, 4 for RGBA.
+        out: numpy array - optional uint8 array of shape (height, width, channels) to hold the result. If None, a new
+                    array is created.
+        unpremultiply: bool - True if the colour values are premultiplied by alpha (ie an ARGB32 surface). Defaults to
+                    True if `channels` is 4, False otherwise.
+
+    Returns:
+        The output array.
+    """
+
+    if array.ndim != 3 or array.shape[2] != 4:
+        raise ValueError('array must have shape (height, width, 4)')
+    if channels not in (1, 3, 4):
+        raise ValueError('channels must be 1, 3 or 4')
+
+    height, width = array.shape[:2]
+    if out is None:
+        out = np.empty((height, width, channels), dtype=np.uint8)
+    elif out.shape != (height, width, channels):
+        raise ValueError('out must have shape (height, width, channels)')
+
+    if unpremultiply is None:
+        unpremultiply = channels == 4
+
+    r = _PYCAIRO_OFFSETS['R']
+    g = _PYCAIRO_OFFSETS['G']
+    b = _PYCAIRO_OFFSETS['B']
+    a = _PYCAIRO_OFFSETS['A']
+
+    for band in _row_bands(height, width):
+        data = array[band]
+        alpha = data[:, :, a]
+        if unpremultiply and not np.all(alpha == 255):
+            index = alpha.astype(np.uint16)
+            index <<= 8
+            rgb = [_UNPREMULTIPLY[index | data[:, :, offset]] for offset in (r, g, b)]
+        else:
+            rgb = [data[:, :, r], data[:, :, g], data[:, :, b]]
+
+        target = out[band]
+        if channels == 1:
+            grey = rgb[0].astype(np.uint32)
+            grey *= 19595
+            grey += rgb[1].astype(np.uint32) * 38470
+            grey += rgb[2].astype(np.uint32) * 7471
+            grey += 0x8000
+            grey >>= 16
+            target[:, :, 0] = grey
+        else:
+            for i in range(3):
+                target[:, :, i] = rgb[i]
+            if channels == 4:
+                target[:, :, 3] = alpha
+
+    return out
+
+def pycairo_data_view(array, layout='BGRA'):
+    """
+    Create a view of Pycairo surface data with the channels in a particular order, without copying any data.
+
+    This is only possible if the requested channels are equally spaced within each pixel. On a little endian machine
+    the layouts 'BGRA', 'BGR', 'RGB' and any single channel are available, and on a big endian machine 'ARGB', 'RGB',
+    'BGR' and any single channel. 'RGB' gives a strided view that can be passed to any consumer that accepts a numpy
+    array, such as PIL or MoviePy.
+
+    Note that the view shares memory with the surface, so it will change if the surface is drawn on again. Colour values
+    for an ARGB32 surface are premultiplied by alpha.
+
+    Args:
+        array: numpy array - the Pycairo surface data, uint8 with shape (height, width, 4).
+        layout: str - the required channel order, for example 'BGRA' or 'RGB'.
+
+    Returns:
+        A numpy array view of shape (height, width, len(layout)).
+    """
+
+    if array.ndim != 3 or array.shape[2] != 4:
+        raise ValueError('array must have shape (height, width, 4)')
+    try:
+        offsets = [_PYCAIRO_OFFSETS[c] for c in layout.upper()]
+    except KeyError as e:
+        raise ValueError('layout must only contain the characters R, G, B and A') from e
+
+    step = offsets[1] - offsets[0] if len(offsets) > 1 else 1
+    if step == 0 or any(b - a != step for a, b in zip(offsets, offsets[1:])):
+        raise ValueError('layout ' + layout + ' is not available as a view on this machine')
+    stop = offsets[-1] + step
+    return array[:, :, offsets[0]:stop if stop >= 0 else None:step]
+
 def temp_file(*names):
     """
     Create a temporary file name path within the system temp folder.
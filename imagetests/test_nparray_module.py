@@ -130,8 +130,8 @@ class TestNparrayModule(unittest.TestCase):
         def creator(file):
             out = np.full((300, 600, 3), 128, dtype=np.uint)
             out[25:100, 50:550] = [0, 0, 0]
-            frame1 = make_image_frame(draw1, 500, 400)
-            frame2 = make_image_frame(draw2, 500, 400)
+            frame1 = make_image_frame(draw1, 500, 400, channels=4)
+            frame2 = make_image_frame(draw2, 500, 400, channels=4)
             frame = overlay_nparrays(frame1, frame2)
             save_frame(file, frame)
 
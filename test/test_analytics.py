@@ -0,0 +1,69 @@
+import contextlib
+import io
+import pickle
+import unittest
+import numpy as np
+from generativepy.analytics import Stats, print_stats
+from generativepy.utils import temp_file
+
+
+class TestStats(unittest.TestCase):
+
+    def setUp(self):
+        self.data = np.random.default_rng(0).normal(10, 3, (300, 200))
+
+    def test_small_array_exact(self):
+        stats = Stats().update(self.data)
+        self.assertEqual(stats.count, self.data.size)
+        self.assertEqual(stats.min, np.min(self.data))
+        self.assertEqual(stats.max, np.max(self.data))
+        self.assertAlmostEqual(stats.mean, np.mean(self.data))
+        self.assertAlmostEqual(stats.variance, np.var(self.data))
+        self.assertEqual(stats.median, np.median(self.data))
+
+    def test_sampled_quantiles(self):
+        stats = Stats(sample_size=5000, seed=1).update(self.data)
+        self.assertAlmostEqual(stats.median, np.median(self.data), delta=0.2)
+        low, high = stats.quantile([0.1, 0.9])
+        self.assertAlmostEqual(low, np.quantile(self.data, 0.1), delta=0.3)
+        self.assertAlmostEqual(high, np.quantile(self.data, 0.9), delta=0.3)
+
+    def test_frames_and_merge(self):
+        frames = [self.data[i:i + 50] for i in range(0, 300, 50)]
+        first = Stats(seed=1).update_frames(frames[:2])
+        second = pickle.loads(pickle.dumps(Stats(seed=2).update_frames(frames[2:])))
+        stats = first.merge(second)
+        self.assertEqual(stats.count, self.data.size)
+        self.assertAlmostEqual(stats.mean, np.mean(self.data))
+        self.assertAlmostEqual(stats.std, np.std(self.data))
+        self.assertEqual(stats.median, np.median(self.data))
+
+    def test_memmap_and_nan(self):
+        filename = temp_file('test_stats.npy')
+        np.save(filename, np.array([[1, np.nan, 3], [4, 5, np.nan]]))
+        stats = Stats().update(np.load(filename, mmap_mode='r'))
+        self.assertEqual(stats.as_dict()['count'], 4)
+        self.assertEqual(stats.max, 5)
+        self.assertEqual(stats.mean, 3.25)
+
+    def test_empty(self):
+        stats = Stats()
+        self.assertIsNone(stats.median)
+        self.assertIsNone(stats.variance)
+        self.assertIsNone(stats.as_dict()['mean'])
+
+    def test_print_stats_median(self):
+        data = np.arange(100001)[::-1]
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            print_stats(data)
+        self.assertIn('Median: 50000.0\n', out.getvalue())
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            print_stats(data, approximate_median=True)
+        self.assertIn('Median (approx.):', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from generativepy.bitmap import Scaler
+from generativepy.nparray import make_nparray_data_grid
+
+
+class TestScaler(unittest.TestCase):
+
+    def setUp(self):
+        self.scaler = Scaler(7, 5, width=3, startx=-2, starty=-1.5)
+
+    def test_device_to_user_grid(self):
+        x, y = self.scaler.device_to_user_grid()
+        self.assertEqual(x.shape, (5, 7))
+        self.assertEqual(y.shape, (5, 7))
+        for py in range(5):
+            for px in range(7):
+                self.assertEqual((x[py, px], y[py, px]), self.scaler.device_to_user(px, py))
+
+    def test_device_to_user_grid_sparse(self):
+        x, y = self.scaler.device_to_user_grid(sparse=True)
+        self.assertEqual(x.shape, (1, 7))
+        self.assertEqual(y.shape, (5, 1))
+
+    def test_device_to_user_grid_complex(self):
+        grid = self.scaler.device_to_user_grid(complex_plane=True)
+        self.assertEqual(grid.shape, (5, 7))
+        self.assertEqual(grid[3, 4], complex(*self.scaler.device_to_user(4, 3)))
+
+    def test_device_to_user_grid_rows(self):
+        x, y = self.scaler.device_to_user_grid(rows=(2, 4))
+        self.assertEqual(x.shape, (2, 7))
+        self.assertEqual((x[1, 5], y[1, 5]), self.scaler.device_to_user(5, 3))
+        grid = self.scaler.device_to_user_grid(complex_plane=True, rows=(4, 5))
+        self.assertEqual(grid[0, 2], complex(*self.scaler.device_to_user(2, 4)))
+        with self.assertRaises(ValueError):
+            self.scaler.device_to_user_grid(rows=(3, 6))
+
+    def test_user_to_device_array(self):
+        user_x = np.array([-2, -1.3, 0, 0.99, -2.5])
+        user_y = np.array([-1.5, 0.2, 0, 0.5, -1.9])
+        device_x, device_y = self.scaler.user_to_device_array(user_x, user_y)
+        for i in range(len(user_x)):
+            self.assertEqual((device_x[i], device_y[i]), self.scaler.user_to_device(user_x[i], user_y[i]))
+
+    def test_make_nparray_data_grid(self):
+        def paint(array, grid, frame_no, frame_count):
+            array[..., 0] = np.abs(grid) > 1
+
+        data = make_nparray_data_grid(paint, self.scaler)
+        self.assertEqual(data.shape, (5, 7, 1))
+        self.assertEqual(data[0, 0, 0], 1)
+        self.assertEqual(data[2, 4, 0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import shutil
+import unittest
+import numpy as np
+from generativepy.cache import RenderCache
+from generativepy.bitmap import make_bitmap_frames
+from generativepy.nparray import make_nparray_frames
+from generativepy.utils import temp_file
+
+# Records the frames that were actually painted. This is a global so that it isn't part of the paint function's closure.
+calls = []
+
+
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_file('test_render_cache')
+        shutil.rmtree(self.folder, ignore_errors=True)
+        calls.clear()
+
+    def make_paint(self, value):
+        def paint(array, pixel_width, pixel_height, frame_no, frame_count):
+            calls.append(frame_no)
+            array[...] = value + frame_no
+
+        return paint
+
+    def test_frames_are_reused(self):
+        cache = RenderCache(self.folder)
+        paint = self.make_paint(10)
+        first = list(make_nparray_frames(paint, 4, 3, 5, cache=cache))
+        second = list(make_nparray_frames(paint, 4, 3, 5, cache=cache))
+        self.assertEqual(calls, [0, 1, 2, 3, 4])
+        for a, b in zip(first, second):
+            self.assertTrue(np.array_equal(a, b))
+            self.assertEqual(b.dtype, np.uint8)
+
+    def test_key_depends_on_closure_and_size(self):
+        cache = RenderCache(self.folder)
+        list(make_nparray_frames(self.make_paint(10), 4, 3, 2, cache=cache))
+        frames = list(make_nparray_frames(self.make_paint(20), 4, 3, 2, cache=cache))
+        list(make_nparray_frames(self.make_paint(20), 5, 3, 2, cache=cache))
+        self.assertEqual(calls, [0, 1, 0, 1, 0, 1])
+        self.assertEqual(frames[1][0, 0, 0], 21)
+
+    def test_key_depends_on_config(self):
+        paint = self.make_paint(10)
+        list(make_nparray_frames(paint, 4, 3, 2, cache=RenderCache(self.folder, config=1)))
+        list(make_nparray_frames(paint, 4, 3, 2, cache=RenderCache(self.folder, config=2)))
+        list(make_nparray_frames(paint, 4, 3, 2, cache=RenderCache(self.folder, config=1)))
+        self.assertEqual(calls, [0, 1, 0, 1])
+
+    def test_bitmap_frames(self):
+        cache = RenderCache(self.folder)
+
+        def paint(image, pixel_width, pixel_height, frame_no, frame_count):
+            calls.append(frame_no)
+            image.putpixel((1, 1), (frame_no, 0, 0))
+
+        first = list(make_bitmap_frames(paint, 4, 3, 3, cache=cache))
+        second = list(make_bitmap_frames(paint, 4, 3, 3, cache=cache))
+        self.assertEqual(calls, [0, 1, 2])
+        self.assertEqual(second[2][1, 1, 0], 2)
+        self.assertTrue(np.array_equal(first[2], second[2]))
+
+    def test_invalidate_and_clear(self):
+        cache = RenderCache(self.folder)
+        paint = self.make_paint(10)
+        list(make_nparray_frames(paint, 4, 3, 2, cache=cache))
+        cache.invalidate(paint)
+        list(make_nparray_frames(paint, 4, 3, 2, cache=cache))
+        cache.clear()
+        self.assertEqual(cache.size(), 0)
+        list(make_nparray_frames(paint, 4, 3, 2, cache=cache))
+        self.assertEqual(calls, [0, 1, 0, 1, 0, 1])
+
+    def test_eviction(self):
+        cache = RenderCache(self.folder)
+        key = cache.function_key(self.make_paint(0))
+        noise = np.random.default_rng(0).integers(0, 256, (50, 50, 3), dtype=np.uint8)
+        cache.put(key, 'a', noise)
+        os.utime(cache._path(key, 'a'), (0, 0))
+        cache.max_size = int(cache.size()*1.5)
+        cache.put(key, 'b', noise)
+        self.assertIsNone(cache.get(key, 'a'))
+        self.assertTrue(np.array_equal(cache.get(key, 'b'), noise))
+
+
+    def test_recursive_closures(self):
+        def paint(array, pixel_width, pixel_height, frame_no, frame_count):
+            calls.append(frame_no)
+            if frame_no < 0:
+                paint(array, pixel_width, pixel_height, frame_no + 1, frame_count)
+                other(frame_no)
+
+        def other(n):
+            return paint if n else other
+
+        cache = RenderCache(self.folder)
+        self.assertEqual(cache.function_key(paint), cache.function_key(paint))
+        list(make_nparray_frames(paint, 4, 3, 2, cache=cache))
+        list(make_nparray_frames(paint, 4, 3, 2, cache=cache))
+        self.assertEqual(calls, [0, 1])
+
+    def test_size_after_replace(self):
+        cache = RenderCache(self.folder)
+        key = cache.function_key(self.make_paint(0))
+        noise = np.random.default_rng(0).integers(0, 256, (50, 50, 3), dtype=np.uint8)
+        cache.put(key, 'a', noise)
+        cache.put(key, 'b', noise)
+        cache.put(key, 'a', noise)
+        self.assertEqual(cache._size, cache.size())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
+import colorsys
 import unittest
-from generativepy.color import Color, make_colormap
+import numpy as np
+from generativepy.color import Color, ColorArray, make_colormap, make_colormap_array, rgb_to_hsl, hsl_to_rgb, rgb_to_hsv, hsv_to_rgb
 
 
 class TestColour(unittest.TestCase):
@@ -300,5 +302,112 @@ class TestColour(unittest.TestCase):
         self.assertEqual(color_str,
                          'rgba(0, 0, 0, 1) rgba(0.25, 0.25, 0.25, 1) rgba(0.5, 0.5, 0.5, 1) rgba(0.75, 0.75, 0.75, 1) rgba(1, 1, 1, 1) rgba(1, 1, 1, 1) rgba(0.875, 1, 1, 1) rgba(0.75, 1, 1, 1) rgba(0.625, 1, 1, 1) rgba(0.5, 1, 1, 1)')
 
+    def test_make_colormap_array(self):
+        colors = [Color(0), Color('teal', 0.5), Color(1, 0.5, 0.25)]
+        array = make_colormap_array(9, colors, [2, 1])
+        self.assertEqual(array.shape, (9, 4))
+        self.assertEqual(array.tolist(), [list(c.rgba) for c in make_colormap(9, colors, [2, 1])])
+
+
+class TestColorArray(unittest.TestCase):
+
+    def setUp(self):
+        self.colors = [Color(1, 0.5, 0.25), Color('teal', 0.5), Color(0.2), Color.of_hsl(0.9, 0.3, 0.7)]
+        self.array = ColorArray(self.colors)
+
+    def assertColorsEqual(self, array, colors):
+        self.assertEqual(len(array), len(colors))
+        for a, b in zip(array, colors):
+            self.assertTrue(np.allclose(a.rgba, b.rgba, atol=1e-6), (a, b))
+
+    def test_create(self):
+        self.assertEqual(self.array.rgba.shape, (4, 4))
+        self.assertEqual(self.array.rgba.dtype, np.float32)
+        self.assertColorsEqual(self.array, self.colors)
+        rgb = ColorArray([[2, 0.5, -1], [0, 0, 0]])
+        self.assertColorsEqual(rgb, [Color(1, 0.5, 0), Color(0)])
+        self.assertIsInstance(self.array[1], Color)
+        self.assertColorsEqual(self.array[1:3], self.colors[1:3])
+        with self.assertRaises(ValueError):
+            ColorArray([[0, 0]])
+
+    def test_create_empty(self):
+        empty = ColorArray([])
+        self.assertEqual(empty.rgba.shape, (0, 4))
+        self.assertEqual(empty.rgba.dtype, np.float32)
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(empty.as_rgba_bytes().shape, (0, 4))
+        self.assertEqual(len(empty.with_l_factor(0.5)), 0)
+        self.assertEqual(ColorArray(np.zeros((0, 3))).rgba.shape, (0, 4))
+
+    def test_hsl(self):
+        self.assertTrue(np.allclose(self.array.h, [c.h for c in self.colors], atol=1e-6))
+        self.assertTrue(np.allclose(self.array.s, [c.s for c in self.colors], atol=1e-6))
+        self.assertTrue(np.allclose(self.array.l, [c.l for c in self.colors], atol=1e-6))
+        self.assertColorsEqual(ColorArray.of_hsl([0.1, 0.6], 0.5, 0.4, [1, 0.5]),
+                               [Color.of_hsl(0.1, 0.5, 0.4), Color.of_hsla(0.6, 0.5, 0.4, 0.5)])
+
+    def test_with(self):
+        self.assertColorsEqual(self.array.with_l_factor(0.5), [c.with_l_factor(0.5) for c in self.colors])
+        self.assertColorsEqual(self.array.with_h(0.3), [c.with_h(0.3) for c in self.colors])
+        self.assertColorsEqual(self.array.with_s_factor(1.5), [c.with_s_factor(1.5) for c in self.colors])
+        self.assertColorsEqual(self.array.with_a([0, 0.1, 0.2, 0.3]),
+                               [c.with_a(a) for c, a in zip(self.colors, [0, 0.1, 0.2, 0.3])])
+
+    def test_lerp(self):
+        factors = [0, 0.25, 0.5, 1]
+        self.assertColorsEqual(self.array.lerp(Color('red'), factors),
+                               [c.lerp(Color('red'), f) for c, f in zip(self.colors, factors)])
+        reverse = ColorArray(self.colors[::-1])
+        self.assertColorsEqual(self.array.lerp(reverse, 0.4),
+                               [a.lerp(b, 0.4) for a, b in zip(self.colors, self.colors[::-1])])
+
+    def test_bytes(self):
+        array = ColorArray([Color(x/255) for x in range(256)])
+        self.assertEqual(array.as_rgb_bytes().tolist(), [list(Color(x/255).as_rgb_bytes()) for x in range(256)])
+        self.assertEqual(self.array.as_rgba_bytes().tolist(), [list(c.as_rgba_bytes()) for c in self.colors])
+
+class TestFrameConversion(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.frame = rng.random((6, 7, 3))
+        self.frame[0, :4] = [[0.5, 0.5, 0.5], [0, 0, 0], [1, 1, 1], [0, 1, 1]]
+
+    def test_rgb_to_hsl(self):
+        hsl = rgb_to_hsl(self.frame)
+        expected = [[colorsys.rgb_to_hls(*rgb) for rgb in row] for row in self.frame]
+        self.assertTrue(np.allclose(hsl, np.array(expected)[..., [0, 2, 1]]))
+        self.assertTrue(np.allclose(hsl_to_rgb(hsl), self.frame))
+
+    def test_rgb_to_hsv(self):
+        hsv = rgb_to_hsv(self.frame)
+        self.assertTrue(np.allclose(hsv, [[colorsys.rgb_to_hsv(*rgb) for rgb in row] for row in self.frame]))
+        self.assertTrue(np.allclose(hsv_to_rgb(hsv), self.frame))
+        self.assertTrue(np.allclose(hsv_to_rgb(np.array([1.25, 1, 1])), colorsys.hsv_to_rgb(0.25, 1, 1)))
+
+    def test_uint8(self):
+        frame = np.dstack([(self.frame*255).astype(np.uint8), np.full((6, 7), 77, dtype=np.uint8)])
+        hsl = rgb_to_hsl(frame, out=np.empty(frame.shape, dtype=np.float32))
+        self.assertTrue(np.allclose(hsl[..., :3], rgb_to_hsl(frame[..., :3]/255), atol=1e-6))
+        self.assertTrue(np.allclose(hsl[..., 3], 77/255))
+        self.assertTrue(np.array_equal(hsl_to_rgb(hsl, out=np.empty_like(frame)), frame))
+        hsl = rgb_to_hsl(frame)
+        self.assertEqual(hsl.dtype, np.uint8)
+        self.assertTrue(np.array_equal(hsl[0, 3], [128, 255, 128, 77]))
+
+    def test_in_place(self):
+        frame = self.frame.copy()
+        self.assertIs(rgb_to_hsl(frame, out=frame), frame)
+        self.assertTrue(np.allclose(frame, rgb_to_hsl(self.frame)))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            rgb_to_hsl(np.zeros((2, 2, 2)))
+        with self.assertRaises(ValueError):
+            rgb_to_hsl(np.zeros((2, 2, 3), dtype=np.int32))
+        with self.assertRaises(ValueError):
+            rgb_to_hsl(self.frame, out=np.zeros((2, 2, 3)))
+
 if __name__ == '__main__':
     unittest.main()
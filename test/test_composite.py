@@ -0,0 +1,89 @@
+import unittest
+from fractions import Fraction
+import numpy as np
+from generativepy.composite import composite
+from generativepy.nparray import overlay_nparrays
+
+
+def reference_pixel(backdrop, source, mode):
+    # Unscaled W3C formulas using exact fractions, rounding half up
+    ab, a_s = Fraction(int(backdrop[3]), 255), Fraction(int(source[3]), 255)
+    alpha = a_s + ab*(1 - a_s)
+    result = []
+    for cb, cs in zip(backdrop[:3], source[:3]):
+        cb, cs = Fraction(int(cb), 255), Fraction(int(cs), 255)
+        if mode == 'over':
+            blended = cs
+        elif mode == 'add':
+            blended = min(cb + cs, 1)
+        elif mode == 'multiply':
+            blended = cb*cs
+        else:
+            blended = cb + cs - cb*cs
+        mixed = (1 - ab)*cs + ab*blended
+        color = (a_s*mixed + ab*(1 - a_s)*cb) / alpha if alpha else 0
+        result.append(int(color*255 + Fraction(1, 2)))
+    result.append(int(alpha*255 + Fraction(1, 2)))
+    return result
+
+
+class TestComposite(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.layers = [rng.integers(0, 256, (7, 5, 4), dtype=np.uint8) for _ in range(3)]
+        self.layers[1][0, 0, 3] = 0
+        self.layers[1][0, 1, 3] = 255
+        self.layers[0][1, 0, 3] = 0
+        self.layers[1][1, 0, 3] = 0
+
+    def test_modes_exact(self):
+        backdrop, source = self.layers[:2]
+        for mode in ('over', 'add', 'multiply', 'screen'):
+            result = composite([backdrop, source], mode, chunk_rows=2)
+            for y in range(7):
+                for x in range(5):
+                    self.assertEqual(list(result[y, x]), reference_pixel(backdrop[y, x], source[y, x], mode),
+                                     (mode, y, x))
+
+    def test_opaque(self):
+        opaque = self.layers[1][:, :, :3]
+        self.assertTrue(np.array_equal(composite([self.layers[0], opaque]), np.dstack([opaque, np.full((7, 5), 255)])))
+        multiply = composite([self.layers[0][:, :, :3], opaque], 'multiply')
+        expected = (self.layers[0][:, :, :3].astype(int)*opaque + 127) // 255
+        self.assertTrue(np.array_equal(multiply, expected))
+
+    def test_layers_match_pairs(self):
+        pairs = composite([composite(self.layers[:2], 'screen'), self.layers[2]], 'over')
+        self.assertTrue(np.array_equal(composite(self.layers, ['screen', 'over'], threads=2, chunk_rows=3), pairs))
+
+    def test_in_place(self):
+        expected = composite(self.layers)
+        bottom = self.layers[0].copy()
+        self.assertIs(composite([bottom] + self.layers[1:], out=bottom), bottom)
+        self.assertTrue(np.array_equal(bottom, expected))
+
+    def test_key(self):
+        top = self.layers[1].copy()
+        top[2:4, 1:3, :3] = 255
+        result = composite([self.layers[0], top], 'key')
+        self.assertTrue(np.array_equal(result[2:4, 1:3], self.layers[0][2:4, 1:3]))
+        self.assertTrue(np.array_equal(result[4:], top[4:]))
+        self.assertTrue(np.array_equal(result, overlay_nparrays(self.layers[0], top)))
+        alpha_key = composite([self.layers[0], self.layers[1]], 'key', key=None)
+        self.assertTrue(np.array_equal(alpha_key[0, 0], self.layers[0][0, 0]))
+        self.assertTrue(np.array_equal(alpha_key[0, 1], self.layers[1][0, 1]))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            composite([self.layers[0], self.layers[1][1:]])
+        with self.assertRaises(ValueError):
+            composite(self.layers, 'darken')
+        with self.assertRaises(ValueError):
+            composite(self.layers, ['over'])
+        with self.assertRaises(ValueError):
+            composite([self.layers[0].astype(np.int64)])
+
+
+if __name__ == '__main__':
+    unittest.main()
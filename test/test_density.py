@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+from generativepy.bitmap import Scaler
+from generativepy.density import accumulate_density, make_density_paint, random_seeds
+from generativepy.nparray import make_nparray_data
+
+
+def tinkerbell(x, y):
+    return x*x - y*y + 0.9*x - 0.6013*y, 2*x*y + 2.0*x + 0.5*y
+
+
+class TestDensity(unittest.TestCase):
+
+    def setUp(self):
+        self.scaler = Scaler(30, 20, width=3, startx=-2, starty=-2)
+
+    def scalar_counts(self, seeds, iterations, discard=0):
+        counts = np.zeros((20, 30), dtype=np.int64)
+        for x, y in zip(*seeds):
+            for i in range(discard + iterations):
+                x, y = tinkerbell(x, y)
+                px, py = self.scaler.user_to_device(x, y)
+                if i >= discard and 0 <= px < 30 and 0 <= py < 20:
+                    counts[py, px] += 1
+        return counts
+
+    def test_single_orbit(self):
+        counts = accumulate_density(tinkerbell, (0.01, 0.01), 1000, self.scaler)
+        self.assertTrue(np.array_equal(counts, self.scalar_counts(([0.01], [0.01]), 1000)))
+
+    def test_many_seeds(self):
+        seeds = random_seeds(50, -0.1, -0.1, 0.2, 0.2, seed=1)
+        counts = accumulate_density(tinkerbell, seeds, 200, self.scaler, discard=10, tasks=3)
+        self.assertTrue(np.array_equal(counts, self.scalar_counts(seeds, 200, 10)))
+
+    def test_workers(self):
+        seeds = random_seeds(50, -0.1, -0.1, 0.2, 0.2, seed=1)
+        counts = accumulate_density(tinkerbell, seeds, 200, self.scaler, workers=2)
+        self.assertTrue(np.array_equal(counts, accumulate_density(tinkerbell, seeds, 200, self.scaler)))
+
+    def test_diverging_seeds_ignored(self):
+        counts = accumulate_density(tinkerbell, ([5.0], [5.0]), 100, self.scaler)
+        self.assertEqual(np.sum(counts), 0)
+
+    def test_paint(self):
+        paint = make_density_paint(tinkerbell, (0.01, 0.01), 1000, width=3, startx=-2, starty=-2)
+        data = make_nparray_data(paint, 30, 20, channels=1)
+        self.assertEqual(data.shape, (20, 30, 1))
+        self.assertTrue(np.array_equal(data[:, :, 0], self.scalar_counts(([0.01], [0.01]), 1000)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+from generativepy.bitmap import Scaler, make_bitmap_frame
+from generativepy.draft import Draft, set_draft, get_draft
+from generativepy.nparray import make_nparray_frame, make_nparray_frames, make_nparray_frame_source
+from generativepy.povray import make_povray_frames
+
+calls = []
+
+
+def paint(array, pixel_width, pixel_height, frame_no, frame_count):
+    calls.append((pixel_width, pixel_height, frame_no))
+    # Fill the left half of the image, in user coordinates
+    scaler = Scaler(pixel_width, pixel_height, width=2, startx=-1)
+    array[:, :scaler.user_to_device(0, 0)[0]] = frame_no
+
+
+def paint_bitmap(image, pixel_width, pixel_height, frame_no, frame_count):
+    calls.append((pixel_width, pixel_height, frame_no))
+
+
+class Scene:
+
+    def render(self, width, height, quality=None, antialiasing=None):
+        calls.append((width, height, quality, antialiasing))
+        return np.zeros((height, width, 3), dtype=np.uint8)
+
+
+def draw_scene(pixel_width, pixel_height, frame_no, frame_count):
+    return Scene()
+
+
+class TestDraft(unittest.TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def tearDown(self):
+        set_draft(False)
+
+    def test_settings(self):
+        self.assertIsNone(get_draft())
+        set_draft(0.5)
+        self.assertEqual(get_draft().scale, 0.5)
+        self.assertIsNone(get_draft(False))
+        self.assertEqual(get_draft(True).scale, 0.25)
+        set_draft(None)
+        self.assertIsNone(get_draft())
+        with self.assertRaises(ValueError):
+            Draft(scale=2)
+        with self.assertRaises(ValueError):
+            Draft(stride=0)
+        with self.assertRaises(ValueError):
+            set_draft('fast')
+
+    def test_frame(self):
+        frame = make_nparray_frame(paint, 40, 20, draft=True)
+        self.assertEqual(calls, [(10, 5, 0)])
+        self.assertEqual(frame.shape, (20, 40, 3))
+        self.assertTrue(np.array_equal(frame, make_nparray_frame(paint, 40, 20)))
+        small = make_nparray_frame(paint, 40, 20, draft=Draft(upscale=False))
+        self.assertEqual(small.shape, (5, 10, 3))
+
+    def test_global(self):
+        set_draft(Draft(scale=0.5))
+        make_bitmap_frame(paint_bitmap, 40, 20)
+        make_bitmap_frame(paint_bitmap, 40, 20, draft=False)
+        self.assertEqual(calls, [(20, 10, 0), (40, 20, 0)])
+
+    def test_stride(self):
+        frames = list(make_nparray_frames(paint, 8, 4, 7, draft=Draft(scale=0.5, stride=3)))
+        self.assertEqual(calls, [(4, 2, 0), (4, 2, 3), (4, 2, 6)])
+        self.assertEqual([frame[0, 0, 0] for frame in frames], [0, 0, 0, 3, 3, 3, 6])
+        self.assertEqual(frames[0].shape, (4, 8, 3))
+
+    def test_frame_source(self):
+        source = make_nparray_frame_source(paint, 8, 4, 7, draft=Draft(stride=2))
+        self.assertEqual([source[i][0, 0, 0] for i in (5, 4, 6, 1)], [4, 4, 6, 0])
+        self.assertEqual([call[2] for call in calls], [4, 6, 0])
+
+    def test_povray(self):
+        frames = list(make_povray_frames(draw_scene, 40, 20, 2, draft=Draft(quality=2)))
+        self.assertEqual(calls, [(10, 5, 2, None)]*2)
+        self.assertEqual(frames[0].shape, (20, 40, 4))
+        self.assertEqual(frames[0].dtype, np.uint8)
+        frames = list(make_povray_frames(draw_scene, 40, 20, 1))
+        self.assertEqual(frames[0].shape, (20, 40, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+from generativepy.bitmap import Scaler
+from generativepy.fractal import mandelbrot, julia, burning_ship, newton, zoom_frames
+
+
+def scalar_counts(scaler, max_count, z_start, c_value, ship=False):
+    counts = np.zeros((scaler.pixel_height, scaler.pixel_width), dtype=np.int64)
+    for py in range(scaler.pixel_height):
+        for px in range(scaler.pixel_width):
+            x, y = z_start(*scaler.device_to_user(px, py))
+            c1, c2 = c_value(*scaler.device_to_user(px, py))
+            for i in range(max_count):
+                xy = abs(x*y) if ship else x*y
+                x, y = x*x - y*y + c1, 2*xy + c2
+                if x*x + y*y > 4:
+                    counts[py, px] = i + 1
+                    break
+    return counts
+
+
+class TestFractal(unittest.TestCase):
+
+    def setUp(self):
+        self.scaler = Scaler(23, 17, width=3, startx=-2, starty=-1.1)
+
+    def test_mandelbrot(self):
+        expected = scalar_counts(self.scaler, 50, lambda x, y: (0, 0), lambda x, y: (x, y))
+        self.assertTrue(np.array_equal(mandelbrot(self.scaler, 50, band_rows=5), expected))
+
+    def test_julia(self):
+        expected = scalar_counts(self.scaler, 50, lambda x, y: (x, y), lambda x, y: (-0.79, 0.15))
+        self.assertTrue(np.array_equal(julia(self.scaler, complex(-0.79, 0.15), 50), expected))
+
+    def test_burning_ship(self):
+        expected = scalar_counts(self.scaler, 50, lambda x, y: (0, 0), lambda x, y: (x, y), ship=True)
+        self.assertTrue(np.array_equal(burning_ship(self.scaler, 50), expected))
+
+    def test_workers(self):
+        self.assertTrue(np.array_equal(mandelbrot(self.scaler, 50, workers=2), mandelbrot(self.scaler, 50)))
+
+    def test_smooth(self):
+        counts = mandelbrot(self.scaler, 50, escape_radius=100)
+        smooth = mandelbrot(self.scaler, 50, escape_radius=100, smooth=True)
+        self.assertEqual(smooth.dtype, np.float64)
+        escaped = counts > 0
+        self.assertTrue(np.all(smooth[escaped] <= counts[escaped]))
+        self.assertTrue(np.all(smooth[escaped] >= counts[escaped] - 1))
+        self.assertTrue(np.all(smooth[~escaped] == 0))
+
+    def test_newton(self):
+        scaler = Scaler(10, 10, width=3, startx=-1.5, starty=-1.5)
+        roots, counts = newton(scaler)
+        self.assertEqual(roots[5, 5], 0)
+        self.assertEqual(counts[5, 5], 0)
+        self.assertEqual(roots[5, 9], 3)
+        self.assertTrue(np.all((roots > 0) == (counts > 0)))
+
+    def test_zoom_frames(self):
+        colormap = np.array([[0, 0, 0]] + [[255, i, 0] for i in range(20)], dtype=np.uint8)
+        frames = list(zoom_frames(mandelbrot, -0.75+0.1j, 3, 0.03, 8, 6, 3, colormap=colormap, max_count=20))
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames[0].shape, (6, 8, 3))
+        self.assertEqual(frames[0].dtype, np.uint8)
+        counts = list(zoom_frames(mandelbrot, -0.75+0.1j, 3, 0.03, 8, 6, 3, max_count=20))
+        self.assertTrue(np.array_equal(frames[2], colormap[counts[2]]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+import numpy as np
+from generativepy.framestream import (FrameSource, concat, hold, crossfade, time_remap, resample, overlay,
+                                      map_frames)
+from generativepy.movie import create_videoclip
+from generativepy.nparray import make_nparray_frame_source
+
+
+def make_frames(values):
+    return [np.full((2, 3, 3), value, dtype=np.uint8) for value in values]
+
+
+def reused_frames(values):
+    # A stream that reuses a single array, like make_image_frames with buffers=1
+    frame = np.empty((2, 3, 3), dtype=np.uint8)
+    for value in values:
+        frame[...] = value
+        yield frame
+
+
+def invert(frame):
+    return 255 - frame
+
+
+def values(frames):
+    return [int(frame[0, 0, 0]) for frame in frames]
+
+
+class TestFrameStream(unittest.TestCase):
+
+    def test_concat_hold(self):
+        frames = hold(concat(make_frames([1, 2]), iter(make_frames([3]))), before=2, after=1)
+        self.assertEqual(values(frames), [1, 1, 1, 2, 3, 3])
+        with self.assertRaises(ValueError):
+            list(hold([], after=1))
+
+    def test_crossfade(self):
+        expected = [0, 0, 64, 128, 191, 255, 255]
+        self.assertEqual(values(crossfade(make_frames([0]*5), make_frames([255]*5), 3)), expected)
+        self.assertEqual(values(crossfade(iter(make_frames([0]*5)), make_frames([255]*5), 3)), expected)
+        self.assertEqual(values(crossfade(reused_frames([0]*5), make_frames([255]*5), 3)), expected)
+        self.assertEqual(values(crossfade(make_frames([0, 0]), make_frames([255, 255]), 0)), [0, 0, 255, 255])
+
+    def test_crossfade_no_transition(self):
+        frames1 = make_frames([1, 2])
+        frames = list(crossfade(iter(frames1), make_frames([3]), 0))
+        self.assertEqual(values(frames), [1, 2, 3])
+        self.assertIs(frames[0], frames1[0])
+
+    def test_crossfade_short_second_stream(self):
+        expected = [0, 0, 64, 0, 0]
+        self.assertEqual(values(crossfade(make_frames([0]*5), make_frames([255]), 3)), expected)
+        self.assertEqual(values(crossfade(reused_frames([0]*5), make_frames([255]), 3)), expected)
+        self.assertEqual(values(crossfade(make_frames([0]*3), [], 2)), [0, 0, 0])
+
+    def test_crossfade_buffers(self):
+        frames = list(crossfade(make_frames([0]*4), make_frames([255]*4), 3, buffers=2))
+        self.assertIs(frames[1], frames[3])
+        self.assertEqual(values(frames[1:2]), [191])
+
+    def test_time_remap(self):
+        source = list(range(0, 100, 10))
+        self.assertEqual(values(time_remap(make_frames(source), [9, 0, 2.5, 20])), [90, 0, 20, 90])
+        self.assertEqual(values(time_remap(iter(make_frames(source)), lambda i: i*i, 5)), [0, 10, 40, 90, 90])
+        self.assertEqual(values(time_remap(iter(make_frames(source)), lambda i: 3*i)), [0, 30, 60, 90])
+        with self.assertRaises(ValueError):
+            list(time_remap(iter(make_frames(source)), [5, 2]))
+
+    def test_time_remap_blend(self):
+        blended = time_remap(reused_frames(range(0, 100, 10)), [0.5, 1.25, 1, 8.5, 9.5], blend=True)
+        self.assertEqual(values(blended), [5, 13, 10, 85, 90])
+
+    def test_resample(self):
+        self.assertEqual(values(resample(make_frames(range(6)), 30, 60)), [0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5])
+        self.assertEqual(values(resample(iter(make_frames(range(6))), 60, 30)), [0, 2, 4])
+        self.assertEqual(values(resample(make_frames([0, 100]), 1, 2, count=4, blend=True)), [0, 50, 100, 100])
+        with self.assertRaises(ValueError):
+            resample(make_frames([0]), 0, 30)
+
+    def test_overlay(self):
+        lower = [np.full((2, 3, 4), (255, 0, 0, 255), dtype=np.uint8)]*2
+        upper = [np.full((2, 3, 4), (0, 0, 255, 0), dtype=np.uint8), np.full((2, 3, 4), 255, dtype=np.uint8)]
+        frames = list(overlay(lower, upper))
+        self.assertEqual(tuple(frames[0][0, 0]), (255, 0, 0, 255))
+        self.assertEqual(tuple(frames[1][0, 0]), (255, 255, 255, 255))
+        keyed = list(overlay(lower, upper, 'key'))
+        self.assertEqual(tuple(keyed[1][0, 0]), (255, 0, 0, 255))
+
+    def test_map_frames(self):
+        self.assertEqual(values(map_frames(invert, make_frames([0, 5]))), [255, 250])
+        self.assertEqual(values(map_frames(invert, reused_frames([0, 5, 10]), workers=2)), [255, 250, 245])
+
+
+class TestFrameSource(unittest.TestCase):
+
+    def setUp(self):
+        self.rendered = []
+
+    def render(self, frame_no):
+        self.rendered.append(frame_no)
+        return make_frames([frame_no*10])[0]
+
+    def test_random_access(self):
+        source = FrameSource(self.render, 10, cache_size=2)
+        self.assertEqual(len(source), 10)
+        self.assertEqual(values([source[3], source[-1], source[3], source[5], source[9], source[3]]),
+                         [30, 90, 30, 50, 90, 30])
+        self.assertEqual(self.rendered, [3, 9, 5, 9, 3])
+        with self.assertRaises(IndexError):
+            source[10]
+
+    def test_iterate_and_slice(self):
+        source = FrameSource(self.render, 10)
+        part = source[2:8:2]
+        self.assertEqual(len(part), 3)
+        self.assertEqual(values(part), [20, 40, 60])
+        self.assertEqual(values(part[::-1]), [60, 40, 20])
+        self.assertEqual(self.rendered, [2, 4, 6])
+        self.assertEqual(values(source)[-2:], [80, 90])
+
+    def test_streams(self):
+        source = FrameSource(self.render, 10, cache_size=0)
+        self.assertEqual(values(time_remap(source, [9, 1])), [90, 10])
+        self.assertEqual(values(crossfade(source, make_frames([0]), 1)), [0, 10, 20, 30, 40, 50, 60, 70, 80, 45])
+        self.assertEqual(self.rendered, [9, 1] + list(range(10)))
+
+    def test_nparray_frame_source(self):
+        def paint(array, pixel_width, pixel_height, frame_no, frame_count):
+            array[...] = frame_no
+
+        source = make_nparray_frame_source(paint, 3, 2, 5)
+        self.assertEqual(values([source[4], source[1]]), [4, 1])
+
+    def test_videoclip_seek(self):
+        clip = create_videoclip(FrameSource(self.render, 10), 1, 10)
+        self.assertEqual(values([clip.get_frame(0.55), clip.get_frame(0.15), clip.get_frame(5)]), [50, 10, 90])
+        self.assertNotIn(7, self.rendered)
+
+    def test_videoclip_sequential(self):
+        clip = create_videoclip((self.render(i) for i in range(10)), 1, 10)
+        self.assertEqual(values([clip.get_frame(0.35), clip.get_frame(0.75), clip.get_frame(2)]), [30, 70, 90])
+        with self.assertRaises(ValueError):
+            clip.get_frame(0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+import imageio_ffmpeg
+import numpy as np
+from generativepy.movie import FFmpegWriter, MovieBuilder, _write_scene
+from generativepy.utils import temp_file
+
+FFMPEG = imageio_ffmpeg.get_ffmpeg_exe()
+
+
+def make_frames(count, height=81, width=63, channels=4):
+    return [np.full((height, width, channels), 20*i, dtype=np.uint8) for i in range(count)]
+
+
+def frame_count(filename):
+    return imageio_ffmpeg.count_frames_and_secs(filename)[0]
+
+
+class RecordingWriter:
+
+    def __init__(self):
+        self.frames = []
+
+    def write(self, frame):
+        self.frames.append(frame)
+
+
+class TestFFmpegWriter(unittest.TestCase):
+
+    def test_write(self):
+        video_out = temp_file('test_ffmpeg_writer.mp4')
+        with FFmpegWriter(video_out, 24, ffmpeg=FFMPEG) as writer:
+            for frame in make_frames(12):
+                writer.write(frame)
+        self.assertEqual(writer.frame_count, 12)
+        self.assertEqual(frame_count(video_out), 12)
+
+    def test_size_mismatch(self):
+        with self.assertRaises(ValueError):
+            with FFmpegWriter(temp_file('test_ffmpeg_writer_size.mp4'), 24, ffmpeg=FFMPEG) as writer:
+                writer.write(make_frames(1)[0])
+                writer.write(make_frames(1, height=80)[0])
+
+    def test_write_scene_pads_short_source(self):
+        frames = make_frames(3)
+        writer = RecordingWriter()
+        _write_scene(writer, iter(frames), 5)
+        self.assertEqual(len(writer.frames), 5)
+        self.assertIs(writer.frames[4], frames[2])
+        writer = RecordingWriter()
+        _write_scene(writer, frames, 2)
+        self.assertEqual(writer.frames, frames[:2])
+        with self.assertRaises(ValueError):
+            _write_scene(RecordingWriter(), [], 1)
+
+
+class TestMovieBuilder(unittest.TestCase):
+
+    def test_ffmpeg_backend(self):
+        builder = MovieBuilder(10, ffmpeg=FFMPEG)
+        builder.add_scene((make_frames(4, channels=3), 0.5))
+        builder.add_scene((iter(make_frames(2, channels=3)), 0.3))
+        video_out = temp_file('test_movie_ffmpeg.mp4')
+        builder.make_movie(video_out, backend="ffmpeg")
+        self.assertEqual(frame_count(video_out), 8)
+
+
+    def test_invalid_backend(self):
+        builder = MovieBuilder(10, ffmpeg=FFMPEG)
+        builder.add_scene((make_frames(2, channels=3), 0.2))
+        with self.assertRaises(ValueError):
+            builder.make_movie(temp_file('test_movie_invalid.mp4'), backend="foo", segment_dir=temp_file('unused'))
+
+    def test_segments(self):
+        used = []
+
+        def scene(n, count):
+            used.append(n)
+            yield from make_frames(count, channels=3)
+
+        with tempfile.TemporaryDirectory() as segment_dir:
+            video_out = os.path.join(segment_dir, 'movie.mp4')
+            builder = MovieBuilder(10, ffmpeg=FFMPEG)
+            builder.add_scene((scene(0, 4), 0.4))
+            builder.add_scene((scene(1, 3), 0.5))
+            builder.make_movie(video_out, workers=2, segment_dir=segment_dir)
+            self.assertEqual(frame_count(video_out), 9)
+            self.assertEqual(len([name for name in os.listdir(segment_dir) if name.startswith('scene')]), 2)
+
+            # Rebuild a single scene, then join it with the existing segment of the other scene
+            builder.frame_sources = [scene(2, 4), scene(3, 6)]
+            builder.duration = [0.4, 0.6]
+            builder.make_movie(video_out, source=1, segment_dir=segment_dir)
+            self.assertEqual(frame_count(video_out), 6)
+            builder.make_movie(video_out, segment_dir=segment_dir, reuse_segments=True)
+            self.assertEqual(frame_count(video_out), 10)
+            self.assertEqual(used, [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import unittest
+import numpy as np
+from generativepy.color import Color, make_colormap
+from generativepy.nparray import (make_nparray_frame, make_nparray_frames, make_npcolormap, apply_npcolormap, apply_scaled_npcolormap, save_nparray,
+                                  load_nparray, load_nparray_metadata, NparrayStack)
+from generativepy.utils import temp_file
+
+
+def paint_bright(array, pixel_width, pixel_height, frame_no, frame_count):
+    array[:2] = 0
+    array[1:3] += 100*frame_no
+
+
+class TestNparrayFrames(unittest.TestCase):
+
+    def expected(self, frame_no):
+        expected = np.full((4, 5, 3), 255, dtype=np.int64)
+        expected[:2] = 0
+        expected[1:3] += 100*frame_no
+        return np.clip(expected, 0, 255).astype(np.uint8)
+
+    def test_frame(self):
+        frame = make_nparray_frame(paint_bright, 5, 4)
+        self.assertEqual(frame.dtype, np.uint8)
+        self.assertTrue(np.array_equal(frame, self.expected(0)))
+
+    def test_frame_dtype_clips(self):
+        def paint(array, pixel_width, pixel_height, frame_no, frame_count):
+            paint_bright(array, pixel_width, pixel_height, 2, 3)
+            array[3] = -5
+
+        frame = make_nparray_frame(paint, 5, 4, dtype=np.int32)
+        expected = self.expected(2)
+        expected[3] = 0
+        self.assertEqual(frame.dtype, np.uint8)
+        self.assertTrue(np.array_equal(frame, expected))
+
+    def test_frame_default_dtype_overflow(self):
+        # The default paint array can go past 255, and is clipped as before
+        def paint(array, pixel_width, pixel_height, frame_no, frame_count):
+            array[:] = 200
+            array[:2] += 100
+            array[3] = 300
+
+        expected = np.full((4, 5, 3), 200, dtype=np.uint8)
+        expected[:2] = 255
+        expected[3] = 255
+        self.assertTrue(np.array_equal(make_nparray_frame(paint, 5, 4), expected))
+        for frame in make_nparray_frames(paint, 5, 4, 2, buffers=1):
+            self.assertTrue(np.array_equal(frame, expected))
+
+    def test_frame_out(self):
+        out = np.zeros((4, 5, 3), dtype=np.uint8)
+        self.assertIs(make_nparray_frame(paint_bright, 5, 4, out=out), out)
+        with self.assertRaises(ValueError):
+            make_nparray_frame(paint_bright, 4, 4, out=out)
+
+    def test_frames(self):
+        frames = list(make_nparray_frames(paint_bright, 5, 4, 3, dtype=np.uint16))
+        for i, frame in enumerate(frames):
+            self.assertTrue(np.array_equal(frame, self.expected(i)))
+
+    def test_frames_buffers(self):
+        for dtype in (np.uint8, np.int64):
+            expected = list(make_nparray_frames(paint_bright, 5, 4, 3, dtype=dtype))
+            frames = []
+            for frame in make_nparray_frames(paint_bright, 5, 4, 3, dtype=dtype, buffers=2):
+                self.assertTrue(np.array_equal(frame, expected[len(frames)]))
+                frames.append(frame)
+            self.assertIs(frames[0], frames[2])
+            self.assertIsNot(frames[0], frames[1])
+
+    def test_frames_out(self):
+        out = np.zeros((4, 5, 3), dtype=np.uint8)
+        for frame in make_nparray_frames(paint_bright, 5, 4, 2, out=out):
+            self.assertIs(frame, out)
+        with self.assertRaises(ValueError):
+            list(make_nparray_frames(paint_bright, 5, 4, 2, out=out.astype(np.int64)))
+
+
+class TestNpcolormap(unittest.TestCase):
+
+    def test_matches_make_colormap(self):
+        colors = [Color(0), Color('red'), Color(0.2, 0.7, 0.3, 0.5), Color('steelblue'), Color(1)]
+        bands = [3, 0.5, 0, 7]
+        colormap = make_colormap(1000, colors, bands)
+        expected = np.array([color.as_rgba_bytes() for color in colormap], dtype=np.uint8)
+        self.assertTrue(np.array_equal(make_npcolormap(1000, colors, bands, channels=4), expected))
+        self.assertTrue(np.array_equal(make_npcolormap(1000, colors, bands), expected[:, :3]))
+
+    def test_float(self):
+        colormap = make_npcolormap(5, [Color(0), Color(1, 0.5, 0, 0)], channels=4, dtype=np.float32)
+        self.assertEqual(colormap.dtype, np.float32)
+        self.assertTrue(np.allclose(colormap[2], [0.5, 0.25, 0, 0.5]))
+
+    def test_hsl(self):
+        colormap = make_npcolormap(5, [Color('red'), Color('blue')], hsl=True)
+        # Red to blue the short way round the colour wheel passes through magenta
+        self.assertEqual(tuple(colormap[0]), (255, 0, 0))
+        self.assertEqual(tuple(colormap[2]), (254, 0, 255))
+        self.assertEqual(tuple(colormap[4]), (0, 0, 255))
+
+    def test_single_entry_band(self):
+        colormap = make_npcolormap(3, [Color(0), Color(1), Color(0)])
+        self.assertEqual(colormap.shape, (3, 3))
+
+    def test_invalid_channels(self):
+        with self.assertRaises(ValueError):
+            make_npcolormap(10, [Color(0), Color(1)], channels=1)
+
+
+class TestApplyNpcolormap(unittest.TestCase):
+
+    def setUp(self):
+        self.colormap = make_npcolormap(256, [Color('black'), Color('red'), Color('white')])
+        self.counts = np.random.default_rng(0).integers(0, 256, (70, 50))
+
+    def test_apply(self):
+        out = np.zeros((70, 50, 3), dtype=np.uint8)
+        apply_npcolormap(out, self.counts, self.colormap)
+        self.assertTrue(np.array_equal(out, self.colormap[self.counts]))
+
+    def test_apply_too_small(self):
+        out = np.zeros((70, 50, 3), dtype=np.uint8)
+        with self.assertRaises(ValueError):
+            apply_npcolormap(out, self.counts + 1, self.colormap)
+
+    def test_scaled_matches_integer_lookup(self):
+        out = apply_scaled_npcolormap(self.counts, self.colormap, vmin=0, vmax=255, chunk_rows=9)
+        self.assertTrue(np.array_equal(out, self.colormap[self.counts]))
+
+    def test_scaled_power(self):
+        counts = self.counts.astype(np.float64)*40
+        expected = self.colormap[(np.power(counts, 0.25)*255/np.max(np.power(counts, 0.25))).astype(np.uint32)]
+        out = apply_scaled_npcolormap(counts[:, :, np.newaxis], self.colormap, vmin=0, power=0.25, threads=3)
+        self.assertTrue(np.mean(np.any(out != expected, axis=2)) < 0.01)
+
+    def test_scaled_log(self):
+        data = np.array([[1, 10, 100, 1000]], dtype=np.float64)
+        colormap = np.arange(4)[:, np.newaxis]
+        out = apply_scaled_npcolormap(data, colormap, vmin=0, vmax=999, log=True, interpolate=True)
+        self.assertEqual(out[0, 0, 0], 0)
+        self.assertEqual(out[0, 3, 0], 3)
+        self.assertTrue(out[0, 1, 0] < out[0, 2, 0])
+
+    def test_scaled_interpolate(self):
+        colormap = np.array([[0], [100]], dtype=np.uint8)
+        out = apply_scaled_npcolormap(np.array([[0.0, 0.25, 0.5, 1.0]]), colormap, interpolate=True)
+        self.assertEqual(out[0, :, 0].tolist(), [0, 25, 50, 100])
+
+    def test_scaled_equalize(self):
+        colormap = np.arange(101)[:, np.newaxis]
+        out = apply_scaled_npcolormap(np.array([[0, 0, 0, 1, 5, 9]]), colormap, equalize=True)
+        self.assertEqual(out[0, :, 0].tolist(), [0, 0, 0, 33, 66, 100])
+        # Large ranges are binned, so 0 and 1 fall in the same bin
+        out = apply_scaled_npcolormap(np.array([[0, 0, 0, 1, 1000, 1000000]]), colormap, equalize=True)
+        self.assertEqual(out[0, :, 0].tolist(), [0, 0, 0, 0, 50, 100])
+
+    def test_scaled_nan(self):
+        out = apply_scaled_npcolormap(np.array([[np.nan, 1.0, 2.0]]), self.colormap)
+        self.assertTrue(np.array_equal(out[0], self.colormap[[0, 0, 255]]))
+
+
+class TestNparrayStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.array = np.random.default_rng(0).integers(0, 1000, (40, 30, 1), dtype=np.uint32)
+        self.metadata = {'startx': -2.0, 'width': np.float64(3), 'max_count': np.int64(256)}
+
+    def test_save_load(self):
+        filename = temp_file('test_save_nparray.dat')
+        save_nparray(filename, self.array, self.metadata)
+        self.assertTrue(np.array_equal(load_nparray(filename), self.array))
+        mapped = load_nparray(filename, mmap_mode='r')
+        self.assertIsInstance(mapped, np.memmap)
+        self.assertTrue(np.array_equal(mapped, self.array))
+        self.assertEqual(load_nparray_metadata(filename), {'startx': -2.0, 'width': 3.0, 'max_count': 256})
+        save_nparray(filename, self.array)
+        self.assertIsNone(load_nparray_metadata(filename))
+
+    def test_compressed(self):
+        filename = temp_file('test_save_nparray_compressed.dat')
+        save_nparray(filename, self.array, self.metadata, compressed=True)
+        self.assertTrue(np.array_equal(load_nparray(filename), self.array))
+        self.assertEqual(load_nparray_metadata(filename)['max_count'], 256)
+        with self.assertRaises(ValueError):
+            load_nparray(filename, mmap_mode='r')
+
+    def test_stack(self):
+        filename = temp_file('test_nparray_stack.npy')
+        with NparrayStack(filename, metadata={'frames': 'test'}) as stack:
+            stack.append(self.array)
+            stack.append(self.array + 1)
+        with NparrayStack(filename, append=True) as stack:
+            stack.append(self.array + 2)
+            with self.assertRaises(ValueError):
+                stack.append(self.array[1:])
+        frames = load_nparray(filename, mmap_mode='r')
+        self.assertEqual(frames.shape, (3, 40, 30, 1))
+        self.assertTrue(np.array_equal(frames[2], self.array + 2))
+        self.assertEqual(load_nparray_metadata(filename), {'frames': 'test'})
+
+    def test_stack_empty(self):
+        filename = temp_file('test_nparray_stack_empty.npy')
+        NparrayStack(filename).close()
+        self.assertEqual(load_nparray(filename).shape, (0,))
+        with NparrayStack(filename, append=True) as stack:
+            stack.append(self.array)
+        self.assertTrue(np.array_equal(load_nparray(filename), self.array[np.newaxis]))
+
+    def test_stack_header_too_long(self):
+        filename = temp_file('test_nparray_stack_header.npy')
+        with NparrayStack(filename) as stack:
+            with self.assertRaises(ValueError):
+                stack.append(np.zeros((1,)*60))
+            with self.assertRaises(ValueError):
+                stack.append(np.zeros(2, dtype=[('field{}'.format(i), np.float64) for i in range(10)]))
+            stack.append(self.array)
+        self.assertTrue(np.array_equal(load_nparray(filename), self.array[np.newaxis]))
+
+
+if __name__ == '__main__':
+    unittest.main()
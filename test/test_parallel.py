@@ -0,0 +1,48 @@
+import unittest
+from generativepy import parallel
+from generativepy.parallel import imap_ordered, is_picklable
+
+
+def square(x):
+    return x*x
+
+
+class TestParallel(unittest.TestCase):
+
+    def test_serial(self):
+        self.assertEqual([0, 1, 4, 9, 16], list(imap_ordered(square, range(5))))
+
+    def test_workers_keep_order(self):
+        self.assertEqual([x*x for x in range(50)], list(imap_ordered(square, range(50), workers=3)))
+
+    def test_small_buffer(self):
+        self.assertEqual([x*x for x in range(20)], list(imap_ordered(square, range(20), workers=2, buffer_size=1)))
+
+    def test_unpicklable_function(self):
+        offset = 3
+        self.assertFalse(is_picklable(lambda x: x + offset))
+        self.assertEqual([3, 4, 5, 6], list(imap_ordered(lambda x: x + offset, range(4), workers=2)))
+
+    def test_interleaved_unpicklable_functions(self):
+        offset = 10
+        first = imap_ordered(lambda x: x + offset, range(6), workers=2, buffer_size=1)
+        second = imap_ordered(lambda x: x - offset, range(6), workers=2, buffer_size=1)
+        results = [(next(first), next(second)) for _ in range(6)]
+        self.assertEqual([(x + 10, x - 10) for x in range(6)], results)
+        self.assertEqual([], list(first) + list(second))
+        self.assertIsNone(parallel._fork_function)
+
+    def test_nested_unpicklable_functions(self):
+        offset = 10
+        outer = imap_ordered(lambda x: x + offset, range(4), workers=2, buffer_size=1)
+        results = [(a, list(imap_ordered(lambda x: x*offset, [a], workers=2))) for a in outer]
+        self.assertEqual([(x + 10, [(x + 10)*10]) for x in range(4)], results)
+
+    def test_lazy_input(self):
+        frames = imap_ordered(square, iter(range(1000000)), workers=2)
+        self.assertEqual([0, 1, 4], [next(frames) for i in range(3)])
+        frames.close()
+
+    def test_invalid_buffer_size(self):
+        with self.assertRaises(ValueError):
+            list(imap_ordered(square, range(5), workers=2, buffer_size=0))
@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+from PIL import Image
+from generativepy.movie import save_frames
+from generativepy.png import PngWriter, PngSequenceWriter, FILTER_NONE, FILTER_SUB, FILTER_UP
+from generativepy.utils import temp_file
+
+
+class TestPngWriter(unittest.TestCase):
+
+    def check_image(self, channels, png_filter):
+        image = np.random.default_rng(0).integers(0, 256, (30, 20, channels), dtype=np.uint8)
+        filename = temp_file('test_png_writer.png')
+        with PngWriter(filename, 20, 30, channels, png_filter=png_filter) as writer:
+            writer.write_rows(image[:7])
+            writer.write_rows(image[7:])
+        with Image.open(filename) as im:
+            result = np.asarray(im)
+        if channels == 1:
+            result = result[:, :, np.newaxis]
+        self.assertTrue(np.array_equal(image, result))
+
+    def test_greyscale(self):
+        self.check_image(1, FILTER_NONE)
+
+    def test_rgb(self):
+        self.check_image(3, FILTER_SUB)
+
+    def test_rgba(self):
+        self.check_image(4, FILTER_UP)
+
+    def test_too_few_rows(self):
+        writer = PngWriter(temp_file('test_png_writer.png'), 20, 30, 3)
+        writer.write_rows(np.zeros((10, 20, 3), dtype=np.uint8))
+        with self.assertRaises(ValueError):
+            writer.close()
+
+    def test_wrong_width(self):
+        with PngWriter(temp_file('test_png_writer.png'), 20, 1, 3) as writer:
+            with self.assertRaises(ValueError):
+                writer.write_rows(np.zeros((1, 21, 3), dtype=np.uint8))
+            writer.write_rows(np.zeros((1, 20, 3), dtype=np.uint8))
+
+
+class TestPngSequenceWriter(unittest.TestCase):
+
+    def check_sequence(self, encoders):
+        frames = [np.full((4, 5, 3), i, dtype=np.uint8) for i in range(6)]
+        outfile = temp_file('test_png_sequence.png')
+        with PngSequenceWriter(outfile, encoders, compress_level=1) as writer:
+            for frame in frames:
+                writer.write(frame)
+        for i, frame in enumerate(frames):
+            with Image.open(temp_file('test_png_sequence' + str(i).zfill(8) + '.png')) as im:
+                self.assertTrue(np.array_equal(frame, np.asarray(im)))
+
+    def test_synchronous(self):
+        self.check_sequence(None)
+
+    def test_encoder_threads(self):
+        self.check_sequence(3)
+
+    def test_greyscale_frame(self):
+        outfile = temp_file('test_png_grey.png')
+        with PngSequenceWriter(outfile) as writer:
+            writer.write(np.full((4, 5, 1), 7, dtype=np.uint8))
+        with Image.open(temp_file('test_png_grey00000000.png')) as im:
+            self.assertEqual('L', im.mode)
+
+    def test_error_is_raised(self):
+        writer = PngSequenceWriter(temp_file('test_png_error'), 2)
+        writer.write(np.zeros((4, 5, 2, 3), dtype=np.uint8))
+        with self.assertRaises(Exception):
+            writer.close()
+
+    def test_exception_not_hidden(self):
+        with self.assertRaises(KeyError):
+            with PngSequenceWriter(temp_file('test_png_error'), 2) as writer:
+                writer.write(np.zeros((4, 5, 2, 3), dtype=np.uint8))
+                raise KeyError('original')
+
+    def test_save_frames_reused_buffer(self):
+        def reused_frames():
+            frame = np.empty((4, 5, 3), dtype=np.uint8)
+            for i in range(8):
+                frame[...] = i
+                yield frame
+
+        save_frames(temp_file('test_save_frames.png'), reused_frames(), encoders=2)
+        for i in range(8):
+            with Image.open(temp_file('test_save_frames' + str(i).zfill(8) + '.png')) as im:
+                self.assertTrue(np.all(np.asarray(im) == i))
@@ -1,5 +1,7 @@
 import unittest
-from generativepy.tween import Tween, TweenVector, set_frame_rate, ease_linear
+import numpy as np
+from generativepy.tween import (Tween, TweenVector, Timeline, set_frame_rate, ease_linear, ease_in_bounce,
+                                sample_ease)
 import generativepy.tween
 
 
@@ -553,3 +555,103 @@ class TestTween(unittest.TestCase):
         with self.assertRaises(ValueError):
             tween.ease_d((1, 1), -1, ease_linear)
 
+    def test_tween_values(self):
+        set_frame_rate(2)
+        tween = Tween(3).wait(2).to(9, 5).set(1).ease(4, 8, ease_in_bounce()).wait(9)
+        self.assertEqual(len(tween), 18)
+        self.assertEqual(tween.values().tolist(), [tween.get(i) for i in range(18)])
+        self.assertEqual(tween.frames, [tween[i] for i in range(18)])
+        self.assertEqual(tween.values([17, 0, -1, 40]).tolist(), [4, 3, 4, 4])
+        self.assertEqual(tween[-18], 3)
+        with self.assertRaises(IndexError):
+            tween.get(-19)
+
+    def test_tweenvector_values(self):
+        set_frame_rate(2)
+        tween = TweenVector((0, 1)).wait(1).to((4, 5), 3).ease((2, 2), 4, ease_in_bounce())
+        values = tween.values()
+        self.assertEqual(values.shape, (8, 2))
+        self.assertTrue(np.array_equal(values, [list(tween.get(i)) for i in range(8)]))
+        self.assertEqual(tween.values([20]).tolist(), [[2, 2]])
+
+    def test_ease_arrays(self):
+        x = np.linspace(0, 1, 101)
+        for name in dir(generativepy.tween):
+            if name.startswith('ease_'):
+                ease_function = getattr(generativepy.tween, name)()
+                expected = [ease_function(v) for v in x.tolist()]
+                self.assertTrue(np.allclose(ease_function(x), expected, rtol=0, atol=1e-12), name)
+
+    def test_sample_ease(self):
+        ease_function = generativepy.tween.ease_in_harm()
+        values = sample_ease(ease_function, 1, start=[0, 0.5, 1, 2], duration=1, from_value=10, to_value=20)
+        self.assertTrue(np.allclose(values, [20, 10 + 10 * ease_function(0.5), 10, 10]))
+        frames = sample_ease(ease_function, np.arange(3)[:, np.newaxis], start=np.arange(4), duration=2)
+        self.assertEqual(frames.shape, (3, 4))
+        self.assertTrue(np.allclose(frames[2], [1, ease_function(0.5), 0, 0]))
+        points = sample_ease(test_linear(), 0.25, start=[0, 0.5], from_value=[[0, 0], [1, 1]], to_value=[[4, 8], [0, 0]])
+        self.assertTrue(np.allclose(points, [[1, 2], [1, 1]]))
+        with self.assertRaises(ValueError):
+            sample_ease(ease_function, 0, duration=0)
+
+
+class TestTimeline(unittest.TestCase):
+
+    def test_matches_tween(self):
+        set_frame_rate(1)
+        timeline = Timeline(frame_rate=2)
+        timeline.add_channel('a', 3)
+        timeline.add_channel('b')
+        timeline.wait('a', 2).to('a', 9, 5).set('a', 1).ease('a', 4, 8, ease_in_bounce()).wait('a', 9)
+        timeline.to_d(1, -5, 3)
+        set_frame_rate(2)
+        tween = Tween(3).wait(2).to(9, 5).set(1).ease(4, 8, ease_in_bounce()).wait(9)
+        other = Tween(0).to_d(-5, 3)
+        self.assertEqual(len(timeline), 18)
+        for frame in range(20):
+            self.assertEqual(timeline.get(frame).tolist(), [tween.get(frame), other.get(frame)])
+        self.assertEqual(timeline.get_channel('a', 7), tween[7])
+        self.assertEqual(timeline[-1].tolist(), [4, -5])
+
+    def test_bulk_channels(self):
+        timeline = Timeline(10)
+        particles = timeline.add_channels(4, [0, 1, 2, 3])
+        timeline.add_channel('size', 5)
+        self.assertEqual(timeline.channel_count, 5)
+        timeline.wait(particles, [0, 0.1, 0.2, 0.3]).to_d(particles, 10, 0.4)
+        timeline.ease(particles[2:], [20, 30], 2, ease_linear())
+        timeline.set(slice(0, 2), -1)
+        self.assertEqual(timeline.get(3).tolist(), [10, 7.75, 6, 4.75, 5])
+        self.assertTrue(np.allclose(timeline.get(6), [-1, -1, 10 + 10 / 14, 10, 5]))
+        self.assertEqual(timeline.get(19).tolist(), [-1, -1, 20, 30, 5])
+        self.assertEqual(len(timeline), 20)
+        self.assertEqual(list(timeline)[4].tolist(), timeline.get(4).tolist())
+
+    def test_timeline_errors(self):
+        timeline = Timeline(2)
+        timeline.add_channel('a')
+        timeline.add_channels(2)
+        timeline.wait([0, 1], 5)
+        with self.assertRaises(ValueError):
+            Timeline(0)
+        with self.assertRaises(ValueError):
+            timeline.add_channel('a')
+        with self.assertRaises(ValueError):
+            timeline.wait('b', 6)
+        with self.assertRaises(ValueError):
+            timeline.wait(3, 6)
+        with self.assertRaises(ValueError):
+            timeline.wait('a', 4)
+        with self.assertRaises(ValueError):
+            timeline.wait_d('a', -1)
+        with self.assertRaises(ValueError):
+            timeline.to([0, 1], [1, 2, 3], 6)
+        with self.assertRaises(ValueError):
+            timeline.to(2, 'x', 6)
+        with self.assertRaises(ValueError):
+            timeline.to(2, 1, 'x')
+        with self.assertRaises(ValueError):
+            timeline.to([0, 0], 1, 6)
+        with self.assertRaises(ValueError):
+            timeline.to(['a', 0], 1, 6)
+        self.assertEqual(len(timeline), 10)
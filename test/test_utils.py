@@ -1,5 +1,5 @@
 import unittest
-from generativepy.utils import correct_pycairo_byte_order, temp_file
+from generativepy.utils import correct_pycairo_byte_order, convert_pycairo_data, pycairo_data_view, temp_file
 import numpy as np
 
 
@@ -45,3 +45,47 @@ class TestUtils(unittest.TestCase):
         expected = np.array(outdata)
         result = correct_pycairo_byte_order(array, 4)
         self.assertTrue(np.array_equal(expected, result))
+
+    def test_convert_3_channel(self):
+        array = np.array([[[1, 2, 3, 255], [4, 5, 6, 0]]], dtype=np.uint8)
+        result = convert_pycairo_data(array, 3)
+        self.assertTrue(np.array_equal(np.array([[[3, 2, 1], [6, 5, 4]]]), result))
+
+    def test_convert_4_channel_unpremultiplies(self):
+        array = np.array([[[10, 64, 128, 128], [1, 2, 3, 255], [0, 0, 0, 0]]], dtype=np.uint8)
+        result = convert_pycairo_data(array, 4)
+        expected = np.array([[[255, 128, 20, 128], [3, 2, 1, 255], [0, 0, 0, 0]]])
+        self.assertTrue(np.array_equal(expected, result))
+
+    def test_convert_1_channel(self):
+        array = np.array([[[0, 0, 255, 255], [255, 255, 255, 255], [100, 100, 100, 255]]], dtype=np.uint8)
+        result = convert_pycairo_data(array, 1)
+        self.assertTrue(np.array_equal(np.array([[[76], [255], [100]]]), result))
+
+    def test_convert_into_out(self):
+        array = np.array([[[1, 2, 3, 255], [4, 5, 6, 255]]], dtype=np.uint8)
+        out = np.zeros((1, 2, 4), dtype=np.uint8)
+        result = convert_pycairo_data(array, 4, out)
+        self.assertIs(out, result)
+        self.assertTrue(np.array_equal(np.array([[[3, 2, 1, 255], [6, 5, 4, 255]]]), out))
+
+    def test_convert_wrong_shape(self):
+        array = np.zeros((2, 2, 4), dtype=np.uint8)
+        with self.assertRaises(ValueError):
+            convert_pycairo_data(array, 3, np.zeros((2, 3, 3), dtype=np.uint8))
+
+    def test_view_rgb(self):
+        array = np.array([[[1, 2, 3, 4], [5, 6, 7, 8]]], dtype=np.uint8)
+        view = pycairo_data_view(array, 'RGB')
+        self.assertTrue(np.shares_memory(view, array))
+        self.assertTrue(np.array_equal(np.array([[[3, 2, 1], [7, 6, 5]]]), view))
+
+    def test_view_bgra(self):
+        array = np.array([[[1, 2, 3, 4], [5, 6, 7, 8]]], dtype=np.uint8)
+        view = pycairo_data_view(array, 'BGRA')
+        self.assertTrue(np.array_equal(array, view))
+
+    def test_view_unavailable(self):
+        array = np.zeros((2, 2, 4), dtype=np.uint8)
+        with self.assertRaises(ValueError):
+            pycairo_data_view(array, 'RGBA')